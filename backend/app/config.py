@@ -1,5 +1,6 @@
 from pydantic import BaseSettings, validator
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
+from enum import Enum
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -9,6 +10,11 @@ env_path = Path(__file__).parent / ".env"
 # Load environment variables from .env file if it exists
 load_dotenv(dotenv_path=env_path)
 
+class ReportBackend(str, Enum):
+    """Where set-based reports read."""
+    PRIMARY = "primary"
+    SNAPSHOT = "snapshot"
+
 class Settings(BaseSettings):
     """Application settings."""
     
@@ -30,6 +36,52 @@ class Settings(BaseSettings):
     # Admin settings
     CREATE_SAMPLE_DATA: bool = False
     
+    # Queued enrollment intake (registration day mode)
+    ENROLLMENT_QUEUE_ENABLED: bool = False
+    ENROLLMENT_QUEUE_WORKERS: int = 2
+    ENROLLMENT_QUEUE_BATCH_SIZE: int = 200
+    ENROLLMENT_QUEUE_POLL_SECONDS: float = 0.5
+    ENROLLMENT_QUEUE_STALE_SECONDS: int = 300
+    
+    # Upper bound on how stale cached catalog seat counts can be
+    CATALOG_CACHE_TTL_SECONDS: int = 30
+    
+    # Safety expiry for cached GPAs; local changes invalidate them immediately
+    GPA_CACHE_TTL_SECONDS: int = 300
+    
+    # Safety expiry for cached course grade statistics
+    GRADE_STATS_CACHE_TTL_SECONDS: int = 300
+    
+    # In-memory class rank indexes are rebuilt after this long
+    RANK_INDEX_TTL_SECONDS: int = 600
+    
+    # Gradebook file imports
+    GRADE_IMPORT_CHUNK_SIZE: int = 1000
+    GRADE_IMPORT_MAX_UPLOAD_MB: int = 50
+    
+    # Background report rendering
+    REPORT_WORKERS: int = 2
+    REPORT_QUEUE_LIMIT: int = 500
+    REPORT_JOB_STALE_SECONDS: int = 600
+    # Render processes per batch transcript job; 0 splits the cores between the REPORT_WORKERS
+    REPORT_BATCH_WORKERS: int = 0
+    REPORT_BATCH_CHUNK_SIZE: int = 25
+    # Rows fetched per server-side cursor batch by streaming exports
+    REPORT_EXPORT_BATCH_SIZE: int = 2000
+    
+    # Report file storage: byte budget (LRU eviction) and age limit per report type
+    REPORT_STORE_MAX_MB: int = 2048
+    REPORT_RETENTION_HOURS: Dict[str, int] = {"transcript": 720, "batch_transcripts": 72, "students_export": 24}
+    REPORT_STORE_SWEEP_SECONDS: int = 300
+    # Where set-based reports (class transcripts, rosters, exports) read: "primary"
+    # or "snapshot", a local copy refreshed incrementally every REPORT_SNAPSHOT_SECONDS
+    REPORT_BACKEND: ReportBackend = ReportBackend.PRIMARY
+    REPORT_SNAPSHOT_PATH: Optional[str] = None
+    REPORT_SNAPSHOT_SECONDS: int = 900
+
+    # Full recompute of the analytics rollups, which write paths keep current incrementally
+    ANALYTICS_RECONCILE_SECONDS: int = 3600
+    
     @validator("BACKEND_CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
         if isinstance(v, str) and not v.startswith("["):
@@ -0,0 +1,77 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from pathlib import Path
+from typing import IO, Optional
+import fcntl
+import tempfile
+import threading
+import zlib
+
+from .session import engine as default_engine
+
+
+class LeaderLock:
+    """
+    Non-blocking lock that elects one process among the API workers to run
+    background work that must not run once per worker. On Postgres it is a
+    session advisory lock held on a dedicated connection; elsewhere an
+    exclusive lock on a file next to the other temporary files. Once
+    acquired it is held until ``release`` or the process exits, when the
+    database or the OS frees it for another process.
+    """
+
+    def __init__(self, name: str, engine: Optional[Engine] = None, path: Optional[Path] = None):
+        self.name = name
+        self.engine = engine or default_engine
+        self.path = path or Path(tempfile.gettempdir()) / f"school-{name}.lock"
+        self._lock = threading.Lock()
+        self._connection: Optional[Connection] = None
+        self._file: Optional[IO] = None
+
+    @property
+    def held(self) -> bool:
+        return self._connection is not None or self._file is not None
+
+    def acquire(self) -> bool:
+        """Take the lock if no other process holds it. True while this process holds it."""
+        with self._lock:
+            if not self.held:
+                if self.engine.dialect.name == "postgresql":
+                    self._acquire_advisory()
+                else:
+                    self._acquire_file()
+            return self.held
+
+    def _acquire_advisory(self) -> None:
+        # Autocommit, so the held connection does not sit idle in a transaction
+        connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        key = zlib.crc32(self.name.encode())
+        if connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar():
+            self._connection = connection
+        else:
+            connection.close()
+
+    def _acquire_file(self) -> None:
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return
+        self._file = lock_file
+
+    def release(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                # Closing returns the connection to the pool; the lock must go with the session
+                self._connection.execute(text("SELECT pg_advisory_unlock_all()"))
+                self._connection.close()
+                self._connection = None
+            if self._file is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+                self._file.close()
+                self._file = None
+
+
+# Held by the worker process that runs the single-instance background tasks
+background_leader = LeaderLock("background-tasks")
@@ -1,6 +1,8 @@
 from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session as SASession, sessionmaker
+from typing import Any, Callable
 import os
 from ..config import settings
 
@@ -11,6 +13,22 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
 )
 
+def enable_sqlite_transactions(sqlite_engine):
+    """
+    pysqlite manages transactions itself and breaks SAVEPOINT semantics;
+    let SQLAlchemy emit BEGIN so nested transactions roll back correctly.
+    """
+    @event.listens_for(sqlite_engine, "connect")
+    def _sqlite_disable_autobegin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sqlite_engine, "begin")
+    def _sqlite_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    enable_sqlite_transactions(engine)
+
 # For SQLAlchemy ORM operations if needed
 Base = declarative_base()
 
@@ -27,4 +45,42 @@ def get_db():
 
 def create_db_and_tables():
     """Create database tables on startup"""
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(engine)
+
+def _discard_on_rollback(key: str) -> None:
+    @event.listens_for(SASession, "after_rollback")
+    def _discard(session):
+        if not session.in_nested_transaction():
+            session.info.pop(key, None)
+
+def on_real_commit(key: str, callback: Callable[[Any], None]) -> None:
+    """
+    Call ``callback`` with the value services collected in
+    ``session.info[key]`` once the outermost transaction commits, and drop
+    the value when it rolls back. Savepoints fire the session's commit and
+    rollback events too; those leave the value in place.
+    """
+    @event.listens_for(SASession, "after_commit")
+    def _apply(session):
+        if session.in_nested_transaction():
+            return
+        value = session.info.pop(key, None)
+        if value:
+            callback(value)
+
+    _discard_on_rollback(key)
+
+def before_real_commit(key: str, callback: Callable[[SASession, Any], None]) -> None:
+    """
+    Like ``on_real_commit``, but call ``callback(session, value)`` just
+    before the outermost commit so its writes commit with the transaction.
+    """
+    @event.listens_for(SASession, "before_commit")
+    def _apply(session):
+        if session.in_nested_transaction():
+            return
+        value = session.info.pop(key, None)
+        if value is not None:
+            callback(session, value)
+
+    _discard_on_rollback(key)
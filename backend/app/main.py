@@ -4,9 +4,15 @@ import uvicorn
 from datetime import datetime
 import time
 
-from .config import settings
+from .config import ReportBackend, settings
+from .database.locks import background_leader
 from .database.session import create_db_and_tables
-from .routers import auth, users, students, teachers, courses, enrollments, grades, reports
+from .routers import auth, users, students, teachers, courses, enrollments, grades, reports, batch, analytics
+from .services.analytics import analytics_reconciler
+from .services.enrollment_queue import enrollment_queue_workers
+from .services.report_jobs import report_job_runner
+from .services.report_snapshot import report_snapshot_refresher
+from .services.report_store import report_store_sweeper
 from .utils.logger import app_logger
 
 app = FastAPI(
@@ -30,10 +36,25 @@ def on_startup():
     app_logger.info("Starting up application")
     create_db_and_tables()
     app_logger.info("Database tables initialized")
+    if settings.ENROLLMENT_QUEUE_ENABLED:
+        enrollment_queue_workers.start()
+    report_job_runner.start()
+    report_store_sweeper.start()
+    analytics_reconciler.start()
+    if settings.REPORT_BACKEND == ReportBackend.SNAPSHOT:
+        report_snapshot_refresher.start()
 
 @app.on_event("shutdown")
 def on_shutdown():
     app_logger.info("Shutting down application")
+    if settings.ENROLLMENT_QUEUE_ENABLED:
+        enrollment_queue_workers.stop()
+    report_job_runner.stop()
+    report_store_sweeper.stop()
+    analytics_reconciler.stop()
+    if settings.REPORT_BACKEND == ReportBackend.SNAPSHOT:
+        report_snapshot_refresher.stop()
+    background_leader.release()
 
 # Request logging middleware
 @app.middleware("http")
@@ -65,6 +86,8 @@ app.include_router(courses.router)
 app.include_router(enrollments.router)
 app.include_router(grades.router)
 app.include_router(reports.router)  # Ensure this router is included
+app.include_router(batch.router)
+app.include_router(analytics.router)
 
 @app.get("/")
 def root():
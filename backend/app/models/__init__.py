@@ -1,18 +1,34 @@
 from .base import BaseModel
-from .user import User, UserCreate, UserRead, UserUpdate, UserRole
-from .student import Student, StudentCreate, StudentRead, StudentUpdate
-from .teacher import Teacher, TeacherCreate, TeacherRead, TeacherUpdate
-from .course import Course, CourseCreate, CourseRead, CourseUpdate, CourseStatus
-from .enrollment import Enrollment, EnrollmentCreate, EnrollmentRead, EnrollmentUpdate, EnrollmentStatus
+from .user import User, UserCreate, UserRead, UserPublic, UserUpdate, UserRole
+from .student import Student, StudentCreate, StudentRead, StudentReadWithUser, StudentUpdate
+from .teacher import Teacher, TeacherCreate, TeacherRead, TeacherReadWithUser, TeacherUpdate
+from .course import Course, CourseCreate, CourseRead, CourseReadWithTeacher, CourseCatalogEntry, CourseUpdate, CourseStatus
+from .enrollment import Enrollment, EnrollmentCreate, EnrollmentRead, EnrollmentReadWithDetails, EnrollmentUpdate, EnrollmentStatus, SEAT_HOLDING_STATUSES
 from .grade import Grade, GradeCreate, GradeRead, GradeUpdate, GradeType
+from .enrollment_request import (
+    EnrollmentRequest, EnrollmentRequestCreate, EnrollmentRequestRead,
+    EnrollmentRequestStatus, EnrollmentOutcome
+)
+from .grade_import import GradeImportJob, GradeImportJobRead, GradeImportStatus
+from .grade_summary import EnrollmentGradeSummary, EnrollmentGradeSummaryRead
+from .report_job import ReportJob, ReportJobCreate, ReportJobRead, ReportJobStatus, ReportType
+from .report_file import ReportFile
+from .analytics import CourseEnrollmentRollup, DepartmentGradeRollup, GradeLevelRollup
 
 # For database creation, import all models
 __all__ = [
     "BaseModel",
-    "User", "UserCreate", "UserRead", "UserUpdate", "UserRole",
-    "Student", "StudentCreate", "StudentRead", "StudentUpdate",
-    "Teacher", "TeacherCreate", "TeacherRead", "TeacherUpdate", 
-    "Course", "CourseCreate", "CourseRead", "CourseUpdate", "CourseStatus",
-    "Enrollment", "EnrollmentCreate", "EnrollmentRead", "EnrollmentUpdate", "EnrollmentStatus",
-    "Grade", "GradeCreate", "GradeRead", "GradeUpdate", "GradeType"
+    "User", "UserCreate", "UserRead", "UserPublic", "UserUpdate", "UserRole",
+    "Student", "StudentCreate", "StudentRead", "StudentReadWithUser", "StudentUpdate",
+    "Teacher", "TeacherCreate", "TeacherRead", "TeacherReadWithUser", "TeacherUpdate",
+    "Course", "CourseCreate", "CourseRead", "CourseReadWithTeacher", "CourseCatalogEntry", "CourseUpdate", "CourseStatus",
+    "Enrollment", "EnrollmentCreate", "EnrollmentRead", "EnrollmentReadWithDetails", "EnrollmentUpdate", "EnrollmentStatus", "SEAT_HOLDING_STATUSES",
+    "Grade", "GradeCreate", "GradeRead", "GradeUpdate", "GradeType",
+    "EnrollmentRequest", "EnrollmentRequestCreate", "EnrollmentRequestRead",
+    "EnrollmentRequestStatus", "EnrollmentOutcome",
+    "GradeImportJob", "GradeImportJobRead", "GradeImportStatus",
+    "EnrollmentGradeSummary", "EnrollmentGradeSummaryRead",
+    "ReportJob", "ReportJobCreate", "ReportJobRead", "ReportJobStatus", "ReportType",
+    "ReportFile",
+    "CourseEnrollmentRollup", "DepartmentGradeRollup", "GradeLevelRollup"
 ]
\ No newline at end of file
@@ -0,0 +1,36 @@
+from sqlmodel import Field
+from sqlalchemy import UniqueConstraint
+from .base import BaseModel
+from .enrollment import EnrollmentStatus
+
+# Rollups are derived data keyed by dimension values, not foreign keys, so
+# deleting a course or teacher is never blocked by its aggregates.
+
+class CourseEnrollmentRollup(BaseModel, table=True):
+    """Number of enrollments of one course in one status."""
+    __tablename__ = "course_enrollment_rollups"
+    __table_args__ = (UniqueConstraint("course_id", "status"),)
+
+    course_id: str = Field(index=True)
+    status: EnrollmentStatus
+    enrollment_count: int = 0
+
+class DepartmentGradeRollup(BaseModel, table=True):
+    """
+    Final grades of the enrollments in courses taught by one department.
+    Both fields are additive so a grade change is applied as a delta.
+    """
+    __tablename__ = "department_grade_rollups"
+
+    department: str = Field(unique=True, index=True)
+    graded_enrollments: int = 0
+    # Sum of the enrollments' final grades on the 0-100 scale
+    grade_total: float = 0.0
+
+class GradeLevelRollup(BaseModel, table=True):
+    """Graded and passing enrollments of the students in one grade level."""
+    __tablename__ = "grade_level_rollups"
+
+    grade_level: int = Field(unique=True, index=True)
+    graded_enrollments: int = 0
+    passed_enrollments: int = 0
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import event
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -6,4 +7,10 @@ import uuid
 class BaseModel(SQLModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+@event.listens_for(BaseModel, "before_update", propagate=True)
+def _touch_updated_at(mapper, connection, target):
+    # Incremental readers such as the report snapshot rely on updated_at
+    # moving whenever a row changes; bulk UPDATEs set it themselves
+    target.updated_at = datetime.utcnow()
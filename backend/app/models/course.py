@@ -3,6 +3,7 @@ from typing import Optional, List, ForwardRef
 from datetime import datetime, date
 from enum import Enum
 from .base import BaseModel
+from .teacher import TeacherReadWithUser
 
 class CourseStatus(str, Enum):
     ACTIVE = "active"
@@ -23,6 +24,9 @@ class CourseBase(SQLModel):
 class Course(BaseModel, CourseBase, table=True):
     __tablename__ = "courses"
     
+    # Seats held by active and pending enrollments, kept in step by EnrollmentService
+    enrolled_count: int = Field(default=0)
+    
     teacher: "Teacher" = Relationship(back_populates="courses")
     enrollments: List["Enrollment"] = Relationship(back_populates="course")
 
@@ -31,9 +35,16 @@ class CourseCreate(CourseBase):
 
 class CourseRead(CourseBase):
     id: str
+    enrolled_count: int = 0
     created_at: datetime
     updated_at: datetime
 
+class CourseReadWithTeacher(CourseRead):
+    teacher: Optional[TeacherReadWithUser] = None
+
+class CourseCatalogEntry(CourseRead):
+    available_seats: int
+
 class CourseUpdate(SQLModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -3,6 +3,8 @@ from typing import Optional, List
 from datetime import datetime, date
 from enum import Enum
 from .base import BaseModel
+from .course import CourseRead
+from .student import StudentReadWithUser
 
 class EnrollmentStatus(str, Enum):
     ACTIVE = "active"
@@ -10,6 +12,9 @@ class EnrollmentStatus(str, Enum):
     COMPLETED = "completed"
     PENDING = "pending"
 
+# Enrollment statuses that occupy a seat in the course
+SEAT_HOLDING_STATUSES = (EnrollmentStatus.ACTIVE, EnrollmentStatus.PENDING)
+
 class EnrollmentBase(SQLModel):
     student_id: str = Field(foreign_key="students.id")
     course_id: str = Field(foreign_key="courses.id")
@@ -31,5 +36,9 @@ class EnrollmentRead(EnrollmentBase):
     created_at: datetime
     updated_at: datetime
 
+class EnrollmentReadWithDetails(EnrollmentRead):
+    student: Optional[StudentReadWithUser] = None
+    course: Optional[CourseRead] = None
+
 class EnrollmentUpdate(SQLModel):
     status: Optional[EnrollmentStatus] = None
\ No newline at end of file
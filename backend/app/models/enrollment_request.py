@@ -0,0 +1,50 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+from .base import BaseModel
+from .enrollment import EnrollmentStatus
+
+class EnrollmentRequestStatus(str, Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class EnrollmentOutcome(str, Enum):
+    ENROLLED = "enrolled"
+    ALREADY_ENROLLED = "already_enrolled"
+    COURSE_FULL = "course_full"
+    COURSE_INACTIVE = "course_inactive"
+    COURSE_NOT_FOUND = "course_not_found"
+    STUDENT_NOT_FOUND = "student_not_found"
+
+class EnrollmentRequestBase(SQLModel):
+    student_id: str = Field(index=True)
+    course_id: str = Field(index=True)
+    requested_status: EnrollmentStatus = EnrollmentStatus.PENDING
+
+class EnrollmentRequest(BaseModel, EnrollmentRequestBase, table=True):
+    """Queued enrollment waiting for an intake worker to apply it."""
+    __tablename__ = "enrollment_requests"
+    
+    requested_by: str = Field(foreign_key="users.id")
+    status: EnrollmentRequestStatus = Field(default=EnrollmentRequestStatus.QUEUED, index=True)
+    # Set by the worker claim that moved the request to processing
+    claim_token: Optional[str] = Field(default=None, index=True)
+    outcome: Optional[EnrollmentOutcome] = None
+    enrollment_id: Optional[str] = None
+    detail: Optional[str] = None
+    processed_at: Optional[datetime] = None
+
+class EnrollmentRequestCreate(EnrollmentRequestBase):
+    pass
+
+class EnrollmentRequestRead(EnrollmentRequestBase):
+    id: str
+    status: EnrollmentRequestStatus
+    outcome: Optional[EnrollmentOutcome] = None
+    enrollment_id: Optional[str] = None
+    detail: Optional[str] = None
+    created_at: datetime
+    processed_at: Optional[datetime] = None
@@ -0,0 +1,50 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, date
+from enum import Enum
+from .base import BaseModel
+from .grade import GradeType
+
+class GradeImportStatus(str, Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class GradeImportJobBase(SQLModel):
+    course_id: Optional[str] = Field(default=None, foreign_key="courses.id")
+    grade_type: GradeType
+    max_score: float
+    weight: float
+    grade_date: date = Field(default_factory=date.today)
+
+class GradeImportJob(BaseModel, GradeImportJobBase, table=True):
+    """Uploaded gradebook file and the outcome of importing it."""
+    __tablename__ = "grade_import_jobs"
+    
+    requested_by: str = Field(foreign_key="users.id")
+    filename: str
+    file_path: str
+    status: GradeImportStatus = Field(default=GradeImportStatus.QUEUED, index=True)
+    total_rows: int = 0
+    imported_rows: int = 0
+    rejected_rows: int = 0
+    duration_seconds: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    error_report_path: Optional[str] = None
+    detail: Optional[str] = None
+    finished_at: Optional[datetime] = None
+
+class GradeImportJobRead(GradeImportJobBase):
+    id: str
+    filename: str
+    status: GradeImportStatus
+    total_rows: int
+    imported_rows: int
+    rejected_rows: int
+    duration_seconds: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    has_error_report: bool = False
+    detail: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
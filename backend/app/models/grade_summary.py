@@ -0,0 +1,32 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime, date
+from .base import BaseModel
+
+class EnrollmentGradeSummary(BaseModel, table=True):
+    """
+    Running grade aggregates of one enrollment, kept in step with the grades
+    table by the grade write paths. The sums let a single grade be added or
+    removed with delta arithmetic; ``weighted_average`` is derived from them.
+    """
+    __tablename__ = "enrollment_grade_summaries"
+    
+    enrollment_id: str = Field(foreign_key="enrollments.id", unique=True, index=True)
+    # Grades with a usable max_score
+    grade_count: int = 0
+    # Grades among those with a positive weight, and the sums over them
+    weighted_count: int = 0
+    weight_total: float = 0.0
+    weighted_points: float = 0.0
+    # Sum of percentages of grades without a weight
+    unweighted_points: float = 0.0
+    weighted_average: Optional[float] = Field(default=None, index=True)
+    latest_grade_date: Optional[date] = None
+
+class EnrollmentGradeSummaryRead(SQLModel):
+    enrollment_id: str
+    grade_count: int
+    weight_total: float
+    weighted_average: Optional[float] = None
+    latest_grade_date: Optional[date] = None
+    updated_at: datetime
@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from .base import BaseModel
+from .report_job import ReportType
+
+class ReportFile(BaseModel, table=True):
+    """
+    Index entry of one file in the report store, so retention and eviction
+    can be decided with queries instead of walking the reports directory.
+    """
+    __tablename__ = "report_files"
+    
+    # Relative to the reports directory
+    path: str = Field(unique=True, index=True)
+    report_type: ReportType = Field(index=True)
+    size_bytes: int = 0
+    last_accessed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
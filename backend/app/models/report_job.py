@@ -0,0 +1,55 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+from .base import BaseModel
+
+class ReportType(str, Enum):
+    TRANSCRIPT = "transcript"
+    STUDENTS_EXPORT = "students_export"
+    BATCH_TRANSCRIPTS = "batch_transcripts"
+
+class ReportJobStatus(str, Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ReportJobBase(SQLModel):
+    report_type: ReportType
+    # Subject of per-student reports such as transcripts
+    student_id: Optional[str] = Field(default=None, foreign_key="students.id")
+    # Class covered by batch transcripts
+    grade_level: Optional[int] = None
+
+class ReportJob(BaseModel, ReportJobBase, table=True):
+    """Report rendered in the background; any API worker can serve its status and file."""
+    __tablename__ = "report_jobs"
+    
+    requested_by: str = Field(foreign_key="users.id")
+    status: ReportJobStatus = Field(default=ReportJobStatus.QUEUED, index=True)
+    file_path: Optional[str] = None
+    media_type: Optional[str] = None
+    detail: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    # Progress of multi-item jobs such as batch transcripts
+    total_items: Optional[int] = None
+    processed_items: int = 0
+    items_per_second: Optional[float] = None
+
+class ReportJobCreate(ReportJobBase):
+    pass
+
+class ReportJobRead(ReportJobBase):
+    id: str
+    status: ReportJobStatus
+    detail: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    total_items: Optional[int] = None
+    processed_items: int = 0
+    items_per_second: Optional[float] = None
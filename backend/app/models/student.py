@@ -1,8 +1,8 @@
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List, ForwardRef
+from typing import Optional, List, ForwardRef, Union
 from datetime import datetime, date
 from .base import BaseModel
-from .user import User
+from .user import User, UserPublic, UserRead
 
 class StudentBase(SQLModel):
     user_id: str = Field(foreign_key="users.id")
@@ -27,6 +27,10 @@ class StudentRead(StudentBase):
     created_at: datetime
     updated_at: datetime
 
+class StudentReadWithUser(StudentRead):
+    # UserPublic unless the caller may read the full user record
+    user: Optional[Union[UserRead, UserPublic]] = None
+
 class StudentUpdate(SQLModel):
     grade_level: Optional[int] = None
     parent_name: Optional[str] = None
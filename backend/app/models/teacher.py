@@ -1,8 +1,8 @@
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List, ForwardRef
+from typing import Optional, List, ForwardRef, Union
 from datetime import datetime, date
 from .base import BaseModel
-from .user import User
+from .user import User, UserPublic, UserRead
 
 class TeacherBase(SQLModel):
     user_id: str = Field(foreign_key="users.id")
@@ -26,6 +26,10 @@ class TeacherRead(TeacherBase):
     created_at: datetime
     updated_at: datetime
 
+class TeacherReadWithUser(TeacherRead):
+    # UserPublic unless the caller may read the full user record
+    user: Optional[Union[UserRead, UserPublic]] = None
+
 class TeacherUpdate(SQLModel):
     department: Optional[str] = None
     qualification: Optional[str] = None
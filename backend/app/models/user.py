@@ -33,6 +33,13 @@ class UserRead(UserBase):
     created_at: datetime
     updated_at: datetime
 
+class UserPublic(SQLModel):
+    """What other users may see of an account: who it is, not how to reach it."""
+    id: str
+    first_name: str
+    last_name: str
+    role: UserRole
+
 class UserUpdate(SQLModel):
     email: Optional[str] = None
     first_name: Optional[str] = None
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+from typing import List
+
+from ..auth.dependencies import get_current_active_user
+from ..database.session import get_db
+from ..models.user import User, UserRole
+from ..schemas.analytics import AnalyticsDashboard, CourseEnrollmentStats, DepartmentGradeStats, GradeLevelPassStats
+from ..services.analytics import department_dashboard, enrollment_dashboard, grade_level_dashboard
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(get_current_active_user)]
+)
+
+def _check_admin(current_user: User) -> None:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view analytics"
+        )
+
+# Every endpoint reads the precomputed rollups, so its cost depends on the
+# number of courses, departments and grade levels, not on enrollments or grades
+
+@router.get("/", response_model=AnalyticsDashboard)
+def read_dashboard(db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    """All school-wide rollups in one response (admin only)."""
+    _check_admin(current_user)
+    return {
+        "enrollments": enrollment_dashboard(db),
+        "departments": department_dashboard(db),
+        "grade_levels": grade_level_dashboard(db),
+    }
+
+@router.get("/enrollments", response_model=List[CourseEnrollmentStats])
+def read_enrollment_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    """Enrollments per course and status (admin only)."""
+    _check_admin(current_user)
+    return enrollment_dashboard(db)
+
+@router.get("/departments", response_model=List[DepartmentGradeStats])
+def read_department_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    """Average final grade per teacher department (admin only)."""
+    _check_admin(current_user)
+    return department_dashboard(db)
+
+@router.get("/grade-levels", response_model=List[GradeLevelPassStats])
+def read_grade_level_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    """Pass rate per student grade level (admin only)."""
+    _check_admin(current_user)
+    return grade_level_dashboard(db)
@@ -0,0 +1,179 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import Session
+import copy
+from typing import Any, Dict, List, Optional
+
+from ..auth.dependencies import get_current_active_user
+from ..models.user import User
+from ..models.grade import Grade, GradeCreate, GradeRead, GradeUpdate
+from ..models.enrollment import Enrollment, EnrollmentCreate, EnrollmentRead, EnrollmentUpdate
+from ..models.course import Course
+from ..database.session import get_db
+from ..schemas.batch import BatchRequest, BatchResponse, BatchOperation, BatchResource, BatchMethod
+from ..services.access import AccessContext
+from ..services.grade_service import GradeService
+from ..services.enrollment_service import EnrollmentService
+from ..utils.logger import app_logger
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+def _require_id(operation: BatchOperation) -> str:
+    if not operation.id:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Operation '{operation.method.value}' on {operation.resource.value} requires an id"
+        )
+    return operation.id
+
+def _apply(
+    operation: BatchOperation,
+    grade_service: GradeService,
+    enrollment_service: EnrollmentService,
+) -> Optional[Dict[str, Any]]:
+    """Run a single operation through the matching write service."""
+    data = operation.data or {}
+    
+    if operation.resource == BatchResource.GRADES:
+        if operation.method == BatchMethod.CREATE:
+            grade = grade_service.create_grade(GradeCreate(**data))
+            return GradeRead.from_orm(grade).dict()
+        if operation.method == BatchMethod.UPDATE:
+            grade = grade_service.update_grade(_require_id(operation), GradeUpdate(**data))
+            return GradeRead.from_orm(grade).dict()
+        grade_service.delete_grade(_require_id(operation))
+        return None
+    
+    if operation.method == BatchMethod.CREATE:
+        enrollment = enrollment_service.create_enrollment(EnrollmentCreate(**data))
+        return EnrollmentRead.from_orm(enrollment).dict()
+    if operation.method == BatchMethod.UPDATE:
+        enrollment = enrollment_service.update_enrollment(_require_id(operation), EnrollmentUpdate(**data))
+        return EnrollmentRead.from_orm(enrollment).dict()
+    enrollment_service.delete_enrollment(_require_id(operation))
+    return None
+
+def _preload(access: AccessContext, operations: List[BatchOperation]) -> None:
+    """Load every grade, enrollment and course the batch refers to up front."""
+    grade_ids = set()
+    enrollment_ids = set()
+    for operation in operations:
+        if operation.resource == BatchResource.GRADES:
+            if operation.id:
+                grade_ids.add(operation.id)
+            if operation.data and operation.data.get("enrollment_id"):
+                enrollment_ids.add(operation.data["enrollment_id"])
+        elif operation.id:
+            enrollment_ids.add(operation.id)
+    
+    grades = access.preload(Grade, grade_ids)
+    enrollment_ids.update(grade.enrollment_id for grade in grades.values())
+    enrollments = access.preload(Enrollment, enrollment_ids)
+    access.preload(Course, {enrollment.course_id for enrollment in enrollments.values()})
+
+def _rollback(db: Session, savepoint, access: AccessContext, saved: tuple) -> None:
+    """
+    Roll back one operation's savepoint together with what it left outside
+    the database: rows it cached and the changes services noted in
+    ``db.info`` for the commit (seat, GPA, statistics and analytics).
+    """
+    info, rows = saved
+    savepoint.rollback()
+    db.info.clear()
+    db.info.update(info)
+    access.restore(rows)
+
+@router.post("/", response_model=BatchResponse)
+def execute_batch(
+    *,
+    batch_in: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Dict[str, Any]:
+    """
+    Execute several grade and enrollment operations in a single transaction.
+    Each operation applies the same validation and permission rules as the
+    matching single-item endpoint, and permission lookups are shared across
+    operations. With atomic=true (the default) the first failure rolls back
+    the whole batch; otherwise failed operations are skipped and the rest
+    are committed together.
+    """
+    access = AccessContext(db, current_user)
+    grade_service = GradeService(db, current_user, access)
+    enrollment_service = EnrollmentService(db, current_user, access)
+    
+    _preload(access, batch_in.operations)
+    
+    results = []
+    failed = False
+    for index, operation in enumerate(batch_in.operations):
+        if failed and batch_in.atomic:
+            results.append({
+                "index": index,
+                "status_code": status.HTTP_424_FAILED_DEPENDENCY,
+                "detail": "Skipped because an earlier operation failed"
+            })
+            continue
+        
+        saved = (copy.deepcopy(db.info), access.snapshot())
+        savepoint = db.begin_nested()
+        try:
+            data = _apply(operation, grade_service, enrollment_service)
+            savepoint.commit()
+        except HTTPException as exc:
+            _rollback(db, savepoint, access, saved)
+            failed = True
+            results.append({"index": index, "status_code": exc.status_code, "detail": exc.detail})
+            continue
+        except ValidationError as exc:
+            _rollback(db, savepoint, access, saved)
+            failed = True
+            results.append({
+                "index": index,
+                "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "detail": jsonable_encoder(exc.errors())
+            })
+            continue
+        except SQLAlchemyError as exc:
+            _rollback(db, savepoint, access, saved)
+            failed = True
+            app_logger.warning(f"Batch operation {index} by user {current_user.id} failed: {exc}")
+            if isinstance(exc, IntegrityError):
+                results.append({
+                    "index": index,
+                    "status_code": status.HTTP_409_CONFLICT,
+                    "detail": "Conflicts with related records"
+                })
+            else:
+                results.append({
+                    "index": index,
+                    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    "detail": "Database error"
+                })
+            continue
+        
+        status_code = status.HTTP_201_CREATED if operation.method == BatchMethod.CREATE else (
+            status.HTTP_204_NO_CONTENT if operation.method == BatchMethod.DELETE else status.HTTP_200_OK
+        )
+        results.append({"index": index, "status_code": status_code, "data": data})
+    
+    if failed and batch_in.atomic:
+        db.rollback()
+        # Operations that succeeded before the failure were rolled back too
+        for result in results:
+            if result["status_code"] < 300:
+                result["status_code"] = status.HTTP_424_FAILED_DEPENDENCY
+                result["data"] = None
+                result["detail"] = "Rolled back because another operation failed"
+        committed = False
+    else:
+        db.commit()
+        committed = True
+    
+    app_logger.info(
+        f"Batch of {len(batch_in.operations)} operations by user {current_user.id}: "
+        f"{'committed' if committed else 'rolled back'}"
+    )
+    return {"committed": committed, "results": results}
@@ -4,9 +4,16 @@ from typing import List, Optional
 
 from ..auth.dependencies import get_current_active_user
 from ..models.user import User, UserRole
-from ..models.course import Course, CourseCreate, CourseRead, CourseUpdate, CourseStatus
+from ..models.course import Course, CourseCreate, CourseRead, CourseReadWithTeacher, CourseCatalogEntry, CourseUpdate, CourseStatus
 from ..models.teacher import Teacher
 from ..database.session import get_db
+from ..utils.includes import COURSE_INCLUDES, parse_includes, expand_courses, fetch_by_ids
+from ..schemas.batch import BatchGetRequest, BatchGetResponse
+from ..utils.batch import batch_get_response
+from ..services.catalog_cache import course_catalog_cache
+from ..services.gpa_service import student_gpa_cache
+from ..services.class_rank import class_rankings
+from ..services.analytics import note_dimensions_changed, note_enrollments_changed
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
@@ -55,22 +62,26 @@ def create_course(
     db_course = Course(**course_in.dict())
     db.add(db_course)
     db.commit()
+    course_catalog_cache.invalidate()
     db.refresh(db_course)
     return db_course
 
-@router.get("/", response_model=List[CourseRead])
+@router.get("/", response_model=List[CourseReadWithTeacher])
 def read_courses(
     *,
     skip: int = 0,
     limit: int = 100,
     status: Optional[CourseStatus] = None,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[Course]:
+) -> List[CourseReadWithTeacher]:
     """
     Retrieve courses. All authenticated users can access this endpoint.
-    Filter by status is optional.
+    Filter by status is optional. Use include=teacher or include=teacher.user
+    to embed the course teacher.
     """
+    includes = parse_includes(include, COURSE_INCLUDES)
     query = select(Course)
     
     # Apply status filter if provided
@@ -84,25 +95,66 @@ def read_courses(
             query = query.where(Course.teacher_id == teacher.id)
     
     courses = db.exec(query.offset(skip).limit(limit)).all()
-    return courses
+    return expand_courses(db, courses, includes, current_user)
 
-@router.get("/{course_id}", response_model=CourseRead)
+@router.get("/catalog", response_model=List[CourseCatalogEntry])
+def read_course_catalog(
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[CourseStatus] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> List[dict]:
+    """
+    Browse all courses with enrolled and available seat counts.
+    Served from an in-process cache; seat counts are at most
+    CATALOG_CACHE_TTL_SECONDS old.
+    """
+    entries = course_catalog_cache.get(db, status)
+    return entries[skip:skip + limit]
+
+@router.post("/batch-get", response_model=BatchGetResponse[CourseReadWithTeacher])
+def batch_get_courses(
+    *,
+    batch_in: BatchGetRequest,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Get several courses by ID in one request. Results follow the order of the
+    requested ids, with not-found markers for unknown ids.
+    """
+    includes = parse_includes(include, COURSE_INCLUDES)
+    courses = fetch_by_ids(db, Course, batch_in.ids)
+    return batch_get_response(
+        batch_in.ids,
+        courses,
+        expand=lambda rows: expand_courses(db, rows, includes, current_user),
+    )
+
+@router.get("/{course_id}", response_model=CourseReadWithTeacher)
 def read_course(
     *,
     course_id: str,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> Course:
+) -> CourseReadWithTeacher:
     """
-    Get a specific course by ID.
+    Get a specific course by ID. Use include=teacher or include=teacher.user
+    to embed the course teacher.
     """
+    includes = parse_includes(include, COURSE_INCLUDES)
+    
     course = db.exec(select(Course).where(Course.id == course_id)).first()
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Course with ID {course_id} not found"
         )
-    return course
+    return expand_courses(db, [course], includes, current_user)[0]
 
 @router.patch("/{course_id}", response_model=CourseRead)
 def update_course(
@@ -148,6 +200,11 @@ def update_course(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Teacher with ID {course_data['teacher_id']} not found"
             )
+        # The course's grades move to the new teacher's department
+        previous_teacher = db.get(Teacher, course.teacher_id)
+        note_dimensions_changed(db, departments=[
+            previous_teacher.department if previous_teacher else None, teacher.department
+        ])
     
     # Apply updates
     for key, value in course_data.items():
@@ -155,6 +212,11 @@ def update_course(
     
     db.add(course)
     db.commit()
+    course_catalog_cache.invalidate()
+    # Credit hours and terms feed every enrolled student's GPA
+    if "credit_hours" in course_data or "start_date" in course_data:
+        student_gpa_cache.clear()
+        class_rankings.clear_grade_levels()
     db.refresh(course)
     return course
 
@@ -181,6 +243,13 @@ def delete_course(
             detail=f"Course with ID {course_id} not found"
         )
     
+    teacher = db.get(Teacher, course.teacher_id)
+    note_enrollments_changed(db, [course_id])
+    note_dimensions_changed(db, departments=[teacher.department if teacher else None])
     db.delete(course)
     db.commit()
+    course_catalog_cache.invalidate()
+    student_gpa_cache.clear()
+    class_rankings.drop_course(course_id)
+    class_rankings.clear_grade_levels()
     return None
\ No newline at end of file
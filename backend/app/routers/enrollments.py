@@ -4,10 +4,17 @@ from typing import List, Optional
 
 from ..auth.dependencies import get_current_active_user
 from ..models.user import User, UserRole
-from ..models.enrollment import Enrollment, EnrollmentCreate, EnrollmentRead, EnrollmentUpdate, EnrollmentStatus
+from ..models.enrollment import Enrollment, EnrollmentCreate, EnrollmentRead, EnrollmentReadWithDetails, EnrollmentUpdate, EnrollmentStatus
 from ..models.student import Student
-from ..models.course import Course, CourseStatus
 from ..database.session import get_db
+from ..utils.includes import ENROLLMENT_INCLUDES, parse_includes, expand_enrollments, fetch_by_ids
+from ..schemas.batch import BatchGetRequest, BatchGetResponse
+from ..utils.batch import batch_get_response
+from ..services.enrollment_service import EnrollmentService, EnrollmentEntry, enroll_many
+from ..schemas.enrollments import BulkEnrollmentRequest, BulkEnrollmentResponse, MAX_BULK_ENROLLMENT_PAIRS
+from ..services.enrollment_queue import enqueue_enrollment
+from ..models.enrollment_request import EnrollmentRequest, EnrollmentRequestCreate, EnrollmentRequestRead
+from ..config import settings
 
 router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
 
@@ -22,33 +29,94 @@ def create_enrollment(
     Create a new enrollment. Admin users can create any enrollment.
     Students can only enroll themselves in active courses.
     """
-    # Check if student exists
-    student = db.exec(select(Student).where(Student.id == enrollment_in.student_id)).first()
-    if not student:
+    db_enrollment = EnrollmentService(db, current_user).create_enrollment(enrollment_in)
+    db.commit()
+    db.refresh(db_enrollment)
+    return db_enrollment
+
+@router.post("/bulk", response_model=BulkEnrollmentResponse)
+def bulk_enroll(
+    *,
+    bulk_in: BulkEnrollmentRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Enroll a cohort of students into a set of courses. Only admin users can
+    bulk enroll. Students are selected by id or by grade level. Duplicates
+    and remaining capacity are resolved with set-based queries and all new
+    enrollments are inserted at once; the response reports the outcome of
+    every student/course pair.
+    """
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Student with ID {enrollment_in.student_id} not found"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
         )
     
-    # Check if course exists and is active
-    course = db.exec(select(Course).where(Course.id == enrollment_in.course_id)).first()
-    if not course:
+    if bulk_in.student_ids:
+        student_ids = list(dict.fromkeys(bulk_in.student_ids))
+    else:
+        student_ids = list(db.exec(
+            select(Student.id).where(Student.grade_level == bulk_in.grade_level).order_by(Student.id)
+        ).all())
+    course_ids = list(dict.fromkeys(bulk_in.course_ids))
+    
+    if len(student_ids) * len(course_ids) > MAX_BULK_ENROLLMENT_PAIRS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Course with ID {enrollment_in.course_id} not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk enrollment is limited to {MAX_BULK_ENROLLMENT_PAIRS} student/course pairs"
         )
     
-    if course.status != CourseStatus.ACTIVE and current_user.role != UserRole.ADMIN:
+    entries = [
+        EnrollmentEntry(student_id=student_id, course_id=course_id, status=bulk_in.status, allow_inactive=True)
+        for course_id in course_ids
+        for student_id in student_ids
+    ]
+    results = enroll_many(db, entries)
+    db.commit()
+    
+    summary = {}
+    for result in results:
+        summary[result.outcome] = summary.get(result.outcome, 0) + 1
+    
+    return {
+        "total": len(entries),
+        "summary": summary,
+        "results": [
+            {
+                "student_id": entry.student_id,
+                "course_id": entry.course_id,
+                "outcome": result.outcome,
+                "enrollment_id": result.enrollment_id,
+            }
+            for entry, result in zip(entries, results)
+        ],
+    }
+
+@router.post("/requests", response_model=EnrollmentRequestRead, status_code=status.HTTP_202_ACCEPTED)
+def request_enrollment(
+    *,
+    request_in: EnrollmentRequestCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> EnrollmentRequest:
+    """
+    Queue an enrollment for background processing and return a ticket.
+    Only permissions are checked here; course capacity, duplicates and the
+    existence of the student and course are resolved by the intake workers.
+    Poll GET /enrollments/requests/{ticket_id} for the outcome.
+    """
+    if not settings.ENROLLMENT_QUEUE_ENABLED:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot enroll in a course that is not active"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Queued enrollment intake is not enabled"
         )
     
-    # Check permissions
     if current_user.role == UserRole.STUDENT:
         # Students can only enroll themselves
-        student_profile = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
-        if not student_profile or student_profile.id != enrollment_in.student_id:
+        student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+        if not student or student.id != request_in.student_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Students can only enroll themselves"
@@ -59,42 +127,35 @@ def create_enrollment(
             detail="Not enough permissions"
         )
     
-    # Check if enrollment already exists
-    existing_enrollment = db.exec(
-        select(Enrollment).where(
-            Enrollment.student_id == enrollment_in.student_id,
-            Enrollment.course_id == enrollment_in.course_id
-        )
-    ).first()
-    
-    if existing_enrollment:
+    return enqueue_enrollment(db, request_in, current_user)
+
+@router.get("/requests/{ticket_id}", response_model=EnrollmentRequestRead)
+def read_enrollment_request(
+    *,
+    ticket_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> EnrollmentRequest:
+    """
+    Get the status of a queued enrollment. Users can only see their own
+    tickets unless they are an admin.
+    """
+    request = db.get(EnrollmentRequest, ticket_id)
+    if not request:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Student is already enrolled in this course"
-        )
-    
-    # Check if course has reached maximum capacity
-    current_enrollments = db.exec(
-        select(Enrollment).where(
-            Enrollment.course_id == enrollment_in.course_id,
-            Enrollment.status.in_([EnrollmentStatus.ACTIVE, EnrollmentStatus.PENDING])
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Enrollment request with ID {ticket_id} not found"
         )
-    ).all()
     
-    if len(current_enrollments) >= course.max_students:
+    if current_user.role != UserRole.ADMIN and request.requested_by != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Course has reached maximum capacity"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
         )
     
-    # Create new enrollment
-    db_enrollment = Enrollment(**enrollment_in.dict())
-    db.add(db_enrollment)
-    db.commit()
-    db.refresh(db_enrollment)
-    return db_enrollment
+    return request
 
-@router.get("/", response_model=List[EnrollmentRead])
+@router.get("/", response_model=List[EnrollmentReadWithDetails])
 def read_enrollments(
     *,
     skip: int = 0,
@@ -102,13 +163,16 @@ def read_enrollments(
     student_id: Optional[str] = None,
     course_id: Optional[str] = None,
     status: Optional[EnrollmentStatus] = None,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[Enrollment]:
+) -> List[EnrollmentReadWithDetails]:
     """
     Retrieve enrollments. Can be filtered by student_id, course_id, and status.
     Students can only see their own enrollments.
+    Use include=course,student (or student.user) to embed related records.
     """
+    includes = parse_includes(include, ENROLLMENT_INCLUDES)
     query = select(Enrollment)
     
     # Apply filters
@@ -130,18 +194,49 @@ def read_enrollments(
         query = query.where(Enrollment.student_id == student.id)
     
     enrollments = db.exec(query.offset(skip).limit(limit)).all()
-    return enrollments
+    return expand_enrollments(db, enrollments, includes, current_user)
 
-@router.get("/{enrollment_id}", response_model=EnrollmentRead)
+@router.post("/batch-get", response_model=BatchGetResponse[EnrollmentReadWithDetails])
+def batch_get_enrollments(
+    *,
+    batch_in: BatchGetRequest,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Get several enrollments by ID in one request. Results follow the order of
+    the requested ids; students can only read their own enrollments.
+    """
+    includes = parse_includes(include, ENROLLMENT_INCLUDES)
+    
+    own_student_id = None
+    if current_user.role == UserRole.STUDENT:
+        student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+        own_student_id = student.id if student else None
+    
+    enrollments = fetch_by_ids(db, Enrollment, batch_in.ids)
+    return batch_get_response(
+        batch_in.ids,
+        enrollments,
+        is_allowed=lambda e: current_user.role != UserRole.STUDENT or e.student_id == own_student_id,
+        expand=lambda rows: expand_enrollments(db, rows, includes, current_user),
+    )
+
+@router.get("/{enrollment_id}", response_model=EnrollmentReadWithDetails)
 def read_enrollment(
     *,
     enrollment_id: str,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> Enrollment:
+) -> EnrollmentReadWithDetails:
     """
     Get a specific enrollment by ID.
+    Use include=course,student (or student.user) to embed related records.
     """
+    includes = parse_includes(include, ENROLLMENT_INCLUDES)
+    
     enrollment = db.exec(select(Enrollment).where(Enrollment.id == enrollment_id)).first()
     if not enrollment:
         raise HTTPException(
@@ -159,7 +254,7 @@ def read_enrollment(
                 detail="Not enough permissions"
             )
     
-    return enrollment
+    return expand_enrollments(db, [enrollment], includes, current_user)[0]
 
 @router.patch("/{enrollment_id}", response_model=EnrollmentRead)
 def update_enrollment(
@@ -173,35 +268,7 @@ def update_enrollment(
     Update an enrollment status. Admin and teachers can update any enrollment.
     Students can only drop (cancel) their own enrollments.
     """
-    enrollment = db.exec(select(Enrollment).where(Enrollment.id == enrollment_id)).first()
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Enrollment with ID {enrollment_id} not found"
-        )
-    
-    # Check permissions
-    if current_user.role == UserRole.STUDENT:
-        # Students can only update their own enrollments to "DROPPED" status
-        student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
-        if not student or student.id != enrollment.student_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions"
-            )
-        
-        if enrollment_in.status != EnrollmentStatus.DROPPED:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Students can only drop enrollments"
-            )
-    
-    # Update enrollment status
-    enrollment_data = enrollment_in.dict(exclude_unset=True)
-    for key, value in enrollment_data.items():
-        setattr(enrollment, key, value)
-    
-    db.add(enrollment)
+    enrollment = EnrollmentService(db, current_user).update_enrollment(enrollment_id, enrollment_in)
     db.commit()
     db.refresh(enrollment)
     return enrollment
@@ -216,19 +283,6 @@ def delete_enrollment(
     """
     Delete an enrollment. Only admin users can delete enrollments.
     """
-    if current_user.role != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    enrollment = db.exec(select(Enrollment).where(Enrollment.id == enrollment_id)).first()
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Enrollment with ID {enrollment_id} not found"
-        )
-    
-    db.delete(enrollment)
+    EnrollmentService(db, current_user).delete_enrollment(enrollment_id)
     db.commit()
     return None
\ No newline at end of file
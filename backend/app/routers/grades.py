@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.responses import FileResponse
 from sqlmodel import Session, select
 from typing import List, Optional
+from datetime import date
+from pathlib import Path
 
 from ..auth.dependencies import get_current_active_user
 from ..models.user import User, UserRole
 from ..models.grade import Grade, GradeCreate, GradeRead, GradeUpdate, GradeType
-from ..models.enrollment import Enrollment, EnrollmentStatus
-from ..models.teacher import Teacher
+from ..models.enrollment import Enrollment
 from ..models.student import Student
 from ..models.course import Course
 from ..database.session import get_db
+from ..schemas.batch import BatchGetRequest, BatchGetResponse
+from ..utils.batch import batch_get_response
+from ..utils.includes import fetch_by_ids
+from ..services.grade_service import GradeService
+from ..schemas.grades import (
+    BulkGradeRequest, BulkGradeResponse, CourseGradeStatistics, CourseRankEntry, FinalGrade
+)
+from ..services.class_rank import course_ranking
+from ..services.grade_statistics import course_statistics_cache
+from ..services.grade_engine import course_final_grades
+from ..models.grade_import import GradeImportJob, GradeImportJobBase, GradeImportJobRead
+from ..services.grade_import import create_import_job, run_grade_import
 
 router = APIRouter(prefix="/grades", tags=["Grades"])
 
@@ -23,56 +37,129 @@ def create_grade(
     """
     Create a new grade. Only teachers who teach the course or admins can create grades.
     """
-    # Check if enrollment exists and is active
-    enrollment = db.exec(select(Enrollment).where(Enrollment.id == grade_in.enrollment_id)).first()
-    if not enrollment:
+    db_grade = GradeService(db, current_user).create_grade(grade_in)
+    db.commit()
+    db.refresh(db_grade)
+    return db_grade
+
+@router.post("/bulk", response_model=BulkGradeResponse)
+def bulk_create_grades(
+    *,
+    bulk_in: BulkGradeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Post scores for one assessment across a course in a single call.
+    Only the teacher of the course or admins can post grades. Rejected rows
+    are reported individually; with all_or_nothing=true no row is saved
+    unless every row is valid.
+    """
+    results = GradeService(db, current_user).bulk_create_grades(bulk_in)
+    db.commit()
+    
+    created = sum(1 for result in results if result["grade_id"])
+    return {"created": created, "rejected": len(results) - created, "results": results}
+
+def _import_job_read(job: GradeImportJob) -> GradeImportJobRead:
+    return GradeImportJobRead(**job.dict(), has_error_report=bool(job.error_report_path))
+
+def _get_import_job(db: Session, job_id: str, current_user: User) -> GradeImportJob:
+    job = db.get(GradeImportJob, job_id)
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Enrollment with ID {grade_in.enrollment_id} not found"
+            detail=f"Import job with ID {job_id} not found"
         )
     
-    if enrollment.status != EnrollmentStatus.ACTIVE:
+    if current_user.role != UserRole.ADMIN and job.requested_by != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot add grades to inactive enrollments"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
         )
-    
-    # Get the course for permission check
-    course = db.exec(select(Course).where(Course.id == enrollment.course_id)).first()
-    if not course:
+    return job
+
+@router.post("/import", response_model=GradeImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def import_gradebook(
+    *,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    grade_type: GradeType = Form(...),
+    max_score: float = Form(..., gt=0),
+    weight: float = Form(...),
+    grade_date: Optional[date] = Form(None),
+    course_id: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> GradeImportJobRead:
+    """
+    Upload a CSV or XLSX gradebook for one assessment and import it in the
+    background. Rows are matched to enrollments by a student_email or
+    student_id column, plus course_code when no course_id is given. Poll
+    GET /grades/import/{job_id} for progress and throughput; rejected rows
+    can be downloaded from GET /grades/import/{job_id}/errors.
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.TEACHER]:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course not found"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
         )
     
-    # Check permissions
-    if current_user.role == UserRole.TEACHER:
-        # Check if teacher is assigned to this course
-        teacher = db.exec(select(Teacher).where(Teacher.user_id == current_user.id)).first()
-        if not teacher or teacher.id != course.teacher_id:
+    if course_id:
+        course = db.get(Course, course_id)
+        if not course:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Teachers can only add grades to courses they teach"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Course with ID {course_id} not found"
             )
-    elif current_user.role != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
+        GradeService(db, current_user).check_course_permission(course, "import grades for")
     
-    # Validate score
-    if grade_in.score < 0 or grade_in.score > grade_in.max_score:
+    job_in = GradeImportJobBase(
+        course_id=course_id,
+        grade_type=grade_type,
+        max_score=max_score,
+        weight=weight,
+        grade_date=grade_date or date.today(),
+    )
+    job = _import_job_read(create_import_job(db, file, job_in, current_user))
+    # Release this request's connection before the import starts writing
+    db.close()
+    background_tasks.add_task(run_grade_import, job.id)
+    return job
+
+@router.get("/import/{job_id}", response_model=GradeImportJobRead)
+def read_import_job(
+    *,
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> GradeImportJobRead:
+    """
+    Get the progress of a gradebook import. Users can only see their own
+    imports unless they are an admin.
+    """
+    return _import_job_read(_get_import_job(db, job_id, current_user))
+
+@router.get("/import/{job_id}/errors")
+def download_import_errors(
+    *,
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Download the CSV report of rows rejected by a gradebook import."""
+    job = _get_import_job(db, job_id, current_user)
+    if not job.error_report_path:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Score must be between 0 and {grade_in.max_score}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="This import has no rejected rows"
         )
     
-    # Create the grade
-    db_grade = Grade(**grade_in.dict())
-    db.add(db_grade)
-    db.commit()
-    db.refresh(db_grade)
-    return db_grade
+    return FileResponse(
+        path=job.error_report_path,
+        filename=f"{Path(job.filename).stem}_errors.csv",
+        media_type="text/csv"
+    )
 
 @router.get("/", response_model=List[GradeRead])
 def read_grades(
@@ -118,6 +205,98 @@ def read_grades(
     grades = db.exec(query.offset(skip).limit(limit)).all()
     return grades
 
+@router.get("/courses/{course_id}/final", response_model=List[FinalGrade])
+def read_course_final_grades(
+    *,
+    course_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> List[dict]:
+    """
+    Weighted final grade of every enrollment in a course. Only the teacher
+    of the course or admins can see them.
+    """
+    course = db.get(Course, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Course with ID {course_id} not found"
+        )
+    
+    GradeService(db, current_user).check_course_permission(course, "view final grades for")
+    return course_final_grades(db, course_id)
+
+@router.get("/courses/{course_id}/statistics", response_model=CourseGradeStatistics)
+def read_course_grade_statistics(
+    *,
+    course_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Grade distribution of a course: mean, median, spread, percentiles and a
+    10-band histogram for the final grades and for each assessment. Only the
+    teacher of the course or admins can see them.
+    """
+    course = db.get(Course, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Course with ID {course_id} not found"
+        )
+    
+    GradeService(db, current_user).check_course_permission(course, "view statistics for")
+    return course_statistics_cache.get(db, course_id)
+
+@router.get("/courses/{course_id}/ranking", response_model=List[CourseRankEntry])
+def read_course_ranking(
+    *,
+    course_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> List[dict]:
+    """
+    Class rank and percentile of every graded enrollment in a course, best
+    first. Only the teacher of the course or admins can see the ranking.
+    """
+    course = db.get(Course, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Course with ID {course_id} not found"
+        )
+    
+    GradeService(db, current_user).check_course_permission(course, "view the ranking of")
+    return course_ranking(db, course_id)
+
+@router.post("/batch-get", response_model=BatchGetResponse[GradeRead])
+def batch_get_grades(
+    *,
+    batch_in: BatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Get several grades by ID in one request. Results follow the order of the
+    requested ids; students can only read their own grades.
+    """
+    grades = fetch_by_ids(db, Grade, batch_in.ids)
+    
+    if current_user.role != UserRole.STUDENT:
+        return batch_get_response(batch_in.ids, grades)
+    
+    # Resolve grade ownership for all requested grades at once
+    student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+    enrollments = fetch_by_ids(db, Enrollment, (g.enrollment_id for g in grades.values()))
+    own_enrollment_ids = {
+        e.id for e in enrollments.values() if student and e.student_id == student.id
+    }
+    return batch_get_response(
+        batch_in.ids,
+        grades,
+        is_allowed=lambda grade: grade.enrollment_id in own_enrollment_ids,
+    )
+
 @router.get("/{grade_id}", response_model=GradeRead)
 def read_grade(
     *,
@@ -166,57 +345,7 @@ def update_grade(
     """
     Update a grade. Only teachers of the course or admins can update grades.
     """
-    grade = db.exec(select(Grade).where(Grade.id == grade_id)).first()
-    if not grade:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Grade with ID {grade_id} not found"
-        )
-    
-    # Get the enrollment and course for permission check
-    enrollment = db.exec(select(Enrollment).where(Enrollment.id == grade.enrollment_id)).first()
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Enrollment not found"
-        )
-    
-    course = db.exec(select(Course).where(Course.id == enrollment.course_id)).first()
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course not found"
-        )
-    
-    # Check permissions
-    if current_user.role == UserRole.TEACHER:
-        # Check if teacher is assigned to this course
-        teacher = db.exec(select(Teacher).where(Teacher.user_id == current_user.id)).first()
-        if not teacher or teacher.id != course.teacher_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Teachers can only update grades for courses they teach"
-            )
-    elif current_user.role != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    # Validate score if provided
-    grade_data = grade_in.dict(exclude_unset=True)
-    if "score" in grade_data:
-        if grade_data["score"] < 0 or grade_data["score"] > grade.max_score:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Score must be between 0 and {grade.max_score}"
-            )
-    
-    # Update grade
-    for key, value in grade_data.items():
-        setattr(grade, key, value)
-    
-    db.add(grade)
+    grade = GradeService(db, current_user).update_grade(grade_id, grade_in)
     db.commit()
     db.refresh(grade)
     return grade
@@ -231,43 +360,6 @@ def delete_grade(
     """
     Delete a grade. Only admin users or the teacher of the course can delete grades.
     """
-    grade = db.exec(select(Grade).where(Grade.id == grade_id)).first()
-    if not grade:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Grade with ID {grade_id} not found"
-        )
-    
-    # Get the enrollment and course for permission check
-    enrollment = db.exec(select(Enrollment).where(Enrollment.id == grade.enrollment_id)).first()
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Enrollment not found"
-        )
-    
-    course = db.exec(select(Course).where(Course.id == enrollment.course_id)).first()
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course not found"
-        )
-    
-    # Check permissions
-    if current_user.role == UserRole.TEACHER:
-        # Check if teacher is assigned to this course
-        teacher = db.exec(select(Teacher).where(Teacher.user_id == current_user.id)).first()
-        if not teacher or teacher.id != course.teacher_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Teachers can only delete grades for courses they teach"
-            )
-    elif current_user.role != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    db.delete(grade)
+    GradeService(db, current_user).delete_grade(grade_id)
     db.commit()
     return None
\ No newline at end of file
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from sqlmodel import Session, select
 from typing import List
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pathlib import Path
 import os
 from datetime import datetime
 
 from ..database.session import get_db
-from ..services.report_service import ReportService
-from ..schemas.reports import StudentGradeReport, ReportResponse
+from ..services.report_service import ReportService, STUDENT_EXPORT_COLUMNS, course_roster_table
+from ..services.grade_service import GradeService
+from ..services.pdf_templates import get_template
+from ..schemas.reports import StudentGradeReport, ReportResponse, ReportStoreStats, ExportFormat, CourseRoster, RosterFormat
 from ..auth.dependencies import get_current_active_user
 from ..models.user import User, UserRole
+from ..models.student import Student
+from ..models.course import Course
+from ..models.report_job import ReportJob, ReportJobCreate, ReportJobRead, ReportJobStatus, ReportType
+from ..services.report_jobs import submit_report_job
+from ..services.report_store import lookup_report_file, report_store_stats
+from ..utils.streaming import RangeFileResponse, iter_csv, iter_xlsx
 from ..utils.logger import app_logger
 
 router = APIRouter(
@@ -22,17 +30,24 @@ router = APIRouter(
 def get_report_service(db: Session = Depends(get_db)) -> ReportService:
     return ReportService(db)
 
+def _can_access_student(db: Session, current_user: User, student_id: str) -> bool:
+    """Admins and teachers can access any student's reports, students only their own."""
+    if current_user.role in [UserRole.ADMIN, UserRole.TEACHER]:
+        return True
+    if current_user.role == UserRole.STUDENT:
+        student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+        return student is not None and student.id == student_id
+    return False
+
 @router.get("/students/{student_id}/grades", response_model=StudentGradeReport)
 def get_student_grades(
-    student_id: int,
+    student_id: str,
     current_user: User = Depends(get_current_active_user),
     report_service: ReportService = Depends(get_report_service)
 ):
     """Get grades report for a specific student."""
     # Check permissions - admin, teacher, or the student themselves
-    if (current_user.role != UserRole.ADMIN and 
-        current_user.role != UserRole.TEACHER and
-        (current_user.role == UserRole.STUDENT and current_user.student[0].id != student_id)):
+    if not _can_access_student(report_service.db, current_user, student_id):
         app_logger.warning(f"User {current_user.id} tried to access grades for student {student_id} without permission")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -51,16 +66,14 @@ def get_student_grades(
 
 @router.get("/students/{student_id}/transcript")
 def generate_student_transcript(
-    student_id: int,
+    student_id: str,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     report_service: ReportService = Depends(get_report_service)
 ):
     """Generate a PDF transcript for a student."""
     # Check permissions - admin, teacher, or the student themselves
-    if (current_user.role != UserRole.ADMIN and 
-        current_user.role != UserRole.TEACHER and
-        (current_user.role == UserRole.STUDENT and current_user.student[0].id != student_id)):
+    if not _can_access_student(report_service.db, current_user, student_id):
         app_logger.warning(f"User {current_user.id} tried to generate transcript for student {student_id} without permission")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -75,13 +88,80 @@ def generate_student_transcript(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Failed to generate transcript - student not found"
         )
+    report_service.db.commit()
     
     return FileResponse(
         path=pdf_path,
-        filename=Path(pdf_path).name,
+        filename=f"student_{student_id}_transcript.pdf",
         media_type="application/pdf"
     )
 
+@router.get("/students/{student_id}/report-card")
+def generate_student_report_card(
+    student_id: str,
+    current_user: User = Depends(get_current_active_user),
+    report_service: ReportService = Depends(get_report_service)
+):
+    """Generate a PDF report card for a student."""
+    # Check permissions - admin, teacher, or the student themselves
+    if not _can_access_student(report_service.db, current_user, student_id):
+        app_logger.warning(f"User {current_user.id} tried to generate report card for student {student_id} without permission")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to generate this student's report card"
+        )
+    
+    content = report_service.generate_report_card_pdf(student_id)
+    
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Failed to generate report card - student not found"
+        )
+    
+    return Response(
+        content=content,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="student_{student_id}_report_card.pdf"'}
+    )
+
+@router.get("/courses/{course_id}/roster")
+def generate_course_roster(
+    course_id: str,
+    format: RosterFormat = RosterFormat.JSON,
+    current_user: User = Depends(get_current_active_user),
+    report_service: ReportService = Depends(get_report_service)
+):
+    """
+    Every student of a course with their status, a column per assessment
+    and the final grade, as JSON, PDF or XLSX. Admins and the teacher of
+    the course only.
+    """
+    course = report_service.db.get(Course, course_id)
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Course with ID {course_id} not found"
+        )
+    GradeService(report_service.db, current_user).check_course_permission(course, "view rosters of")
+    
+    roster = report_service.get_course_roster(course)
+    filename = "".join(c if c.isalnum() else "_" for c in course.code) + "_roster"
+    if format == RosterFormat.PDF:
+        return Response(
+            content=get_template("roster").render_bytes(roster),
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.pdf"'}
+        )
+    if format == RosterFormat.XLSX:
+        columns, rows = course_roster_table(roster)
+        return StreamingResponse(
+            iter_xlsx(columns, [rows], sheet_name="Roster"),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.xlsx"'}
+        )
+    return CourseRoster(**roster)
+
 @router.get("/export/students", response_model=ReportResponse)
 def export_all_students(
     current_user: User = Depends(get_current_active_user),
@@ -98,6 +178,7 @@ def export_all_students(
     
     # Generate the Excel file
     excel_path = report_service.export_all_students_to_excel()
+    report_service.db.commit()
     filename = Path(excel_path).name
     
     return {
@@ -106,3 +187,164 @@ def export_all_students(
         "generated_at": datetime.now(),
         "file_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     }
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+@router.get("/export/students/download")
+def download_all_students(
+    format: ExportFormat = ExportFormat.CSV,
+    current_user: User = Depends(get_current_active_user),
+    report_service: ReportService = Depends(get_report_service)
+):
+    """
+    Stream all students as CSV or XLSX (admin and teachers only). Bytes are
+    sent while rows are read from the database; no file is written.
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.TEACHER]:
+        app_logger.warning(f"User {current_user.id} tried to export all students without permission")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators and teachers can export all students"
+        )
+    
+    batches = report_service.iter_students_export()
+    if format == ExportFormat.XLSX:
+        content = iter_xlsx(STUDENT_EXPORT_COLUMNS, batches, sheet_name="Students")
+    else:
+        content = iter_csv(STUDENT_EXPORT_COLUMNS, batches)
+    
+    filename = f"all_students_{datetime.now().strftime('%Y%m%d%H%M%S')}.{format.value}"
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/jobs", response_model=ReportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def create_report_job(
+    job_in: ReportJobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Queue a report for background rendering. Poll the returned job and
+    download the file once it is completed.
+    """
+    if job_in.report_type == ReportType.TRANSCRIPT:
+        if not job_in.student_id:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="student_id is required for transcripts"
+            )
+        if not db.get(Student, job_in.student_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Student not found"
+            )
+        allowed = _can_access_student(db, current_user, job_in.student_id)
+    elif job_in.report_type == ReportType.BATCH_TRANSCRIPTS:
+        if job_in.grade_level is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="grade_level is required for batch transcripts"
+            )
+        allowed = current_user.role in [UserRole.ADMIN, UserRole.TEACHER]
+    else:
+        allowed = current_user.role in [UserRole.ADMIN, UserRole.TEACHER]
+
+    if not allowed:
+        app_logger.warning(f"User {current_user.id} tried to queue a {job_in.report_type.value} report without permission")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to generate this report"
+        )
+
+    return submit_report_job(db, job_in, current_user)
+
+def _get_own_job(db: Session, job_id: str, current_user: User) -> ReportJob:
+    job = db.get(ReportJob, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+    if current_user.role != UserRole.ADMIN and job.requested_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this report job"
+        )
+    return job
+
+@router.get("/jobs/{job_id}", response_model=ReportJobRead)
+def get_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the status of a queued report."""
+    return _get_own_job(db, job_id, current_user)
+
+@router.get("/jobs/{job_id}/download")
+def download_report_job(
+    job_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Download the file of a completed report job. Single byte ranges are
+    supported so large files can be fetched in parts or resumed.
+    """
+    job = _get_own_job(db, job_id, current_user)
+    if job.status != ReportJobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Report is not ready for download"
+        )
+    file_path = lookup_report_file(db, job.file_path) if job.file_path else None
+    db.commit()
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report file is no longer available"
+        )
+
+    # Transcripts are stored under their content hash
+    if job.report_type == ReportType.TRANSCRIPT:
+        filename = f"student_{job.student_id}_transcript.pdf"
+    else:
+        filename = file_path.name
+
+    try:
+        return RangeFileResponse(
+            path=str(file_path),
+            filename=filename,
+            media_type=job.media_type,
+            range_header=request.headers.get("range")
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{os.path.getsize(file_path)}"}
+        )
+
+@router.get("/store", response_model=ReportStoreStats)
+def get_report_store_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Report storage usage per report type, plus this worker's hit, miss and
+    eviction counters (admin only).
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view report storage"
+        )
+    return report_store_stats(db)
@@ -4,8 +4,15 @@ from typing import List, Optional
 
 from ..auth.dependencies import get_current_active_user
 from ..models.user import User, UserRole
-from ..models.student import Student, StudentCreate, StudentRead, StudentUpdate
+from ..models.student import Student, StudentCreate, StudentRead, StudentReadWithUser, StudentUpdate
 from ..database.session import get_db
+from ..utils.includes import STUDENT_INCLUDES, parse_includes, expand_students, fetch_by_ids
+from ..schemas.batch import BatchGetRequest, BatchGetResponse
+from ..utils.batch import batch_get_response
+from ..schemas.gpa import StudentGpa, StudentRanks
+from ..services.gpa_service import get_student_gpas
+from ..services.class_rank import class_rankings, student_ranks
+from ..services.analytics import note_dimensions_changed
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
@@ -48,17 +55,21 @@ def create_student(
     db.refresh(db_student)
     return db_student
 
-@router.get("/", response_model=List[StudentRead])
+@router.get("/", response_model=List[StudentReadWithUser])
 def read_students(
     *,
     skip: int = 0,
     limit: int = 100,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[Student]:
+) -> List[StudentReadWithUser]:
     """
     Retrieve students. Teachers and admins can access this endpoint.
+    Use include=user to embed each student's user account.
     """
+    includes = parse_includes(include, STUDENT_INCLUDES)
+
     if current_user.role not in [UserRole.ADMIN, UserRole.TEACHER]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -66,18 +77,124 @@ def read_students(
         )
     
     students = db.exec(select(Student).offset(skip).limit(limit)).all()
-    return students
+    return expand_students(db, students, includes, current_user)
+
+@router.post("/batch-get", response_model=BatchGetResponse[StudentReadWithUser])
+def batch_get_students(
+    *,
+    batch_in: BatchGetRequest,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Get several students by ID in one request. Results follow the order of the
+    requested ids; students can only read their own record.
+    """
+    includes = parse_includes(include, STUDENT_INCLUDES)
+    
+    own_student_id = None
+    if current_user.role == UserRole.STUDENT:
+        own = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+        own_student_id = own.id if own else None
+    
+    students = fetch_by_ids(db, Student, batch_in.ids)
+    return batch_get_response(
+        batch_in.ids,
+        students,
+        is_allowed=lambda student: current_user.role != UserRole.STUDENT or student.id == own_student_id,
+        expand=lambda rows: expand_students(db, rows, includes, current_user),
+    )
+
+@router.get("/gpa", response_model=List[StudentGpa])
+def read_grade_level_gpas(
+    *,
+    grade_level: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> List[dict]:
+    """
+    Term and cumulative GPA of every student in a grade level, computed in
+    one pass. Teachers and admins can access this endpoint.
+    """
+    if current_user.role not in [UserRole.ADMIN, UserRole.TEACHER]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    student_ids = db.exec(
+        select(Student.id).where(Student.grade_level == grade_level).order_by(Student.id)
+    ).all()
+    gpas = get_student_gpas(db, student_ids, grade_level=grade_level)
+    return [gpas[student_id] for student_id in student_ids]
+
+@router.get("/{student_id}/gpa", response_model=StudentGpa)
+def read_student_gpa(
+    *,
+    student_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Term and cumulative GPA of a student, weighted by course credit hours.
+    Students can only see their own GPA.
+    """
+    if current_user.role == UserRole.STUDENT:
+        student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+        if not student or student.id != student_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+    
+    if not db.get(Student, student_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Student with ID {student_id} not found"
+        )
+    return get_student_gpas(db, [student_id])[student_id]
 
-@router.get("/{student_id}", response_model=StudentRead)
+@router.get("/{student_id}/rank", response_model=StudentRanks)
+def read_student_ranks(
+    *,
+    student_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Class rank and percentile of a student in their grade level and in each
+    graded course. Students can only see their own ranks.
+    """
+    if current_user.role == UserRole.STUDENT:
+        own = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
+        if not own or own.id != student_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+    
+    student = db.get(Student, student_id)
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Student with ID {student_id} not found"
+        )
+    return student_ranks(db, student)
+
+@router.get("/{student_id}", response_model=StudentReadWithUser)
 def read_student(
     *,
     student_id: str,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> Student:
+) -> StudentReadWithUser:
     """
-    Get a specific student by ID.
+    Get a specific student by ID. Use include=user to embed the user account.
     """
+    includes = parse_includes(include, STUDENT_INCLUDES)
+    
     # Students can only access their own record
     if current_user.role == UserRole.STUDENT:
         student = db.exec(select(Student).where(Student.user_id == current_user.id)).first()
@@ -93,7 +210,7 @@ def read_student(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Student with ID {student_id} not found"
         )
-    return student
+    return expand_students(db, [student], includes, current_user)[0]
 
 @router.patch("/{student_id}", response_model=StudentRead)
 def update_student(
@@ -121,11 +238,15 @@ def update_student(
     
     # Update student attributes
     student_data = student_in.dict(exclude_unset=True)
+    if "grade_level" in student_data:
+        note_dimensions_changed(db, grade_levels=[student.grade_level, student_data["grade_level"]])
     for key, value in student_data.items():
         setattr(student, key, value)
     
     db.add(student)
     db.commit()
+    if "grade_level" in student_data:
+        class_rankings.clear_grade_levels()
     db.refresh(student)
     return student
 
@@ -152,6 +273,8 @@ def delete_student(
             detail=f"Student with ID {student_id} not found"
         )
     
+    note_dimensions_changed(db, grade_levels=[student.grade_level])
     db.delete(student)
     db.commit()
+    class_rankings.clear_grade_levels()
     return None
\ No newline at end of file
@@ -4,8 +4,12 @@ from typing import List, Optional
 
 from ..auth.dependencies import get_current_active_user
 from ..models.user import User, UserRole
-from ..models.teacher import Teacher, TeacherCreate, TeacherRead, TeacherUpdate
+from ..models.teacher import Teacher, TeacherCreate, TeacherRead, TeacherReadWithUser, TeacherUpdate
 from ..database.session import get_db
+from ..utils.includes import TEACHER_INCLUDES, parse_includes, expand_teachers, fetch_by_ids
+from ..schemas.batch import BatchGetRequest, BatchGetResponse
+from ..utils.batch import batch_get_response
+from ..services.analytics import note_dimensions_changed
 
 router = APIRouter(prefix="/teachers", tags=["Teachers"])
 
@@ -48,30 +52,63 @@ def create_teacher(
     db.refresh(db_teacher)
     return db_teacher
 
-@router.get("/", response_model=List[TeacherRead])
+@router.get("/", response_model=List[TeacherReadWithUser])
 def read_teachers(
     *,
     skip: int = 0,
     limit: int = 100,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[Teacher]:
+) -> List[TeacherReadWithUser]:
     """
     Retrieve teachers. All authenticated users can access this endpoint.
+    Use include=user to embed each teacher's user account.
     """
+    includes = parse_includes(include, TEACHER_INCLUDES)
     teachers = db.exec(select(Teacher).offset(skip).limit(limit)).all()
-    return teachers
+    return expand_teachers(db, teachers, includes, current_user)
 
-@router.get("/{teacher_id}", response_model=TeacherRead)
+@router.post("/batch-get", response_model=BatchGetResponse[TeacherReadWithUser])
+def batch_get_teachers(
+    *,
+    batch_in: BatchGetRequest,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Get several teachers by ID in one request. Results follow the order of the
+    requested ids; teachers can only read their own record in detail.
+    """
+    includes = parse_includes(include, TEACHER_INCLUDES)
+    
+    own_teacher_id = None
+    if current_user.role == UserRole.TEACHER:
+        own = db.exec(select(Teacher).where(Teacher.user_id == current_user.id)).first()
+        own_teacher_id = own.id if own else None
+    
+    teachers = fetch_by_ids(db, Teacher, batch_in.ids)
+    return batch_get_response(
+        batch_in.ids,
+        teachers,
+        is_allowed=lambda teacher: current_user.role != UserRole.TEACHER or teacher.id == own_teacher_id,
+        expand=lambda rows: expand_teachers(db, rows, includes, current_user),
+    )
+
+@router.get("/{teacher_id}", response_model=TeacherReadWithUser)
 def read_teacher(
     *,
     teacher_id: str,
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-) -> Teacher:
+) -> TeacherReadWithUser:
     """
-    Get a specific teacher by ID.
+    Get a specific teacher by ID. Use include=user to embed the user account.
     """
+    includes = parse_includes(include, TEACHER_INCLUDES)
+    
     # Teachers can only access their own record in detail
     if current_user.role == UserRole.TEACHER:
         teacher = db.exec(select(Teacher).where(Teacher.user_id == current_user.id)).first()
@@ -87,7 +124,7 @@ def read_teacher(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Teacher with ID {teacher_id} not found"
         )
-    return teacher
+    return expand_teachers(db, [teacher], includes, current_user)[0]
 
 @router.patch("/{teacher_id}", response_model=TeacherRead)
 def update_teacher(
@@ -124,6 +161,8 @@ def update_teacher(
     
     # Update teacher attributes
     teacher_data = teacher_in.dict(exclude_unset=True)
+    if "department" in teacher_data:
+        note_dimensions_changed(db, departments=[teacher.department, teacher_data["department"]])
     for key, value in teacher_data.items():
         setattr(teacher, key, value)
     
@@ -155,6 +194,7 @@ def delete_teacher(
             detail=f"Teacher with ID {teacher_id} not found"
         )
     
+    note_dimensions_changed(db, departments=[teacher.department])
     db.delete(teacher)
     db.commit()
     return None
\ No newline at end of file
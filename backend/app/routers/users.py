@@ -6,6 +6,9 @@ from ..auth.dependencies import get_current_active_user
 from ..auth.token import get_password_hash
 from ..models.user import User, UserCreate, UserRead, UserUpdate, UserRole
 from ..database.session import get_db
+from ..schemas.batch import BatchGetRequest, BatchGetResponse
+from ..utils.batch import batch_get_response
+from ..utils.includes import fetch_by_ids
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -60,6 +63,24 @@ def read_users(
     users = db.exec(select(User).offset(skip).limit(limit)).all()
     return users
 
+@router.post("/batch-get", response_model=BatchGetResponse[UserRead])
+def batch_get_users(
+    *,
+    batch_in: BatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Get several users by ID in one request. Results follow the order of the
+    requested ids; users can only read their own record unless they are an admin.
+    """
+    users = fetch_by_ids(db, User, batch_in.ids)
+    return batch_get_response(
+        batch_in.ids,
+        users,
+        is_allowed=lambda user: current_user.role == UserRole.ADMIN or user.id == current_user.id,
+    )
+
 @router.get("/{user_id}", response_model=UserRead)
 def read_user(
     *,
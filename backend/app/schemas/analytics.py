@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+from ..models.enrollment import EnrollmentStatus
+
+class CourseEnrollmentStats(BaseModel):
+    course_id: str
+    # None when the course has been deleted since
+    course_code: Optional[str] = None
+    course_name: Optional[str] = None
+    total: int
+    by_status: Dict[EnrollmentStatus, int]
+
+class DepartmentGradeStats(BaseModel):
+    department: str
+    graded_enrollments: int
+    # Mean final grade on the 0-100 scale
+    average_grade: Optional[float] = None
+
+class GradeLevelPassStats(BaseModel):
+    grade_level: int
+    graded_enrollments: int
+    passed_enrollments: int
+    # Share of graded enrollments with a passing final grade, 0-1
+    pass_rate: Optional[float] = None
+
+class AnalyticsDashboard(BaseModel):
+    enrollments: List[CourseEnrollmentStats]
+    departments: List[DepartmentGradeStats]
+    grade_levels: List[GradeLevelPassStats]
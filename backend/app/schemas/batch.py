@@ -0,0 +1,58 @@
+from pydantic import BaseModel, Field
+from pydantic.generics import GenericModel
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Upper bound on ids accepted by a single batch lookup
+MAX_BATCH_IDS = 500
+
+class BatchGetRequest(BaseModel):
+    ids: List[str] = Field(..., min_items=1, max_items=MAX_BATCH_IDS)
+
+class BatchItemStatus(str, Enum):
+    FOUND = "found"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
+class BatchGetItem(GenericModel, Generic[T]):
+    id: str
+    status: BatchItemStatus
+    data: Optional[T] = None
+
+class BatchGetResponse(GenericModel, Generic[T]):
+    items: List[BatchGetItem[T]]
+
+# Upper bound on operations accepted by a single /batch request
+MAX_BATCH_OPERATIONS = 500
+
+class BatchResource(str, Enum):
+    GRADES = "grades"
+    ENROLLMENTS = "enrollments"
+
+class BatchMethod(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class BatchOperation(BaseModel):
+    resource: BatchResource
+    method: BatchMethod
+    id: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_items=1, max_items=MAX_BATCH_OPERATIONS)
+    # When true, any failing operation rolls back the whole batch
+    atomic: bool = True
+
+class BatchOperationResult(BaseModel):
+    index: int
+    status_code: int
+    data: Optional[Dict[str, Any]] = None
+    detail: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    committed: bool
+    results: List[BatchOperationResult]
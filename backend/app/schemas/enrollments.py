@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field, root_validator
+from typing import Dict, List, Optional
+
+from ..models.enrollment import EnrollmentStatus
+from ..models.enrollment_request import EnrollmentOutcome
+
+# Upper bound on student/course pairs handled by one bulk request
+MAX_BULK_ENROLLMENT_PAIRS = 20000
+
+class BulkEnrollmentRequest(BaseModel):
+    student_ids: Optional[List[str]] = None
+    grade_level: Optional[int] = None
+    course_ids: List[str] = Field(..., min_items=1)
+    status: EnrollmentStatus = EnrollmentStatus.ACTIVE
+    
+    @root_validator(skip_on_failure=True)
+    def check_student_selector(cls, values):
+        if not values.get("student_ids") and values.get("grade_level") is None:
+            raise ValueError("Provide student_ids or grade_level")
+        return values
+
+class BulkEnrollmentResult(BaseModel):
+    student_id: str
+    course_id: str
+    outcome: EnrollmentOutcome
+    enrollment_id: Optional[str] = None
+
+class BulkEnrollmentResponse(BaseModel):
+    total: int
+    summary: Dict[EnrollmentOutcome, int]
+    results: List[BulkEnrollmentResult]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .grades import ClassRank
+
+class TermGpa(BaseModel):
+    term: str
+    gpa: Optional[float] = None
+    credit_hours: int
+
+class StudentGpa(BaseModel):
+    student_id: str
+    cumulative_gpa: Optional[float] = None
+    credit_hours: int
+    standing: Optional[str] = None
+    terms: List[TermGpa]
+
+class StudentCourseRank(ClassRank):
+    course_id: str
+    enrollment_id: str
+
+class StudentRanks(BaseModel):
+    student_id: str
+    grade_level: int
+    # Rank by credit-hour weighted average of course finals
+    grade_level_rank: Optional[ClassRank] = None
+    courses: List[StudentCourseRank]
@@ -0,0 +1,73 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import Dict, List, Optional
+
+from ..models.grade import GradeType
+
+# Upper bound on rows accepted by one bulk grade request
+MAX_BULK_GRADE_ROWS = 5000
+
+class BulkGradeEntry(BaseModel):
+    enrollment_id: str
+    score: float
+    comments: Optional[str] = None
+
+class BulkGradeRequest(BaseModel):
+    course_id: str
+    grade_type: GradeType
+    max_score: float = Field(..., gt=0)
+    weight: float
+    grade_date: date = Field(default_factory=date.today)
+    scores: List[BulkGradeEntry] = Field(..., min_items=1, max_items=MAX_BULK_GRADE_ROWS)
+    # When true, nothing is inserted if any row is rejected
+    all_or_nothing: bool = False
+
+class BulkGradeRowResult(BaseModel):
+    index: int
+    enrollment_id: str
+    grade_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkGradeResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[BulkGradeRowResult]
+
+class FinalGrade(BaseModel):
+    enrollment_id: str
+    student_id: str
+    final_percentage: Optional[float] = None
+    letter_grade: Optional[str] = None
+    assessments: int
+    weight_covered: float
+    latest_grade_date: Optional[date] = None
+
+class GradeStatistics(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    std_dev: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+    # Counts per 10-point band of the 0-100 scale, lowest band first
+    histogram: List[int]
+
+class AssessmentStatistics(GradeStatistics):
+    grade_type: GradeType
+    grade_date: date
+
+class CourseGradeStatistics(BaseModel):
+    course_id: str
+    finals: GradeStatistics
+    assessments: List[AssessmentStatistics]
+
+class ClassRank(BaseModel):
+    score: float
+    rank: int
+    percentile: float
+    class_size: int
+
+class CourseRankEntry(ClassRank):
+    enrollment_id: str
+    student_id: Optional[str] = None
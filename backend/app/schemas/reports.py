@@ -1,25 +1,84 @@
 from pydantic import BaseModel
 from datetime import date, datetime
 from typing import List, Optional
+from enum import Enum
+
+from ..models.enrollment import EnrollmentStatus
+from ..models.report_job import ReportType
 
 class GradeInfo(BaseModel):
-    course_id: int
+    enrollment_id: str
+    course_id: str
     course_name: str
     course_code: str
+    credit_hours: int
     enrollment_date: date
+    status: EnrollmentStatus
+    # Weighted average of the course's grades on the 0-100 scale
     grade: Optional[float] = None
+    letter_grade: Optional[str] = None
+    grade_count: int = 0
+    # Date of the most recent grade
     grade_date: Optional[date] = None
     
 class StudentGradeReport(BaseModel):
-    student_id: int
+    student_id: str
     student_name: str
     grade_level: int
     enrollment_date: date
     grades: List[GradeInfo]
     generated_at: datetime
     
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+    
+class RosterFormat(str, Enum):
+    JSON = "json"
+    PDF = "pdf"
+    XLSX = "xlsx"
+
+class RosterStudent(BaseModel):
+    enrollment_id: str
+    student_id: str
+    student_name: str
+    email: str
+    grade_level: int
+    status: EnrollmentStatus
+    enrollment_date: date
+    # Percentage of each assessment, in the order of CourseRoster.assessments
+    scores: List[Optional[float]]
+    final_grade: Optional[float] = None
+    letter_grade: Optional[str] = None
+
+class CourseRoster(BaseModel):
+    course_id: str
+    course_code: str
+    course_name: str
+    # Column labels, "<grade type> <date>", oldest first
+    assessments: List[str]
+    students: List[RosterStudent]
+    generated_at: datetime
+    
 class ReportResponse(BaseModel):
     filename: str
     file_path: str
     generated_at: datetime
     file_type: str
+
+class ReportTypeUsage(BaseModel):
+    report_type: ReportType
+    files: int
+    bytes: int
+
+class ReportStoreStats(BaseModel):
+    max_bytes: int
+    total_files: int
+    total_bytes: int
+    by_type: List[ReportTypeUsage]
+    # Counters of the worker that served the request, since it started
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    evicted_bytes: int
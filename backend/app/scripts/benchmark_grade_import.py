@@ -0,0 +1,147 @@
+import argparse
+import csv
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from openpyxl import Workbook
+from sqlalchemy import insert
+from sqlmodel import SQLModel, Session, create_engine
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.course import Course, CourseStatus
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.grade import GradeType
+from app.models.grade_import import GradeImportJob, GradeImportStatus
+from app.services.grade_import import run_grade_import
+
+ROW_COUNTS = [10_000, 100_000]
+SEED_CHUNK = 50_000
+# Every this many rows has a score out of range, so the error report is exercised
+INVALID_EVERY = 100
+
+def seed(url: str, rows: int) -> str:
+    """One course with ``rows`` enrolled students; returns the admin who imports."""
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.execute(insert(User), [{
+            "id": "admin", "email": "admin@bench.test", "first_name": "A", "last_name": "A",
+            "role": UserRole.ADMIN, "is_active": True, "hashed_password": "x", "created_at": now, "updated_at": now,
+        }, {
+            "id": "teacher-user", "email": "teacher@bench.test", "first_name": "T", "last_name": "T",
+            "role": UserRole.TEACHER, "is_active": True, "hashed_password": "x", "created_at": now, "updated_at": now,
+        }])
+        session.execute(insert(Teacher), [{
+            "id": "teacher", "user_id": "teacher-user", "hire_date": date(2020, 1, 1), "qualification": "MSc",
+            "created_at": now, "updated_at": now,
+        }])
+        session.execute(insert(Course), [{
+            "id": "course", "name": "Algebra", "code": "ALG101", "credit_hours": 3, "teacher_id": "teacher",
+            "max_students": rows, "start_date": date(2025, 1, 1), "end_date": date(2025, 6, 1),
+            "status": CourseStatus.ACTIVE, "enrolled_count": rows, "created_at": now, "updated_at": now,
+        }])
+        for start in range(0, rows, SEED_CHUNK):
+            users, students, enrollments = [], [], []
+            for i in range(start, min(start + SEED_CHUNK, rows)):
+                users.append({
+                    "id": f"u{i}", "email": f"student{i}@bench.test", "first_name": "Student", "last_name": str(i),
+                    "role": UserRole.STUDENT, "is_active": True, "hashed_password": "x",
+                    "created_at": now, "updated_at": now,
+                })
+                students.append({
+                    "id": f"s{i}", "user_id": f"u{i}", "enrollment_date": date(2024, 9, 1), "grade_level": 9,
+                    "created_at": now, "updated_at": now,
+                })
+                enrollments.append({
+                    "id": f"e{i}", "student_id": f"s{i}", "course_id": "course", "enrollment_date": date(2024, 9, 1),
+                    "status": EnrollmentStatus.ACTIVE, "created_at": now, "updated_at": now,
+                })
+            session.execute(insert(User), users)
+            session.execute(insert(Student), students)
+            session.execute(insert(Enrollment), enrollments)
+        session.commit()
+    engine.dispose()
+    return "admin"
+
+def gradebook_rows(rows: int):
+    yield ["email", "course_code", "score", "comments"]
+    for i in range(rows):
+        yield [f"student{i}@bench.test", "ALG101", 120 if i % INVALID_EVERY == 0 else i % 100, ""]
+
+def write_gradebook(path: Path, rows: int) -> Path:
+    """A gradebook of ``rows`` scores, streamed to disk in the format of ``path``'s extension."""
+    if path.suffix == ".xlsx":
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Grades")
+        for row in gradebook_rows(rows):
+            sheet.append(row)
+        workbook.save(path)
+    else:
+        with open(path, "w", newline="") as target:
+            csv.writer(target).writerows(gradebook_rows(rows))
+    return path
+
+def measure(url: str, path: str, requested_by: str) -> dict:
+    """Import one gradebook in a fresh process and report the job's counters and peak RSS."""
+    engine = create_engine(url)
+    with Session(engine) as session:
+        job = GradeImportJob(requested_by=requested_by, filename=Path(path).name, file_path=path,
+                             grade_type=GradeType.EXAM, max_score=100, weight=1, grade_date=date(2025, 3, 1))
+        session.add(job)
+        job_id = job.id
+        session.commit()
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    run_grade_import(job_id, bind=engine)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with Session(engine) as session:
+        job = session.get(GradeImportJob, job_id)
+        result = {"status": GradeImportStatus(job.status).value, "imported": job.imported_rows, "rejected": job.rejected_rows,
+                  "seconds": elapsed, "peak_mb": peak / 1024, "growth_mb": (peak - baseline) / 1024}
+        if job.error_report_path:
+            Path(job.error_report_path).unlink(missing_ok=True)
+    engine.dispose()
+    return result
+
+def in_fresh_process(func, *args):
+    # Peak RSS is inherited from the parent at fork; measure every import in its own process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(func, *args).result()
+
+def main():
+    """Measure rows/sec and peak RSS of chunked gradebook imports from large CSV and XLSX files"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=ROW_COUNTS, help="gradebook sizes to import")
+    parser.add_argument("--formats", nargs="+", choices=["csv", "xlsx"], default=["csv", "xlsx"])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'format':>6} {'status':>10} {'imported':>9} {'rejected':>9} "
+          f"{'seconds':>8} {'rows/s':>9} {'peak MB':>8} {'growth MB':>10}")
+    for rows in args.rows:
+        for file_format in args.formats:
+            with tempfile.TemporaryDirectory() as directory:
+                url = f"sqlite:///{directory}/bench.db"
+                requested_by = in_fresh_process(seed, url, rows)
+                path = write_gradebook(Path(directory) / f"gradebook.{file_format}", rows)
+                result = in_fresh_process(measure, url, str(path), requested_by)
+                print(f"{rows:>10} {file_format:>6} {result['status']:>10} {result['imported']:>9} "
+                      f"{result['rejected']:>9} {result['seconds']:>8.2f} {rows / result['seconds']:>9.0f} "
+                      f"{result['peak_mb']:>8.1f} {result['growth_mb']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import sys
+import time
+from datetime import date, datetime
+from io import BytesIO
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.pdf_templates import TEMPLATES, get_template
+
+COURSE_COUNTS = [6, 40, 120]
+
+def sample_report(courses: int) -> dict:
+    return {
+        "student_id": "bench-student",
+        "student_name": "Bench Student",
+        "grade_level": 10,
+        "enrollment_date": date(2024, 9, 1),
+        "grades": [
+            {"course_code": f"C{i:03d}", "course_name": f"Course number {i}", "credit_hours": 1 + i % 4,
+             "grade": None if i % 7 == 0 else 60.0 + i % 40, "letter_grade": "B", "status": "active"}
+            for i in range(courses)
+        ],
+        "gpa": {"cumulative_gpa": 3.2, "credit_hours": 24, "standing": "Good Standing",
+                "terms": [{"term": "Fall 2024", "gpa": 3.2, "credit_hours": 24}]},
+        "generated_at": datetime.now().isoformat(),
+    }
+
+def rebuilt_transcript(report: dict, output) -> int:
+    """The previous shape: styles and table styles built again for every document."""
+    return TEMPLATES["transcript"]().render(report, output)
+
+def measure(render, report: dict, documents: int) -> tuple:
+    """Milliseconds per document and per page over ``documents`` renders into memory."""
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(documents):
+        pages += render(report, BytesIO())
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return elapsed_ms / documents, elapsed_ms / pages, pages // documents
+
+def main():
+    """Measure milliseconds per page of the precompiled PDF templates against per-document styles"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--courses", type=int, nargs="+", default=COURSE_COUNTS, help="courses per document")
+    parser.add_argument("--documents", type=int, default=200, help="documents rendered per measurement")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    templates = {name: get_template(name) for name in ("transcript", "report_card")}
+    print(f"templates built once in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    renderers = {
+        "rebuilt": rebuilt_transcript,
+        "transcript": templates["transcript"].render,
+        "report_card": templates["report_card"].render,
+    }
+    print(f"{'courses':>8} {'layout':>12} {'pages':>6} {'ms/doc':>8} {'ms/page':>8}")
+    for courses in args.courses:
+        report = sample_report(courses)
+        for name, render in renderers.items():
+            # Warm up so imports and font loading are not counted
+            render(report, BytesIO())
+            per_document, per_page, pages = measure(render, report, args.documents)
+            print(f"{courses:>8} {name:>12} {pages:>6} {per_document:>8.2f} {per_page:>8.2f}")
+
+if __name__ == "__main__":
+    main()
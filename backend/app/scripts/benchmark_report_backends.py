@@ -0,0 +1,137 @@
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, insert, update
+from sqlmodel import SQLModel, Session, create_engine, select
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.course import Course, CourseStatus
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.grade import Grade, GradeType
+from app.services.report_service import ReportService
+from app.config import ReportBackend
+from app.services.report_snapshot import ReportSnapshot
+
+STUDENTS = 2000
+COURSES = 40
+COURSES_PER_STUDENT = 6
+GRADES_PER_COURSE = 12
+CHANGED_GRADES = 500
+ROUNDS = 3
+
+def seed(session: Session, students: int) -> None:
+    """``students`` students over four grade levels, each in COURSES_PER_STUDENT courses with grades."""
+    # Spread over the last term, as rows written day by day would be
+    start = datetime.utcnow() - timedelta(days=90)
+    now = start
+    session.execute(insert(User), [{
+        "id": "teacher-user", "email": "teacher@bench.test", "first_name": "T", "last_name": "T",
+        "role": UserRole.TEACHER, "is_active": True, "hashed_password": "x", "created_at": now, "updated_at": now,
+    }])
+    session.execute(insert(Teacher), [{
+        "id": "teacher", "user_id": "teacher-user", "hire_date": date(2020, 1, 1), "qualification": "MSc",
+        "created_at": now, "updated_at": now,
+    }])
+    session.execute(insert(Course), [{
+        "id": f"c{i}", "name": f"Course {i}", "code": f"C{i:03d}", "credit_hours": 3, "teacher_id": "teacher",
+        "max_students": students, "start_date": date(2025, 1, 1), "end_date": date(2025, 6, 1),
+        "status": CourseStatus.ACTIVE, "enrolled_count": 0, "created_at": now, "updated_at": now,
+    } for i in range(COURSES)])
+    for i in range(students):
+        now = start + timedelta(days=90) * i / students
+        users, student_rows, enrollments, grades = [], [], [], []
+        users.append({
+            "id": f"u{i}", "email": f"student{i}@bench.test", "first_name": "Student", "last_name": str(i),
+            "role": UserRole.STUDENT, "is_active": True, "hashed_password": "x", "created_at": now, "updated_at": now,
+        })
+        student_rows.append({
+            "id": f"s{i}", "user_id": f"u{i}", "enrollment_date": date(2024, 9, 1), "grade_level": 9 + i % 4,
+            "created_at": now, "updated_at": now,
+        })
+        for k in range(COURSES_PER_STUDENT):
+            enrollment_id = f"e{i}-{k}"
+            enrollments.append({
+                "id": enrollment_id, "student_id": f"s{i}", "course_id": f"c{(i + k) % COURSES}",
+                "enrollment_date": date(2024, 9, 1), "status": EnrollmentStatus.ACTIVE,
+                "created_at": now, "updated_at": now,
+            })
+            grades.extend({
+                "id": f"{enrollment_id}-{j}", "enrollment_id": enrollment_id, "grade_type": GradeType.QUIZ,
+                "score": float((i + j) % 10), "max_score": 10.0, "weight": 1.0,
+                "grade_date": date(2025, 1 + j % 5, 1 + j), "created_at": now, "updated_at": now,
+            } for j in range(GRADES_PER_COURSE))
+        session.execute(insert(User), users)
+        session.execute(insert(Student), student_rows)
+        session.execute(insert(Enrollment), enrollments)
+        session.execute(insert(Grade), grades)
+    session.commit()
+
+def change_grades(session: Session, count: int) -> None:
+    """Update ``count`` grades and delete as many, as a day of grading would."""
+    ids = session.exec(select(Grade.id).limit(2 * count)).all()
+    session.execute(update(Grade).where(Grade.id.in_(ids[:count]))
+                    .values(score=Grade.score + 1, updated_at=datetime.utcnow()))
+    session.execute(delete(Grade).where(Grade.id.in_(ids[count:])))
+    session.commit()
+
+def timed(func) -> float:
+    """Best of ROUNDS, in milliseconds."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def reports(service: ReportService, course: Course) -> dict:
+    return {
+        "grade level grades": lambda: service.get_students_grades(grade_level=9),
+        "course roster": lambda: service.get_course_roster(course),
+        "students export": lambda: sum(len(batch) for batch in service.iter_students_export()),
+    }
+
+def main():
+    """Compare set-based report latency on the primary database and on the report snapshot"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--database-url", help="read this database instead of seeding a temporary one")
+    parser.add_argument("--students", type=int, default=STUDENTS, help="students to seed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(args.database_url or f"sqlite:///{directory}/primary.db")
+        snapshot = ReportSnapshot(Path(directory) / "snapshot.db", source=engine)
+        with Session(engine) as session:
+            if not args.database_url:
+                SQLModel.metadata.create_all(engine)
+                seed(session, args.students)
+                print(f"{args.students} students x {COURSES_PER_STUDENT} courses x {GRADES_PER_COURSE} grades")
+
+            start = time.perf_counter()
+            snapshot.refresh()
+            print(f"full snapshot:        {(time.perf_counter() - start) * 1000:9.1f} ms")
+            if not args.database_url:
+                change_grades(session, CHANGED_GRADES)
+            start = time.perf_counter()
+            counts = snapshot.refresh()
+            changed = sum(count["copied"] + count["deleted"] for count in counts.values())
+            print(f"incremental snapshot: {(time.perf_counter() - start) * 1000:9.1f} ms ({changed} rows changed)")
+
+            course = session.exec(select(Course).order_by(Course.code)).first()
+            primary = reports(ReportService(session, ReportBackend.PRIMARY), course)
+            copied = reports(ReportService(session, ReportBackend.SNAPSHOT, snapshot), course)
+            print(f"{'report':<20} {'primary ms':>11} {'snapshot ms':>12}   best of {ROUNDS}")
+            for name in primary:
+                print(f"{name:<20} {timed(primary[name]):>11.1f} {timed(copied[name]):>12.1f}")
+        snapshot.engine.dispose()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
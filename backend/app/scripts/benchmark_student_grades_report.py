@@ -0,0 +1,105 @@
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel, Session, create_engine, select
+from app.models.user import User, UserRole
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.course import Course, CourseStatus
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.grade import Grade, GradeType
+from app.services.report_service import ReportService
+
+STUDENTS = 20
+COURSES = 8
+GRADES_PER_COURSE = 60
+ROUNDS = 3
+
+def seed(session: Session) -> list:
+    """STUDENTS students, each in COURSES courses with GRADES_PER_COURSE grades per course."""
+    teacher_user = User(email="teacher@bench.test", first_name="T", last_name="T",
+                        role=UserRole.TEACHER, hashed_password="x")
+    teacher = Teacher(user_id=teacher_user.id, hire_date=date.today(), qualification="MSc")
+    courses = [
+        Course(name=f"Course {i}", code=f"C{i:03d}", credit_hours=3, teacher_id=teacher.id,
+               max_students=STUDENTS, start_date=date(2025, 1, 1), end_date=date(2025, 6, 1),
+               status=CourseStatus.ACTIVE)
+        for i in range(COURSES)
+    ]
+    session.add_all([teacher_user, teacher, *courses])
+
+    student_ids = []
+    grades = []
+    for i in range(STUDENTS):
+        user = User(email=f"student{i}@bench.test", first_name="S", last_name=str(i),
+                    role=UserRole.STUDENT, hashed_password="x")
+        student = Student(user_id=user.id, enrollment_date=date.today(), grade_level=9)
+        session.add_all([user, student])
+        student_ids.append(student.id)
+        for course in courses:
+            enrollment = Enrollment(student_id=student.id, course_id=course.id, status=EnrollmentStatus.ACTIVE)
+            session.add(enrollment)
+            for j in range(GRADES_PER_COURSE):
+                grades.append({
+                    "id": f"{enrollment.id}-{j}", "enrollment_id": enrollment.id, "grade_type": GradeType.QUIZ,
+                    "score": float((i + j) % 10), "max_score": 10.0, "weight": float(j % 3),
+                    "grade_date": date(2025, 1 + j % 5, 1), "created_at": date.today(), "updated_at": date.today(),
+                })
+    session.flush()
+    session.execute(insert(Grade), grades)
+    session.commit()
+    return student_ids
+
+def row_per_grade(session: Session, student_id: str) -> dict:
+    """The previous shape: one joined row per grade, aggregated in Python."""
+    rows = session.exec(
+        select(Enrollment, Course, Grade)
+        .join(Course, Enrollment.course_id == Course.id)
+        .outerjoin(Grade, Grade.enrollment_id == Enrollment.id)
+        .where(Enrollment.student_id == student_id)
+    ).all()
+    totals = {}
+    for enrollment, course, grade in rows:
+        points, weights = totals.get(course.id, (0.0, 0.0))
+        if grade:
+            weight = grade.weight if grade.weight > 0 else 1.0
+            points, weights = points + weight * grade.score / grade.max_score * 100, weights + weight
+        totals[course.id] = (points, weights)
+    return totals
+
+def timed(func, student_ids: list) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for student_id in student_ids:
+            func(student_id)
+        best = min(best, time.perf_counter() - start)
+    return best / len(student_ids)
+
+def main():
+    """Time the grouped student grades report against loading one row per grade"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            student_ids = seed(session)
+            print(f"{STUDENTS} students x {COURSES} courses x {GRADES_PER_COURSE} grades "
+                  f"({COURSES * GRADES_PER_COURSE} grades per student), best of {ROUNDS}")
+
+            grouped = timed(ReportService(session).get_student_grades, student_ids)
+            session.expunge_all()
+            per_grade = timed(lambda student_id: row_per_grade(session, student_id), student_ids)
+        engine.dispose()
+
+    print(f"grouped query:  {grouped * 1000:8.2f} ms per report")
+    print(f"row per grade:  {per_grade * 1000:8.2f} ms per report ({per_grade / grouped:.1f}x slower)")
+
+if __name__ == "__main__":
+    main()
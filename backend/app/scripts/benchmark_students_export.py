@@ -0,0 +1,107 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pandas as pd
+from sqlalchemy import insert
+from sqlmodel import SQLModel, Session, create_engine, select
+from app.models.user import User, UserRole
+from app.models.student import Student
+from app.services.report_service import ReportService
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+SEED_CHUNK = 50_000
+
+def seed(url: str, rows: int) -> None:
+    """``rows`` students, each with their user, inserted in bulk."""
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        for start in range(0, rows, SEED_CHUNK):
+            users, students = [], []
+            for i in range(start, min(start + SEED_CHUNK, rows)):
+                users.append({
+                    "id": f"u{i}", "email": f"student{i}@bench.test", "first_name": "Student",
+                    "last_name": str(i), "role": UserRole.STUDENT, "is_active": True,
+                    "hashed_password": "x", "created_at": now, "updated_at": now,
+                })
+                students.append({
+                    "id": f"s{i}", "user_id": f"u{i}", "enrollment_date": date(2024, 9, 1),
+                    "grade_level": 9 + i % 4, "parent_name": f"Parent {i}",
+                    "parent_email": f"parent{i}@bench.test", "created_at": now, "updated_at": now,
+                })
+            session.execute(insert(User), users)
+            session.execute(insert(Student), students)
+        session.commit()
+    engine.dispose()
+
+def legacy_export(session: Session, path: str) -> None:
+    """The previous shape: every (Student, User) pair into a DataFrame, then to_excel."""
+    rows = []
+    for student, user in session.exec(select(Student, User).join(User, Student.user_id == User.id)).all():
+        rows.append({
+            "student_id": student.id, "user_id": user.id, "first_name": user.first_name,
+            "last_name": user.last_name, "email": user.email, "grade_level": student.grade_level,
+            "enrollment_date": student.enrollment_date, "parent_name": student.parent_name,
+            "parent_email": student.parent_email,
+        })
+    pd.DataFrame(rows).to_excel(path, index=False, sheet_name="Students")
+
+def measure(mode: str, url: str, directory: str) -> dict:
+    """Run one export in a fresh process and report its time and peak RSS."""
+    engine = create_engine(url)
+    with Session(engine) as session:
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        if mode == "streaming":
+            path = ReportService(session).export_all_students_to_excel()
+        else:
+            path = os.path.join(directory, "legacy.xlsx")
+            legacy_export(session, path)
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        session.rollback()
+    os.remove(path)
+    engine.dispose()
+    # ru_maxrss is in kilobytes on Linux
+    return {"seconds": elapsed, "peak_mb": peak / 1024, "growth_mb": (peak - baseline) / 1024}
+
+def in_fresh_process(func, *args):
+    # Peak RSS is inherited from the parent at fork, so keep the parent small
+    # by seeding in a child too, and measure every export in its own process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(func, *args).result()
+
+def main():
+    """Measure peak RSS and rows/sec of the streaming students export against the DataFrame export"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=ROW_COUNTS, help="export sizes to measure")
+    parser.add_argument("--legacy-max-rows", type=int, default=100_000,
+                        help="skip the DataFrame export above this size, where it may exhaust memory")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'export':>10} {'seconds':>9} {'rows/s':>10} {'peak MB':>9} {'growth MB':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{directory}/bench.db"
+            in_fresh_process(seed, url, rows)
+            modes = ["streaming"] + (["dataframe"] if rows <= args.legacy_max_rows else [])
+            for mode in modes:
+                result = in_fresh_process(measure, mode, url, directory)
+                print(f"{rows:>10} {mode:>10} {result['seconds']:>9.2f} {rows / result['seconds']:>10.0f} "
+                      f"{result['peak_mb']:>9.1f} {result['growth_mb']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
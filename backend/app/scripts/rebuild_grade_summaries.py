@@ -0,0 +1,37 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.database.session import engine
+from app.services.grade_summary import check_grade_summaries, rebuild_grade_summaries
+from app.services.analytics import reconcile_analytics
+
+def main():
+    """Rebuild the per-enrollment grade summaries, or check them against the grades table"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--check", action="store_true", help="only report mismatches, do not rebuild")
+    args = parser.parse_args()
+    
+    with Session(engine) as session:
+        if args.check:
+            print("Checking grade summaries against the grades table...")
+            mismatches = check_grade_summaries(session)
+            for mismatch in mismatches:
+                print(f"{mismatch['enrollment_id']}: {mismatch['field']} "
+                      f"stored={mismatch['stored']} expected={mismatch['expected']}")
+            print(f"Found {len(mismatches)} mismatches")
+            sys.exit(1 if mismatches else 0)
+        
+        print("Rebuilding grade summaries...")
+        written = rebuild_grade_summaries(session)
+        # Department and grade level rollups are derived from the summaries
+        reconcile_analytics(session)
+    
+    print(f"Rebuilt grade summaries for {written} enrollments")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.database.session import engine
+from app.services.enrollment_service import rebuild_seat_counts
+
+def main():
+    """Recompute every course's enrolled_count from the enrollments table"""
+    print("Rebuilding course seat counters...")
+    
+    with Session(engine) as session:
+        updated = rebuild_seat_counts(session)
+    
+    print(f"Updated seat counters for {updated} courses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.database.session import engine
+from app.services.analytics import reconcile_analytics
+
+def main():
+    """Recompute the analytics rollups from the source tables and correct any drift"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.parse_args()
+    
+    with Session(engine) as session:
+        corrected = reconcile_analytics(session)
+    
+    for table, rows in corrected.items():
+        print(f"{table}: corrected {rows} rows")
+
+if __name__ == "__main__":
+    main()
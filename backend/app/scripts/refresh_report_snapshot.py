@@ -0,0 +1,24 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.report_snapshot import report_snapshot
+
+def main():
+    """Copy the rows changed since the last refresh into the report snapshot"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--full", action="store_true", help="copy every row again")
+    args = parser.parse_args()
+    
+    counts = report_snapshot.refresh(full=args.full)
+    
+    for state in report_snapshot.status():
+        count = counts[state["table_name"]]
+        print(f"{state['table_name']}: {state['row_count']} rows "
+              f"({count['copied']} copied, {count['deleted']} deleted), watermark {state['watermark']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.database.session import engine
+from app.services.report_store import reindex_report_store, sweep_report_store
+
+def main():
+    """Apply report retention and the storage budget now, optionally indexing existing files first"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--reindex", action="store_true",
+                        help="walk the reports directory and index files missing from the report store")
+    args = parser.parse_args()
+    
+    with Session(engine) as session:
+        if args.reindex:
+            print("Indexing the reports directory...")
+            print(f"Indexed {reindex_report_store(session)} files")
+        
+        print("Sweeping the report store...")
+        result = sweep_report_store(session)
+    
+    print(f"Expired {result['expired']} and evicted {result['evicted']} files, "
+          f"freeing {result['evicted_bytes']} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from sqlmodel import Session, select
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+from ..models.user import User
+from ..models.student import Student
+from ..models.teacher import Teacher
+
+
+class AccessContext:
+    """
+    Per-request cache of the rows that permission checks depend on.
+
+    Write services look records up through this context so that a request
+    touching many grades or enrollments resolves the current user's teacher
+    or student profile once, and each enrollment and course once.
+    """
+
+    def __init__(self, db: Session, current_user: User):
+        self.db = db
+        self.current_user = current_user
+        self._rows: Dict[Tuple[Type[Any], str], Any] = {}
+        self._profiles: Dict[Type[Any], Optional[Any]] = {}
+
+    def get(self, model: Type[Any], id_: Optional[str]) -> Optional[Any]:
+        """Return a row by primary key, querying the database at most once."""
+        if not id_:
+            return None
+        key = (model, id_)
+        if key not in self._rows:
+            self._rows[key] = self.db.get(model, id_)
+        return self._rows[key]
+
+    def preload(self, model: Type[Any], ids: Iterable[Optional[str]]) -> Dict[str, Any]:
+        """Load every uncached row of ``model`` in ``ids`` with one IN query."""
+        wanted = {id_ for id_ in ids if id_}
+        missing = {id_ for id_ in wanted if (model, id_) not in self._rows}
+        if missing:
+            rows = self.db.exec(select(model).where(model.id.in_(missing))).all()
+            for row in rows:
+                self._rows[(model, row.id)] = row
+            for id_ in missing:
+                self._rows.setdefault((model, id_), None)
+        return {id_: self._rows[(model, id_)] for id_ in wanted if self._rows[(model, id_)] is not None}
+
+    def remember(self, row: Any) -> None:
+        """Cache a row created during the request."""
+        self._rows[(type(row), row.id)] = row
+
+    def forget(self, row: Any) -> None:
+        """Drop a deleted row so later lookups report it as missing."""
+        self._rows[(type(row), row.id)] = None
+
+    def snapshot(self) -> Dict[Tuple[Type[Any], str], Any]:
+        """Copy of the cached rows, taken before a savepoint."""
+        return dict(self._rows)
+
+    def restore(self, rows: Dict[Tuple[Type[Any], str], Any]) -> None:
+        """Return the cache to a ``snapshot`` after its savepoint rolled back."""
+        self._rows = dict(rows)
+
+    def _profile(self, model: Type[Any]) -> Optional[Any]:
+        if model not in self._profiles:
+            self._profiles[model] = self.db.exec(
+                select(model).where(model.user_id == self.current_user.id)
+            ).first()
+        return self._profiles[model]
+
+    @property
+    def teacher(self) -> Optional[Teacher]:
+        """Teacher profile of the current user, if any."""
+        return self._profile(Teacher)
+
+    @property
+    def student(self) -> Optional[Student]:
+        """Student profile of the current user, if any."""
+        return self._profile(Student)
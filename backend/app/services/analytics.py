@@ -0,0 +1,345 @@
+from sqlmodel import Session, select
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from datetime import datetime
+import math
+import threading
+import uuid
+
+from ..config import settings
+from ..database.locks import background_leader
+from ..database.session import before_real_commit, engine
+from ..models.analytics import CourseEnrollmentRollup, DepartmentGradeRollup, GradeLevelRollup
+from ..models.course import Course
+from ..models.enrollment import Enrollment
+from ..models.grade_summary import EnrollmentGradeSummary
+from ..models.student import Student
+from ..models.teacher import Teacher
+from .grade_engine import LETTER_GRADES
+from ..utils.logger import app_logger
+
+# Final grades at or above the lowest passing letter count as passed
+PASSING_GRADE = LETTER_GRADES[-1][0]
+# Courses whose teacher has no department are reported under this name
+UNASSIGNED_DEPARTMENT = "Unassigned"
+# Allowed drift between the rollups and a recompute
+TOLERANCE = 1e-6
+
+_CHANGES_KEY = "analytics_changes"
+
+Key = Tuple[Any, ...]
+
+
+class _Rollup(NamedTuple):
+    """How one rollup table is keyed, what it stores and how it is recomputed."""
+    model: Any
+    keys: Tuple[str, ...]
+    values: Tuple[str, ...]
+    # Stored rows of a scope are selected by this column
+    scope_field: str
+    compute: Callable[[Session, Optional[Set[Any]]], Dict[Key, Tuple[Any, ...]]]
+
+
+def _department():
+    return func.coalesce(Teacher.department, UNASSIGNED_DEPARTMENT)
+
+
+def _enrollment_counts(db: Session, course_ids: Optional[Set[str]]) -> Dict[Key, Tuple[Any, ...]]:
+    query = select(Enrollment.course_id, Enrollment.status, func.count(Enrollment.id)) \
+        .group_by(Enrollment.course_id, Enrollment.status)
+    if course_ids is not None:
+        query = query.where(Enrollment.course_id.in_(course_ids))
+    return {(course_id, status): (count,) for course_id, status, count in db.execute(query).all()}
+
+
+def _department_grades(db: Session, departments: Optional[Set[str]]) -> Dict[Key, Tuple[Any, ...]]:
+    department = _department()
+    average = EnrollmentGradeSummary.weighted_average
+    query = (
+        select(department, func.count(average), func.coalesce(func.sum(average), 0.0))
+        .select_from(EnrollmentGradeSummary)
+        .join(Enrollment, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .join(Course, Enrollment.course_id == Course.id)
+        .outerjoin(Teacher, Course.teacher_id == Teacher.id)
+        .where(average.is_not(None))
+        .group_by(department)
+    )
+    if departments is not None:
+        query = query.where(department.in_(departments))
+    return {(name,): (graded, total) for name, graded, total in db.execute(query).all()}
+
+
+def _grade_level_results(db: Session, grade_levels: Optional[Set[int]]) -> Dict[Key, Tuple[Any, ...]]:
+    average = EnrollmentGradeSummary.weighted_average
+    query = (
+        select(Student.grade_level, func.count(average),
+               func.coalesce(func.sum(case((average >= PASSING_GRADE, 1), else_=0)), 0))
+        .select_from(EnrollmentGradeSummary)
+        .join(Enrollment, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .join(Student, Enrollment.student_id == Student.id)
+        .where(average.is_not(None))
+        .group_by(Student.grade_level)
+    )
+    if grade_levels is not None:
+        query = query.where(Student.grade_level.in_(grade_levels))
+    return {(level,): (graded, passed) for level, graded, passed in db.execute(query).all()}
+
+
+COURSE_ENROLLMENTS = _Rollup(CourseEnrollmentRollup, ("course_id", "status"), ("enrollment_count",),
+                             "course_id", _enrollment_counts)
+DEPARTMENT_GRADES = _Rollup(DepartmentGradeRollup, ("department",), ("graded_enrollments", "grade_total"),
+                            "department", _department_grades)
+GRADE_LEVEL_RESULTS = _Rollup(GradeLevelRollup, ("grade_level",), ("graded_enrollments", "passed_enrollments"),
+                              "grade_level", _grade_level_results)
+ROLLUPS = (COURSE_ENROLLMENTS, DEPARTMENT_GRADES, GRADE_LEVEL_RESULTS)
+
+
+def _upsert(db: Session, rollup: _Rollup, rows: Dict[Key, Tuple[Any, ...]], increment: bool = False) -> None:
+    """
+    Write rollup rows in one statement. With ``increment`` the values are
+    added to the stored ones, so concurrent writers never lose an update.
+    """
+    if not rows:
+        return
+    now = datetime.utcnow()
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(rollup.model).values([
+        {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now,
+         **dict(zip(rollup.keys, key)), **dict(zip(rollup.values, values))}
+        for key, values in rows.items()
+    ])
+    model = rollup.model
+    updates = {
+        field: getattr(model, field) + getattr(statement.excluded, field) if increment else getattr(statement.excluded, field)
+        for field in rollup.values
+    }
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[getattr(model, field) for field in rollup.keys],
+        set_={**updates, "updated_at": statement.excluded.updated_at},
+    ))
+
+
+def _differs(stored: Tuple[Any, ...], expected: Tuple[Any, ...]) -> bool:
+    return any(
+        not math.isclose(a, b, rel_tol=TOLERANCE, abs_tol=TOLERANCE) for a, b in zip(stored, expected)
+    )
+
+
+def _sync(db: Session, rollup: _Rollup, scope: Optional[Set[Any]] = None) -> int:
+    """
+    Recompute a rollup, or only the rows of the given scope values, and
+    write the rows that differ from what is stored. Returns their number.
+    """
+    expected = rollup.compute(db, scope)
+    model = rollup.model
+    # Plain columns, so no stale objects stay in the session after the upsert
+    query = select(model.id, *(getattr(model, field) for field in rollup.keys + rollup.values))
+    if scope is not None:
+        query = query.where(getattr(model, rollup.scope_field).in_(scope))
+    width = len(rollup.keys)
+    stored = {tuple(row[1:1 + width]): (row[0], tuple(row[1 + width:])) for row in db.execute(query).all()}
+
+    changed = {
+        key: values for key, values in expected.items()
+        if key not in stored or _differs(stored[key][1], values)
+    }
+    stale = [row_id for key, (row_id, _) in stored.items() if key not in expected]
+    _upsert(db, rollup, changed)
+    if stale:
+        db.execute(delete(model).where(model.id.in_(stale)))
+    return len(changed) + len(stale)
+
+
+class AnalyticsChanges:
+    """
+    Rollup changes collected during a write and applied just before the
+    transaction commits. Final grade changes are kept as deltas per
+    department and grade level; other changes name the rollup keys to
+    recompute.
+    """
+
+    def __init__(self):
+        self.courses: Set[str] = set()
+        self.departments: Set[str] = set()
+        self.grade_levels: Set[int] = set()
+        self.department_deltas: Dict[Key, List[float]] = {}
+        self.grade_level_deltas: Dict[Key, List[int]] = {}
+
+    def add_final_grade(self, department: str, grade_level: int,
+                        old: Optional[float], new: Optional[float]) -> None:
+        graded = (new is not None) - (old is not None)
+        passed = (new is not None and new >= PASSING_GRADE) - (old is not None and old >= PASSING_GRADE)
+        delta = self.department_deltas.setdefault((department,), [0, 0.0])
+        delta[0] += graded
+        delta[1] += (new or 0.0) - (old or 0.0)
+        delta = self.grade_level_deltas.setdefault((grade_level,), [0, 0])
+        delta[0] += graded
+        delta[1] += passed
+
+    def apply(self, db: Session) -> None:
+        """Recompute the named keys, then add the deltas of every other key."""
+        if self.courses:
+            _sync(db, COURSE_ENROLLMENTS, self.courses)
+        if self.departments:
+            _sync(db, DEPARTMENT_GRADES, self.departments)
+        if self.grade_levels:
+            _sync(db, GRADE_LEVEL_RESULTS, self.grade_levels)
+        # A recomputed key already reflects its deltas
+        _upsert(db, DEPARTMENT_GRADES, {
+            key: tuple(delta) for key, delta in self.department_deltas.items()
+            if key[0] not in self.departments and any(delta)
+        }, increment=True)
+        _upsert(db, GRADE_LEVEL_RESULTS, {
+            key: tuple(delta) for key, delta in self.grade_level_deltas.items()
+            if key[0] not in self.grade_levels and any(delta)
+        }, increment=True)
+
+
+def _changes(db: Session) -> AnalyticsChanges:
+    changes = db.info.get(_CHANGES_KEY)
+    if changes is None:
+        changes = db.info[_CHANGES_KEY] = AnalyticsChanges()
+    return changes
+
+
+def note_enrollments_changed(db: Session, course_ids: Iterable[str]) -> None:
+    """Record that enrollments of these courses were added, removed or changed status."""
+    _changes(db).courses.update(course_ids)
+
+
+def note_dimensions_changed(db: Session, departments: Iterable[Optional[str]] = (),
+                            grade_levels: Iterable[int] = ()) -> None:
+    """
+    Record that enrollments moved between departments or grade levels, e.g.
+    a course changed teacher or a student changed grade level. Pass both
+    the old and the new values; their rollups are recomputed on commit.
+    """
+    changes = _changes(db)
+    changes.departments.update(department or UNASSIGNED_DEPARTMENT for department in departments)
+    changes.grade_levels.update(grade_levels)
+
+
+def note_final_grades_changed(db: Session, final_grades: Dict[str, Tuple[Optional[float], Optional[float]]]) -> None:
+    """
+    Record (old, new) final grades of enrollments. Call while the
+    enrollments still exist; their department and grade level are looked
+    up now and the deltas are applied on commit.
+    """
+    final_grades = {
+        enrollment_id: grades for enrollment_id, grades in final_grades.items() if grades[0] != grades[1]
+    }
+    if not final_grades:
+        return
+    changes = _changes(db)
+    for enrollment_id, department, grade_level in db.execute(
+        select(Enrollment.id, _department(), Student.grade_level)
+        .join(Course, Enrollment.course_id == Course.id)
+        .outerjoin(Teacher, Course.teacher_id == Teacher.id)
+        .join(Student, Enrollment.student_id == Student.id)
+        .where(Enrollment.id.in_(final_grades))
+    ).all():
+        changes.add_final_grade(department, grade_level, *final_grades[enrollment_id])
+
+
+def _apply_changes(session: Session, changes: AnalyticsChanges) -> None:
+    session.flush()
+    changes.apply(session)
+
+
+before_real_commit(_CHANGES_KEY, _apply_changes)
+
+
+def reconcile_analytics(db: Session) -> Dict[str, int]:
+    """
+    Recompute every rollup from the source tables and correct the rows that
+    drifted, e.g. through writes that bypass the services or a rebuild of
+    the grade summaries. Commits. Returns the corrected rows per table.
+    """
+    corrected = {rollup.model.__tablename__: _sync(db, rollup) for rollup in ROLLUPS}
+    db.commit()
+    if any(corrected.values()):
+        app_logger.warning(f"Analytics reconcile corrected rollup rows: {corrected}")
+    return corrected
+
+
+def enrollment_dashboard(db: Session) -> List[Dict[str, Any]]:
+    """Enrollments per course and status, read from the rollup."""
+    courses: Dict[str, Dict[str, Any]] = {}
+    for rollup, code, name in db.execute(
+        select(CourseEnrollmentRollup, Course.code, Course.name)
+        .outerjoin(Course, CourseEnrollmentRollup.course_id == Course.id)
+        .order_by(Course.code, CourseEnrollmentRollup.course_id)
+    ).all():
+        course = courses.setdefault(rollup.course_id, {
+            "course_id": rollup.course_id, "course_code": code, "course_name": name,
+            "total": 0, "by_status": {},
+        })
+        course["by_status"][rollup.status] = rollup.enrollment_count
+        course["total"] += rollup.enrollment_count
+    return list(courses.values())
+
+
+def department_dashboard(db: Session) -> List[Dict[str, Any]]:
+    """Average final grade per department, read from the rollup."""
+    return [
+        {
+            "department": row.department,
+            "graded_enrollments": row.graded_enrollments,
+            "average_grade": round(row.grade_total / row.graded_enrollments, 2) if row.graded_enrollments else None,
+        }
+        for row in db.execute(select(DepartmentGradeRollup).order_by(DepartmentGradeRollup.department)).scalars()
+    ]
+
+
+def grade_level_dashboard(db: Session) -> List[Dict[str, Any]]:
+    """Pass rate per grade level, read from the rollup."""
+    return [
+        {
+            "grade_level": row.grade_level,
+            "graded_enrollments": row.graded_enrollments,
+            "passed_enrollments": row.passed_enrollments,
+            "pass_rate": round(row.passed_enrollments / row.graded_enrollments, 4) if row.graded_enrollments else None,
+        }
+        for row in db.execute(select(GradeLevelRollup).order_by(GradeLevelRollup.grade_level)).scalars()
+    ]
+
+
+class AnalyticsReconciler:
+    """
+    Background thread reconciling the rollups at startup and on an
+    interval. It runs in every API worker but only reconciles while its
+    process holds the background leader lock, taking over when the
+    leader exits.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _loop(self) -> None:
+        # Reconcile once at startup too, which backfills the rollups after a deploy
+        while True:
+            try:
+                if background_leader.acquire():
+                    with Session(engine) as db:
+                        reconcile_analytics(db)
+            except Exception as exc:
+                app_logger.error(f"Analytics reconcile failed: {exc}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="analytics-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+analytics_reconciler = AnalyticsReconciler(interval=settings.ANALYTICS_RECONCILE_SECONDS)
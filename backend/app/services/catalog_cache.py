@@ -0,0 +1,96 @@
+from sqlmodel import Session, select
+from typing import Any, Dict, Iterable, List, Optional, Set
+import threading
+import time
+
+from ..config import settings
+from ..database.session import on_real_commit
+from ..models.course import Course, CourseStatus
+
+# Session.info key collecting courses whose seat counts changed in the transaction
+_CHANGED_COURSES_KEY = "catalog_changed_course_ids"
+
+
+class CourseCatalogCache:
+    """
+    In-process cache of the course catalog with live seat counts.
+
+    The whole catalog is reloaded when it is older than ``ttl_seconds``. In
+    between, courses whose enrollments changed in this process are marked
+    stale after commit and their ``enrolled_count`` re-read together on the
+    next read. Changes made by other processes are therefore visible after
+    at most ``ttl_seconds``. Queries run outside the lock, so a slow reload
+    does not block readers that only need the cached entries.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale: Set[str] = set()
+        # Bumped by invalidate so a reload that raced with it is not kept
+        self._generation = 0
+
+    @staticmethod
+    def _load(db: Session) -> Dict[str, Dict[str, Any]]:
+        return {course.id: course.dict() for course in db.exec(select(Course).order_by(Course.name)).all()}
+
+    @staticmethod
+    def _seat_counts(db: Session, course_ids: Iterable[str]) -> Dict[str, int]:
+        return dict(db.exec(select(Course.id, Course.enrolled_count).where(Course.id.in_(list(course_ids)))).all())
+
+    def get(self, db: Session, status: Optional[CourseStatus] = None) -> List[Dict[str, Any]]:
+        """Return catalog entries with enrolled and available seat counts."""
+        with self._lock:
+            expired = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+            # Courses marked from here on committed after our query may have started; keep them
+            stale, self._stale = self._stale, set()
+            generation = self._generation
+        try:
+            loaded = self._load(db) if expired else None
+            seats = self._seat_counts(db, stale) if stale and not expired else {}
+        except Exception:
+            with self._lock:
+                self._stale |= stale
+            raise
+
+        with self._lock:
+            if loaded is not None:
+                entries = loaded
+                if generation == self._generation:
+                    self._entries = loaded
+                    self._loaded_at = time.monotonic()
+            else:
+                for course_id, enrolled_count in seats.items():
+                    if course_id in self._entries:
+                        self._entries[course_id] = {**self._entries[course_id], "enrolled_count": enrolled_count}
+                entries = self._entries
+            return [
+                {**entry, "available_seats": max(entry["max_students"] - entry["enrolled_count"], 0)}
+                for entry in entries.values()
+                if status is None or entry["status"] == status
+            ]
+
+    def mark_stale(self, course_ids: Iterable[str]) -> None:
+        """Re-read the seat counts of these courses on the next read."""
+        with self._lock:
+            self._stale.update(course_ids)
+
+    def invalidate(self) -> None:
+        """Drop the whole catalog, e.g. after courses are created or edited."""
+        with self._lock:
+            self._loaded_at = None
+            self._stale.clear()
+            self._generation += 1
+
+
+course_catalog_cache = CourseCatalogCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def note_seats_changed(db: Session, course_ids: Iterable[str]) -> None:
+    """Record that seat counts of these courses change when ``db`` commits."""
+    db.info.setdefault(_CHANGED_COURSES_KEY, set()).update(course_ids)
+
+
+on_real_commit(_CHANGED_COURSES_KEY, lambda changed: course_catalog_cache.mark_stale(changed))
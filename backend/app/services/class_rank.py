@@ -0,0 +1,339 @@
+from sqlmodel import Session, select
+from sqlalchemy import func
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import threading
+import time
+
+from ..config import settings
+from ..database.session import on_real_commit
+from ..models.course import Course
+from ..models.enrollment import Enrollment
+from ..models.grade_summary import EnrollmentGradeSummary
+from ..models.student import Student
+from .gpa_service import GPA_STATUSES
+
+# Session.info keys collecting what changed in the transaction
+_CHANGED_ENROLLMENTS_KEY = "rank_changed_enrollments"
+_CHANGED_STUDENTS_KEY = "rank_changed_student_ids"
+
+# Returned by the warm reads when the scope has no fresh index
+_MISSING = object()
+
+
+class RankIndex:
+    """
+    Scores of one ranking scope kept in a sorted list, so a rank lookup is
+    two binary searches and a score change is one removal and one insert
+    instead of re-sorting the whole class.
+    """
+
+    def __init__(self, scores: Iterable[Tuple[str, float]] = ()):
+        self._scores: Dict[str, float] = dict(scores)
+        # Negated so the best score comes first
+        self._sorted = sorted(-score for score in self._scores.values())
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def set(self, key: str, score: Optional[float]) -> None:
+        """Insert, move or (with ``None``) remove one entry."""
+        old = self._scores.pop(key, None)
+        if old is not None:
+            del self._sorted[bisect_left(self._sorted, -old)]
+        if score is not None:
+            self._scores[key] = score
+            insort(self._sorted, -score)
+
+    def rank(self, key: str) -> Optional[Dict[str, Any]]:
+        """Competition rank (ties share the best rank) and percentile rank of one entry."""
+        score = self._scores.get(key)
+        if score is None:
+            return None
+        higher = bisect_left(self._sorted, -score)
+        equal = bisect_right(self._sorted, -score) - higher
+        return _rank_entry(score, higher, equal, len(self._sorted))
+
+    def ranking(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Every entry with its rank, best first."""
+        ordered = sorted(self._scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(key, self.rank(key)) for key, _ in ordered]
+
+
+def _rank_entry(score: float, higher: int, equal: int, size: int) -> Dict[str, Any]:
+    below = size - higher - equal
+    return {
+        "score": round(score, 2),
+        "rank": higher + 1,
+        "percentile": round(100.0 * (below + 0.5 * equal) / size, 1),
+        "class_size": size,
+    }
+
+
+def _student_averages():
+    """Credit-hour weighted average of each student's course finals, with their grade level."""
+    credits = func.sum(Course.credit_hours)
+    return (
+        select(
+            Enrollment.student_id.label("key"),
+            Student.grade_level.label("grade_level"),
+            (func.sum(EnrollmentGradeSummary.weighted_average * Course.credit_hours) / credits).label("score"),
+        )
+        .join(Course, Enrollment.course_id == Course.id)
+        .join(Student, Enrollment.student_id == Student.id)
+        .join(EnrollmentGradeSummary, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .where(Enrollment.status.in_(GPA_STATUSES), EnrollmentGradeSummary.weighted_average.isnot(None))
+        .group_by(Enrollment.student_id, Student.grade_level)
+        .having(credits > 0)
+    )
+
+
+def _course_scores(course_id: str):
+    return (
+        select(
+            Enrollment.id.label("key"),
+            EnrollmentGradeSummary.weighted_average.label("score"),
+        )
+        .join(EnrollmentGradeSummary, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .where(
+            Enrollment.course_id == course_id,
+            Enrollment.status.in_(GPA_STATUSES),
+            EnrollmentGradeSummary.weighted_average.isnot(None)
+        )
+    )
+
+
+def _ranked_with_window(db: Session, scores) -> List[Tuple[str, float, Dict[str, Any]]]:
+    """
+    Rank a scope inside the database with window functions. Used when the
+    scope has no in-memory index yet; its rows then seed the index.
+    """
+    rows = scores.subquery()
+    query = select(
+        rows.c.key,
+        rows.c.score,
+        func.rank().over(order_by=rows.c.score.desc()),
+        func.count().over(partition_by=rows.c.score),
+        func.count().over(),
+    ).order_by(rows.c.score.desc(), rows.c.key)
+    return [
+        (key, score, _rank_entry(score, rank - 1, equal, size))
+        for key, score, rank, equal, size in db.execute(query).all()
+    ]
+
+
+class ClassRankings:
+    """
+    In-memory rank indexes per course (keyed by enrollment) and per grade
+    level (keyed by student). Committed grade and enrollment changes mark
+    entries dirty; the next read re-reads just those scores and moves them
+    within the index. Cold scopes are answered with a window-function query.
+    Indexes are rebuilt after ``ttl_seconds`` to pick up other processes.
+    Queries run outside the lock, which only guards the indexes themselves,
+    so a slow rebuild does not hold up reads of other scopes.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._courses: Dict[str, RankIndex] = {}
+        self._grade_levels: Dict[int, RankIndex] = {}
+        self._dirty_enrollments: Dict[str, Set[str]] = {}
+        self._dirty_students: Set[str] = set()
+        # Scopes with a window query in flight; their changes are kept dirty for the new index
+        self._loading_courses: Dict[str, int] = {}
+        self._loading_grade_levels: Dict[int, int] = {}
+        # Bumped by drop_course and clear_grade_levels so a load that raced with them is not kept
+        self._generation = 0
+
+    def _fresh(self, index: Optional[RankIndex]) -> bool:
+        return index is not None and time.monotonic() - index.loaded_at <= self.ttl_seconds
+
+    def _load(self, db: Session, scopes: Dict[Any, RankIndex], loading: Dict[Any, int], key: Any,
+              scores) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Rank a cold or expired scope with a window query and keep its scores
+        as the scope's index, unless a concurrent load or a drop replaced the
+        index meanwhile. Changes committed during the query stay dirty and are
+        re-read by the next warm read.
+        """
+        with self._lock:
+            replaced = scopes.get(key)
+            generation = self._generation
+            loading[key] = loading.get(key, 0) + 1
+
+        def done_loading() -> None:
+            loading[key] -= 1
+            if not loading[key]:
+                del loading[key]
+
+        try:
+            ranked = _ranked_with_window(db, scores)
+        except Exception:
+            with self._lock:
+                done_loading()
+            raise
+        with self._lock:
+            done_loading()
+            if generation == self._generation and scopes.get(key) is replaced:
+                scopes[key] = RankIndex((entry_key, score) for entry_key, score, _ in ranked)
+        return ranked
+
+    def _warm_course(self, db: Session, course_id: str, read: Callable[[RankIndex], Any]) -> Any:
+        """
+        ``read`` applied to the course's fresh index once its dirty enrollments
+        are re-read, or ``_MISSING`` when the course has to be loaded.
+        """
+        while True:
+            with self._lock:
+                index = self._courses.get(course_id)
+                if not self._fresh(index):
+                    return _MISSING
+                dirty = self._dirty_enrollments.pop(course_id, set())
+                if not dirty:
+                    return read(index)
+            try:
+                scores = dict(db.execute(_course_scores(course_id).where(Enrollment.id.in_(dirty))).all())
+            except Exception:
+                with self._lock:
+                    self._dirty_enrollments.setdefault(course_id, set()).update(dirty)
+                raise
+            with self._lock:
+                if self._courses.get(course_id) is index:
+                    for enrollment_id in dirty:
+                        index.set(enrollment_id, scores.get(enrollment_id))
+                    return read(index)
+                # Replaced meanwhile by an index that may be newer than these scores; re-read against it
+                self._dirty_enrollments.setdefault(course_id, set()).update(dirty)
+
+    def _warm_grade_level(self, db: Session, grade_level: int, read: Callable[[RankIndex], Any]) -> Any:
+        """
+        ``read`` applied to the grade level's fresh index once the dirty
+        students are re-read into every grade-level index, or ``_MISSING``
+        when the grade level has to be loaded.
+        """
+        while True:
+            with self._lock:
+                index = self._grade_levels.get(grade_level)
+                if not self._fresh(index):
+                    return _MISSING
+                dirty, self._dirty_students = self._dirty_students, set()
+                if not dirty:
+                    return read(index)
+                indexes = dict(self._grade_levels)
+            try:
+                rows = {
+                    key: (level, score)
+                    for key, level, score in db.execute(
+                        _student_averages().where(Enrollment.student_id.in_(dirty))
+                    ).all()
+                }
+            except Exception:
+                with self._lock:
+                    self._dirty_students |= dirty
+                raise
+            with self._lock:
+                unchanged = {level for level, kept in indexes.items() if self._grade_levels.get(level) is kept}
+                for level in unchanged:
+                    for student_id in dirty:
+                        student_level, score = rows.get(student_id, (None, None))
+                        indexes[level].set(student_id, score if student_level == level else None)
+                if unchanged != set(self._grade_levels):
+                    # Indexes loaded meanwhile may be newer than these scores; re-read against them
+                    self._dirty_students |= dirty
+                if grade_level in unchanged:
+                    return read(index)
+
+    def course_ranking(self, db: Session, course_id: str) -> List[Dict[str, Any]]:
+        """Rank of every graded enrollment in a course, best first."""
+        ranking = self._warm_course(
+            db, course_id, lambda index: [{"key": key, **entry} for key, entry in index.ranking()]
+        )
+        if ranking is _MISSING:
+            ranked = self._load(db, self._courses, self._loading_courses, course_id, _course_scores(course_id))
+            ranking = [{"key": key, **entry} for key, _, entry in ranked]
+        return ranking
+
+    def course_rank(self, db: Session, course_id: str, enrollment_id: str) -> Optional[Dict[str, Any]]:
+        rank = self._warm_course(db, course_id, lambda index: index.rank(enrollment_id))
+        if rank is _MISSING:
+            ranked = self._load(db, self._courses, self._loading_courses, course_id, _course_scores(course_id))
+            rank = next((entry for key, _, entry in ranked if key == enrollment_id), None)
+        return rank
+
+    def grade_level_rank(self, db: Session, grade_level: int, student_id: str) -> Optional[Dict[str, Any]]:
+        """Rank of a student among their grade level by credit-weighted average."""
+        rank = self._warm_grade_level(db, grade_level, lambda index: index.rank(student_id))
+        if rank is _MISSING:
+            ranked = self._load(db, self._grade_levels, self._loading_grade_levels, grade_level,
+                                _student_averages().where(Student.grade_level == grade_level))
+            rank = next((entry for key, _, entry in ranked if key == student_id), None)
+        return rank
+
+    def mark_changed(self, enrollments: Iterable[Tuple[str, str]], student_ids: Iterable[str]) -> None:
+        """Queue (course_id, enrollment_id) pairs and students for a score re-read."""
+        with self._lock:
+            for course_id, enrollment_id in enrollments:
+                if course_id in self._courses or course_id in self._loading_courses:
+                    self._dirty_enrollments.setdefault(course_id, set()).add(enrollment_id)
+            if self._grade_levels or self._loading_grade_levels:
+                self._dirty_students.update(student_ids)
+
+    def drop_course(self, course_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._courses.pop(course_id, None)
+            self._dirty_enrollments.pop(course_id, None)
+
+    def clear_grade_levels(self) -> None:
+        """Drop the grade-level indexes, e.g. after credit hours or grade levels change."""
+        with self._lock:
+            self._generation += 1
+            self._grade_levels.clear()
+            self._dirty_students.clear()
+
+
+class_rankings = ClassRankings(ttl_seconds=settings.RANK_INDEX_TTL_SECONDS)
+
+
+def course_ranking(db: Session, course_id: str) -> List[Dict[str, Any]]:
+    """Ranked enrollments of a course with their student ids, best first."""
+    ranking = class_rankings.course_ranking(db, course_id)
+    students = dict(db.exec(
+        select(Enrollment.id, Enrollment.student_id).where(Enrollment.id.in_([entry["key"] for entry in ranking]))
+    ).all()) if ranking else {}
+    return [
+        {"enrollment_id": entry["key"], "student_id": students.get(entry["key"]), **entry}
+        for entry in ranking
+    ]
+
+
+def student_ranks(db: Session, student: Student) -> Dict[str, Any]:
+    """A student's rank in their grade level and in each of their graded courses."""
+    enrollments = db.exec(
+        select(Enrollment.id, Enrollment.course_id)
+        .where(Enrollment.student_id == student.id, Enrollment.status.in_(GPA_STATUSES))
+        .order_by(Enrollment.course_id)
+    ).all()
+    courses = []
+    for enrollment_id, course_id in enrollments:
+        rank = class_rankings.course_rank(db, course_id, enrollment_id)
+        if rank:
+            courses.append({"course_id": course_id, "enrollment_id": enrollment_id, **rank})
+    return {
+        "student_id": student.id,
+        "grade_level": student.grade_level,
+        "grade_level_rank": class_rankings.grade_level_rank(db, student.grade_level, student.id),
+        "courses": courses,
+    }
+
+
+def note_rank_changed(db: Session, enrollments: Iterable[Tuple[str, str]], student_ids: Iterable[str]) -> None:
+    """Record (course_id, enrollment_id) pairs and students whose rank changes when ``db`` commits."""
+    db.info.setdefault(_CHANGED_ENROLLMENTS_KEY, set()).update(enrollments)
+    db.info.setdefault(_CHANGED_STUDENTS_KEY, set()).update(student_ids)
+
+
+on_real_commit(_CHANGED_ENROLLMENTS_KEY, lambda enrollments: class_rankings.mark_changed(enrollments, ()))
+on_real_commit(_CHANGED_STUDENTS_KEY, lambda student_ids: class_rankings.mark_changed((), student_ids))
@@ -0,0 +1,224 @@
+from sqlmodel import Session, select
+from sqlalchemy import bindparam, update
+from typing import List, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta
+import threading
+import time
+import uuid
+
+from ..config import settings
+from ..database.locks import background_leader
+from ..database.session import engine
+from ..models.user import User, UserRole
+from ..models.enrollment import EnrollmentStatus
+from ..models.enrollment_request import (
+    EnrollmentRequest, EnrollmentRequestCreate, EnrollmentRequestStatus
+)
+from .enrollment_service import EnrollmentEntry, EnrollmentResult, enroll_many
+from ..utils.logger import app_logger
+
+
+def enqueue_enrollment(db: Session, request_in: EnrollmentRequestCreate, current_user: User) -> EnrollmentRequest:
+    """Append an enrollment request to the intake queue and return its ticket."""
+    request = EnrollmentRequest(**request_in.dict(), requested_by=current_user.id)
+    db.add(request)
+    db.commit()
+    db.refresh(request)
+    return request
+
+
+class ClaimedRequest(NamedTuple):
+    """The fields of a claimed request that its worker needs, detached from any session."""
+    id: str
+    student_id: str
+    course_id: str
+    requested_status: EnrollmentStatus
+    requested_by: str
+
+
+def claim_requests(db: Session, batch_size: int) -> List[ClaimedRequest]:
+    """
+    Take up to ``batch_size`` queued requests, oldest first. The candidates
+    are read with SKIP LOCKED so Postgres workers pick disjoint batches
+    without waiting, then claimed by one conditional UPDATE that stamps a
+    fresh token. Only the rows carrying the token are returned, so a
+    request is never claimed twice even where SKIP LOCKED is ignored.
+    """
+    candidates = db.exec(
+        select(EnrollmentRequest.id)
+        .where(EnrollmentRequest.status == EnrollmentRequestStatus.QUEUED)
+        .order_by(EnrollmentRequest.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not candidates:
+        db.rollback()
+        return []
+
+    token = str(uuid.uuid4())
+    db.execute(
+        update(EnrollmentRequest)
+        .where(EnrollmentRequest.id.in_(candidates), EnrollmentRequest.status == EnrollmentRequestStatus.QUEUED)
+        .values(status=EnrollmentRequestStatus.PROCESSING, claim_token=token, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    claimed = [
+        ClaimedRequest(*row) for row in db.execute(
+            select(
+                EnrollmentRequest.id, EnrollmentRequest.student_id, EnrollmentRequest.course_id,
+                EnrollmentRequest.requested_status, EnrollmentRequest.requested_by,
+            )
+            .where(EnrollmentRequest.claim_token == token)
+            .order_by(EnrollmentRequest.created_at)
+        ).all()
+    ]
+    db.commit()
+    return claimed
+
+
+def _finish_requests(db: Session, results: List[Tuple[str, EnrollmentResult]]) -> None:
+    """Write the outcome of each request id with one executemany UPDATE."""
+    now = datetime.utcnow()
+    requests = EnrollmentRequest.__table__
+    db.execute(
+        requests.update()
+        .where(requests.c.id == bindparam("request_id"))
+        .values(status=EnrollmentRequestStatus.COMPLETED, outcome=bindparam("request_outcome"),
+                enrollment_id=bindparam("request_enrollment_id"), processed_at=now, updated_at=now),
+        [
+            {"request_id": request_id, "request_outcome": result.outcome,
+             "request_enrollment_id": result.enrollment_id}
+            for request_id, result in results
+        ],
+    )
+
+
+def process_requests(db: Session, requests: List[ClaimedRequest]) -> None:
+    """
+    Apply claimed requests course by course. Each course is handled in its
+    own transaction so one busy course does not hold locks for the others.
+    """
+    requester_ids = {request.requested_by for request in requests}
+    admins = set(
+        db.exec(
+            select(User.id).where(User.id.in_(requester_ids), User.role == UserRole.ADMIN)
+        ).all()
+    )
+
+    by_course = {}
+    for request in requests:
+        by_course.setdefault(request.course_id, []).append(request)
+
+    for course_id, course_requests in by_course.items():
+        try:
+            results = enroll_many(db, [
+                EnrollmentEntry(
+                    student_id=request.student_id,
+                    course_id=request.course_id,
+                    status=request.requested_status,
+                    allow_inactive=request.requested_by in admins,
+                )
+                for request in course_requests
+            ])
+            _finish_requests(db, [(request.id, result) for request, result in zip(course_requests, results)])
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            app_logger.error(f"Failed to process enrollment requests for course {course_id}: {exc}")
+            now = datetime.utcnow()
+            db.execute(
+                update(EnrollmentRequest)
+                .where(EnrollmentRequest.id.in_([request.id for request in course_requests]))
+                .values(status=EnrollmentRequestStatus.FAILED, detail=str(exc)[:500],
+                        processed_at=now, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+
+def requeue_stale_requests(db: Session, older_than: timedelta) -> int:
+    """Put back requests left in processing by a worker that died mid-batch."""
+    result = db.execute(
+        update(EnrollmentRequest)
+        .where(
+            EnrollmentRequest.status == EnrollmentRequestStatus.PROCESSING,
+            EnrollmentRequest.updated_at < datetime.utcnow() - older_than
+        )
+        .values(status=EnrollmentRequestStatus.QUEUED)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def run_once(batch_size: Optional[int] = None) -> int:
+    """Claim and apply one batch of queued requests. Returns the batch size."""
+    with Session(engine) as db:
+        requests = claim_requests(db, batch_size or settings.ENROLLMENT_QUEUE_BATCH_SIZE)
+        if requests:
+            process_requests(db, requests)
+        return len(requests)
+
+
+class EnrollmentQueueWorkers:
+    """
+    Pool of background threads draining the enrollment intake queue. Every
+    ``stale_seconds`` one thread also requeues requests left in processing
+    by a crashed worker, but only in the background leader process.
+    """
+
+    def __init__(self, workers: int, poll_interval: float, stale_seconds: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._requeue_lock = threading.Lock()
+        self._next_requeue = 0.0
+
+    def _requeue_stale(self) -> None:
+        with self._requeue_lock:
+            now = time.monotonic()
+            if now < self._next_requeue:
+                return
+            self._next_requeue = now + self.stale_seconds
+        if not background_leader.acquire():
+            return
+        with Session(engine) as db:
+            requeued = requeue_stale_requests(db, timedelta(seconds=self.stale_seconds))
+        if requeued:
+            app_logger.warning(f"Requeued {requeued} stale enrollment requests")
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._requeue_stale()
+                processed = run_once()
+            except Exception as exc:
+                app_logger.error(f"Enrollment queue worker error: {exc}")
+                processed = 0
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        self._stop.clear()
+        # Requeue on the first poll, which picks up requests abandoned before a restart
+        self._next_requeue = 0.0
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"enrollment-queue-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        app_logger.info(f"Started {self.workers} enrollment queue workers")
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=self.poll_interval * 2 + 5)
+        self._threads = []
+
+
+enrollment_queue_workers = EnrollmentQueueWorkers(
+    workers=settings.ENROLLMENT_QUEUE_WORKERS,
+    poll_interval=settings.ENROLLMENT_QUEUE_POLL_SECONDS,
+    stale_seconds=settings.ENROLLMENT_QUEUE_STALE_SECONDS,
+)
@@ -0,0 +1,350 @@
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.orm.util import identity_key
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from datetime import date, datetime
+import uuid
+
+from ..models.user import User, UserRole
+from ..models.enrollment import (
+    Enrollment, EnrollmentCreate, EnrollmentUpdate, EnrollmentStatus, SEAT_HOLDING_STATUSES
+)
+from ..models.student import Student
+from ..models.course import Course, CourseStatus
+from ..models.enrollment_request import EnrollmentOutcome
+from ..models.grade_summary import EnrollmentGradeSummary
+from .access import AccessContext
+from .catalog_cache import note_seats_changed
+from .gpa_service import note_gpa_changed
+from .grade_statistics import note_course_grades_changed
+from .class_rank import note_rank_changed
+from .analytics import note_enrollments_changed, note_final_grades_changed
+
+
+class EnrollmentService:
+    """
+    Enrollment write operations shared by the enrollments router and the
+    batch endpoint.
+
+    Methods stage their changes and flush, leaving the commit to the caller.
+    """
+
+    def __init__(self, db: Session, current_user: User, access: Optional[AccessContext] = None):
+        self.db = db
+        self.current_user = current_user
+        self.access = access or AccessContext(db, current_user)
+
+    def _get_enrollment(self, enrollment_id: str) -> Enrollment:
+        enrollment = self.access.get(Enrollment, enrollment_id)
+        if not enrollment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Enrollment with ID {enrollment_id} not found"
+            )
+        return enrollment
+
+    def _expire_seat_count(self, course_id: str) -> None:
+        """Make a loaded course re-read its seat counter after a bulk UPDATE."""
+        course = self.db.identity_map.get(identity_key(Course, course_id))
+        if course is not None:
+            self.db.expire(course, ["enrolled_count"])
+
+    def _claim_seat(self, course: Course) -> None:
+        """
+        Take one seat with a conditional UPDATE. The database serializes
+        concurrent updates of the course row, so the capacity check and the
+        increment happen atomically and a course can never be over-enrolled.
+        """
+        result = self.db.execute(
+            update(Course)
+            .where(Course.id == course.id, Course.enrolled_count < Course.max_students)
+            .values(enrolled_count=Course.enrolled_count + 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self._expire_seat_count(course.id)
+        note_seats_changed(self.db, [course.id])
+
+        if result.rowcount == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Course has reached maximum capacity"
+            )
+
+    def _release_seat(self, course_id: str) -> None:
+        """Give back one seat held by an enrollment."""
+        self.db.execute(
+            update(Course)
+            .where(Course.id == course_id, Course.enrolled_count > 0)
+            .values(enrolled_count=Course.enrolled_count - 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self._expire_seat_count(course_id)
+        note_seats_changed(self.db, [course_id])
+
+    def create_enrollment(self, enrollment_in: EnrollmentCreate) -> Enrollment:
+        """
+        Validate and stage a new enrollment. Admin users can create any
+        enrollment, students can only enroll themselves in active courses.
+        """
+        # Check if student exists
+        student = self.access.get(Student, enrollment_in.student_id)
+        if not student:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Student with ID {enrollment_in.student_id} not found"
+            )
+
+        # Check if course exists and is active
+        course = self.access.get(Course, enrollment_in.course_id)
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Course with ID {enrollment_in.course_id} not found"
+            )
+
+        if course.status != CourseStatus.ACTIVE and self.current_user.role != UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot enroll in a course that is not active"
+            )
+
+        # Check permissions
+        if self.current_user.role == UserRole.STUDENT:
+            # Students can only enroll themselves
+            student_profile = self.access.student
+            if not student_profile or student_profile.id != enrollment_in.student_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Students can only enroll themselves"
+                )
+        elif self.current_user.role not in [UserRole.ADMIN, UserRole.TEACHER]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+
+        # Check if enrollment already exists
+        existing_enrollment = self.db.exec(
+            select(Enrollment).where(
+                Enrollment.student_id == enrollment_in.student_id,
+                Enrollment.course_id == enrollment_in.course_id
+            )
+        ).first()
+
+        if existing_enrollment:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Student is already enrolled in this course"
+            )
+
+        db_enrollment = Enrollment(**enrollment_in.dict())
+
+        # Reserve a seat in the same transaction as the insert
+        if db_enrollment.status in SEAT_HOLDING_STATUSES:
+            self._claim_seat(course)
+
+        self.db.add(db_enrollment)
+        self.db.flush()
+        self.access.remember(db_enrollment)
+        note_enrollments_changed(self.db, [db_enrollment.course_id])
+        return db_enrollment
+
+    def update_enrollment(self, enrollment_id: str, enrollment_in: EnrollmentUpdate) -> Enrollment:
+        """
+        Validate and stage an enrollment status change. Students can only
+        drop their own enrollments.
+        """
+        enrollment = self._get_enrollment(enrollment_id)
+
+        # Check permissions
+        if self.current_user.role == UserRole.STUDENT:
+            # Students can only update their own enrollments to "DROPPED" status
+            student = self.access.student
+            if not student or student.id != enrollment.student_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not enough permissions"
+                )
+
+            if enrollment_in.status != EnrollmentStatus.DROPPED:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Students can only drop enrollments"
+                )
+
+        enrollment_data = enrollment_in.dict(exclude_unset=True)
+
+        # Keep the course seat counter in step with the status change
+        new_status = enrollment_data.get("status") or enrollment.status
+        held_before = enrollment.status in SEAT_HOLDING_STATUSES
+        held_after = new_status in SEAT_HOLDING_STATUSES
+        if held_after and not held_before:
+            course = self.access.get(Course, enrollment.course_id)
+            if course:
+                self._claim_seat(course)
+        elif held_before and not held_after:
+            self._release_seat(enrollment.course_id)
+
+        for key, value in enrollment_data.items():
+            setattr(enrollment, key, value)
+
+        self.db.add(enrollment)
+        self.db.flush()
+        note_gpa_changed(self.db, [enrollment.student_id])
+        note_course_grades_changed(self.db, [enrollment.course_id])
+        note_rank_changed(self.db, [(enrollment.course_id, enrollment.id)], [enrollment.student_id])
+        note_enrollments_changed(self.db, [enrollment.course_id])
+        return enrollment
+
+    def delete_enrollment(self, enrollment_id: str) -> None:
+        """Stage the deletion of an enrollment. Only admin users can delete enrollments."""
+        if self.current_user.role != UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+
+        enrollment = self._get_enrollment(enrollment_id)
+
+        if enrollment.status in SEAT_HOLDING_STATUSES:
+            self._release_seat(enrollment.course_id)
+
+        final_grade = self.db.exec(
+            select(EnrollmentGradeSummary.weighted_average)
+            .where(EnrollmentGradeSummary.enrollment_id == enrollment.id)
+        ).first()
+        note_final_grades_changed(self.db, {enrollment.id: (final_grade, None)})
+        self.db.execute(
+            delete(EnrollmentGradeSummary).where(EnrollmentGradeSummary.enrollment_id == enrollment.id)
+        )
+        self.db.delete(enrollment)
+        self.db.flush()
+        self.access.forget(enrollment)
+        note_gpa_changed(self.db, [enrollment.student_id])
+        note_course_grades_changed(self.db, [enrollment.course_id])
+        note_rank_changed(self.db, [(enrollment.course_id, enrollment.id)], [enrollment.student_id])
+        note_enrollments_changed(self.db, [enrollment.course_id])
+
+
+def rebuild_seat_counts(db: Session) -> int:
+    """
+    Recompute every course's seat counter from the enrollments table with a
+    single UPDATE. Used to backfill existing data and to repair drift.
+    Returns the number of courses updated.
+    """
+    seat_count = (
+        select(func.count(Enrollment.id))
+        .where(
+            Enrollment.course_id == Course.id,
+            Enrollment.status.in_(SEAT_HOLDING_STATUSES)
+        )
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Course)
+        .values(enrolled_count=seat_count, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+class EnrollmentEntry(NamedTuple):
+    """One student/course pair to enroll through ``enroll_many``."""
+    student_id: str
+    course_id: str
+    status: EnrollmentStatus = EnrollmentStatus.PENDING
+    # Admins may enroll students in courses that are not active
+    allow_inactive: bool = False
+
+
+class EnrollmentResult(NamedTuple):
+    outcome: EnrollmentOutcome
+    enrollment_id: Optional[str] = None
+
+
+def enroll_many(db: Session, entries: List[EnrollmentEntry]) -> List[EnrollmentResult]:
+    """
+    Apply many enrollments with a handful of set-based statements.
+
+    The affected courses are locked and loaded in one query, student
+    existence and existing enrollments are resolved with one IN query each,
+    new rows go in with a single multi-row INSERT and each course's seat
+    counter is bumped once. Entries are decided in order, so earlier entries
+    win the remaining seats. Results line up with ``entries``; the caller
+    commits.
+    """
+    if not entries:
+        return []
+
+    course_ids = sorted({entry.course_id for entry in entries})
+    student_ids = {entry.student_id for entry in entries}
+
+    # Lock the course rows (in a stable order) so concurrent writers queue up
+    courses = {
+        course.id: course
+        for course in db.exec(
+            select(Course).where(Course.id.in_(course_ids)).order_by(Course.id).with_for_update()
+        ).all()
+    }
+    known_students = set(db.exec(select(Student.id).where(Student.id.in_(student_ids))).all())
+    taken: set = set(
+        db.exec(
+            select(Enrollment.student_id, Enrollment.course_id).where(
+                Enrollment.student_id.in_(student_ids),
+                Enrollment.course_id.in_(course_ids)
+            )
+        ).all()
+    )
+    remaining = {cid: course.max_students - course.enrolled_count for cid, course in courses.items()}
+
+    results: List[EnrollmentResult] = []
+    rows: List[Dict] = []
+    seats_taken: Dict[str, int] = {}
+    now = datetime.utcnow()
+
+    for entry in entries:
+        course = courses.get(entry.course_id)
+        holds_seat = entry.status in SEAT_HOLDING_STATUSES
+        if not course:
+            results.append(EnrollmentResult(EnrollmentOutcome.COURSE_NOT_FOUND))
+        elif entry.student_id not in known_students:
+            results.append(EnrollmentResult(EnrollmentOutcome.STUDENT_NOT_FOUND))
+        elif course.status != CourseStatus.ACTIVE and not entry.allow_inactive:
+            results.append(EnrollmentResult(EnrollmentOutcome.COURSE_INACTIVE))
+        elif (entry.student_id, entry.course_id) in taken:
+            results.append(EnrollmentResult(EnrollmentOutcome.ALREADY_ENROLLED))
+        elif holds_seat and remaining[entry.course_id] <= 0:
+            results.append(EnrollmentResult(EnrollmentOutcome.COURSE_FULL))
+        else:
+            enrollment_id = str(uuid.uuid4())
+            rows.append({
+                "id": enrollment_id,
+                "student_id": entry.student_id,
+                "course_id": entry.course_id,
+                "enrollment_date": date.today(),
+                "status": entry.status,
+                "created_at": now,
+                "updated_at": now,
+            })
+            taken.add((entry.student_id, entry.course_id))
+            if holds_seat:
+                remaining[entry.course_id] -= 1
+                seats_taken[entry.course_id] = seats_taken.get(entry.course_id, 0) + 1
+            results.append(EnrollmentResult(EnrollmentOutcome.ENROLLED, enrollment_id))
+
+    if rows:
+        db.execute(insert(Enrollment), rows)
+    for course_id, count in seats_taken.items():
+        db.execute(
+            update(Course)
+            .where(Course.id == course_id)
+            .values(enrolled_count=Course.enrolled_count + count, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.expire(courses[course_id], ["enrolled_count"])
+    note_seats_changed(db, seats_taken)
+    note_enrollments_changed(db, {row["course_id"] for row in rows})
+
+    return results
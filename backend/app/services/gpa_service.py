@@ -0,0 +1,193 @@
+from sqlmodel import Session, select
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from ..database.session import on_real_commit
+from ..models.course import Course
+from ..models.enrollment import Enrollment, EnrollmentStatus
+from ..models.grade_summary import EnrollmentGradeSummary
+from ..models.student import Student
+
+# Session.info key collecting students whose GPA changes in the transaction
+_CHANGED_STUDENTS_KEY = "gpa_changed_student_ids"
+
+# Enrollments that count towards GPA; dropped and pending ones do not
+GPA_STATUSES = (EnrollmentStatus.ACTIVE, EnrollmentStatus.COMPLETED)
+
+# Lower bound of each grade point on the 0-100 scale, matching the letter grades
+GRADE_POINTS = [(90.0, 4.0), (80.0, 3.0), (70.0, 2.0), (60.0, 1.0)]
+
+# Lower bound of each standing on the GPA scale, best first
+STANDINGS = [(3.5, "honors"), (2.0, "good"), (0.0, "probation")]
+
+
+def grade_points(percentages: np.ndarray) -> np.ndarray:
+    """Map 0-100 final percentages to 4.0-scale grade points."""
+    percentages = np.asarray(percentages, dtype=float)
+    return np.select([percentages >= bound for bound, _ in GRADE_POINTS],
+                     [points for _, points in GRADE_POINTS], default=0.0)
+
+
+def academic_standing(gpa: Optional[float]) -> Optional[str]:
+    if gpa is None:
+        return None
+    for bound, standing in STANDINGS:
+        if gpa >= bound:
+            return standing
+    return STANDINGS[-1][1]
+
+
+def term_label(start: pd.Series) -> pd.Series:
+    """Term of a course from its start date: spring for January-June, fall otherwise."""
+    return start.dt.year.astype(str) + np.where(start.dt.month <= 6, "-spring", "-fall")
+
+
+def _load_graded_courses(db: Session, student_ids: Optional[List[str]] = None,
+                         grade_level: Optional[int] = None) -> pd.DataFrame:
+    query = (
+        select(Enrollment.student_id, Course.start_date, Course.credit_hours,
+               EnrollmentGradeSummary.weighted_average)
+        .join(Course, Enrollment.course_id == Course.id)
+        .join(EnrollmentGradeSummary, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .where(
+            Enrollment.status.in_(GPA_STATUSES),
+            EnrollmentGradeSummary.weighted_average.isnot(None)
+        )
+    )
+    if student_ids is not None:
+        query = query.where(Enrollment.student_id.in_(student_ids))
+    if grade_level is not None:
+        query = query.join(Student, Enrollment.student_id == Student.id).where(Student.grade_level == grade_level)
+    return pd.DataFrame.from_records(
+        db.exec(query).all(), columns=["student_id", "start_date", "credit_hours", "final_percentage"]
+    )
+
+
+def _gpa(quality_points: float, credit_hours: float) -> Optional[float]:
+    return round(quality_points / credit_hours, 2) if credit_hours > 0 else None
+
+
+def compute_gpas(db: Session, student_ids: List[str], grade_level: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Term and cumulative GPA of many students in one set-based pass: one
+    query over the grade summaries, then grouped sums of credit-hour
+    weighted grade points. Pass ``grade_level`` to filter in SQL when
+    ``student_ids`` is a whole grade level.
+    """
+    courses = _load_graded_courses(db, None if grade_level is not None else student_ids, grade_level)
+    results = {
+        student_id: {"student_id": student_id, "cumulative_gpa": None, "credit_hours": 0,
+                     "standing": None, "terms": []}
+        for student_id in student_ids
+    }
+    if courses.empty:
+        return results
+
+    start = pd.to_datetime(courses["start_date"])
+    courses["term"] = term_label(start)
+    courses["term_start"] = start
+    courses["quality_points"] = grade_points(courses["final_percentage"].to_numpy()) * courses["credit_hours"]
+
+    terms = (
+        courses.groupby(["student_id", "term"], sort=False)
+        .agg(quality_points=("quality_points", "sum"), credit_hours=("credit_hours", "sum"),
+             term_start=("term_start", "min"))
+        .reset_index()
+        .sort_values(["student_id", "term_start"])
+    )
+    totals = terms.groupby("student_id")[["quality_points", "credit_hours"]].sum()
+
+    for student_id, quality_points, credit_hours in zip(
+        totals.index, totals["quality_points"].to_numpy(), totals["credit_hours"].to_numpy()
+    ):
+        if student_id not in results:
+            continue
+        gpa = _gpa(quality_points, credit_hours)
+        results[student_id].update(cumulative_gpa=gpa, credit_hours=int(credit_hours),
+                                   standing=academic_standing(gpa))
+
+    for student_id, term, quality_points, credit_hours in zip(
+        terms["student_id"], terms["term"], terms["quality_points"].to_numpy(), terms["credit_hours"].to_numpy()
+    ):
+        if student_id in results:
+            results[student_id]["terms"].append(
+                {"term": term, "gpa": _gpa(quality_points, credit_hours), "credit_hours": int(credit_hours)}
+            )
+    return results
+
+
+class StudentGpaCache:
+    """
+    In-process cache of computed GPAs per student. Entries are dropped when
+    a committed transaction changed the student's grades or enrollments and
+    expire after ``ttl_seconds`` to pick up changes made by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Any] = {}
+        # Bumped on every invalidation so a slow compute cannot store stale results
+        self._generation = 0
+
+    def lookup(self, student_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                student_id: entry[1]
+                for student_id, entry in ((sid, self._entries.get(sid)) for sid in student_ids)
+                if entry is not None and now - entry[0] <= self.ttl_seconds
+            }
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def store(self, results: Dict[str, Dict[str, Any]], generation: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return
+            for student_id, result in results.items():
+                self._entries[student_id] = (now, result)
+
+    def invalidate(self, student_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for student_id in student_ids:
+                self._entries.pop(student_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after a course's credit hours change."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+student_gpa_cache = StudentGpaCache(ttl_seconds=settings.GPA_CACHE_TTL_SECONDS)
+
+
+def get_student_gpas(db: Session, student_ids: List[str], grade_level: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """GPAs of the given students, computing the ones not cached in one pass."""
+    results = student_gpa_cache.lookup(student_ids)
+    missing = [student_id for student_id in student_ids if student_id not in results]
+    if missing:
+        generation = student_gpa_cache.generation
+        # Filter by grade level in SQL only when nothing of it was cached
+        computed = compute_gpas(db, missing, grade_level if len(missing) == len(student_ids) else None)
+        student_gpa_cache.store(computed, generation)
+        results.update(computed)
+    return results
+
+
+def note_gpa_changed(db: Session, student_ids: Iterable[str]) -> None:
+    """Record that the GPA of these students changes when ``db`` commits."""
+    db.info.setdefault(_CHANGED_STUDENTS_KEY, set()).update(student_ids)
+
+
+on_real_commit(_CHANGED_STUDENTS_KEY, lambda changed: student_gpa_cache.invalidate(changed))
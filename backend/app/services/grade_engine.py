@@ -0,0 +1,142 @@
+from sqlmodel import Session, select
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from ..models.enrollment import Enrollment
+from ..models.grade import Grade
+from ..models.grade_summary import EnrollmentGradeSummary
+
+GRADE_COLUMNS = ["enrollment_id", "score", "max_score", "weight"]
+
+# Lower bound of each letter grade on the 0-100 scale, best first
+LETTER_GRADES = [(90.0, "A"), (80.0, "B"), (70.0, "C"), (60.0, "D")]
+
+
+def load_grades(db: Session, enrollment_ids: Optional[Iterable[str]] = None,
+                course_id: Optional[str] = None) -> pd.DataFrame:
+    """Load the grade columns needed for final grades as one DataFrame."""
+    query = select(Grade.enrollment_id, Grade.score, Grade.max_score, Grade.weight)
+    if course_id is not None:
+        query = query.join(Enrollment, Grade.enrollment_id == Enrollment.id).where(
+            Enrollment.course_id == course_id
+        )
+    if enrollment_ids is not None:
+        query = query.where(Grade.enrollment_id.in_(list(enrollment_ids)))
+    return pd.DataFrame.from_records(db.exec(query).all(), columns=GRADE_COLUMNS)
+
+
+def letter_grades(percentages: np.ndarray) -> np.ndarray:
+    """Map 0-100 percentages to letter grades; NaN maps to None."""
+    percentages = np.asarray(percentages, dtype=float)
+    conditions = [percentages >= bound for bound, _ in LETTER_GRADES]
+    letters = np.select(conditions, [letter for _, letter in LETTER_GRADES], default="F").astype(object)
+    letters[np.isnan(percentages)] = None
+    return letters
+
+
+def compute_final_grades(grades: pd.DataFrame) -> pd.DataFrame:
+    """
+    Weighted final grade of every enrollment in one vectorized pass.
+
+    Each score is normalized to a percentage of its ``max_score``. Grades
+    without a positive weight count with the average weight of the weighted
+    grades in the same enrollment, or equally when none are weighted. The
+    final grade is the weighted mean over the grades recorded so far, so
+    partial sets are graded on what exists; ``weight_covered`` reports how
+    much declared weight that is. Grades with a non-positive ``max_score``
+    are ignored.
+
+    Returns a DataFrame indexed by enrollment_id with the columns
+    ``final_percentage``, ``letter_grade``, ``assessments`` and
+    ``weight_covered``.
+    """
+    columns = ["final_percentage", "letter_grade", "assessments", "weight_covered"]
+    if grades.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="enrollment_id"))
+
+    score = grades["score"].to_numpy(dtype=float)
+    max_score = grades["max_score"].to_numpy(dtype=float)
+    weight = grades["weight"].to_numpy(dtype=float)
+    codes, enrollment_ids = pd.factorize(grades["enrollment_id"])
+    groups = len(enrollment_ids)
+
+    valid = (max_score > 0) & ~np.isnan(score)
+    percentage = np.divide(score, max_score, out=np.zeros_like(score), where=valid) * 100
+
+    # Fill missing weights with the enrollment's average declared weight
+    weighted = valid & (weight > 0)
+    declared = np.bincount(codes, weights=np.where(weighted, weight, 0.0), minlength=groups)
+    declared_count = np.bincount(codes, weights=weighted, minlength=groups)
+    average = np.divide(declared, declared_count, out=np.ones(groups), where=declared_count > 0)
+    effective = np.where(weighted, weight, average[codes]) * valid
+
+    total_weight = np.bincount(codes, weights=effective, minlength=groups)
+    weighted_sum = np.bincount(codes, weights=effective * percentage, minlength=groups)
+    final = np.divide(weighted_sum, total_weight, out=np.full(groups, np.nan), where=total_weight > 0)
+
+    return pd.DataFrame(
+        {
+            "final_percentage": np.round(final, 2),
+            "letter_grade": letter_grades(final),
+            "assessments": np.bincount(codes, weights=valid, minlength=groups).astype(int),
+            "weight_covered": declared,
+        },
+        index=pd.Index(enrollment_ids, name="enrollment_id"),
+    )
+
+
+def final_grade_rows(finals: pd.DataFrame, enrollment_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    """One plain dict per enrollment, including enrollments with no grades yet."""
+    finals = finals.reindex(list(enrollment_ids))
+    rows = []
+    for enrollment_id, final, letter, assessments, covered in zip(
+        finals.index,
+        finals["final_percentage"].to_numpy(dtype=float),
+        finals["letter_grade"],
+        finals["assessments"].fillna(0).to_numpy(dtype=int),
+        finals["weight_covered"].fillna(0).to_numpy(dtype=float),
+    ):
+        rows.append({
+            "enrollment_id": enrollment_id,
+            "final_percentage": None if np.isnan(final) else float(final),
+            "letter_grade": letter if isinstance(letter, str) else None,
+            "assessments": int(assessments),
+            "weight_covered": float(covered),
+        })
+    return rows
+
+
+def course_final_grades(db: Session, course_id: str) -> List[Dict[str, Any]]:
+    """
+    Final grades of every enrollment in a course, read from the maintained
+    grade summaries instead of recomputing from the grades table.
+    """
+    rows = db.exec(
+        select(
+            Enrollment.id,
+            Enrollment.student_id,
+            EnrollmentGradeSummary.weighted_average,
+            EnrollmentGradeSummary.grade_count,
+            EnrollmentGradeSummary.weight_total,
+            EnrollmentGradeSummary.latest_grade_date,
+        )
+        .outerjoin(EnrollmentGradeSummary, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .where(Enrollment.course_id == course_id)
+    ).all()
+
+    finals = np.array([row[2] if row[2] is not None else np.nan for row in rows], dtype=float)
+    letters = letter_grades(finals)
+    return [
+        {
+            "enrollment_id": enrollment_id,
+            "student_id": student_id,
+            "final_percentage": None if average is None else round(average, 2),
+            "letter_grade": letter,
+            "assessments": grade_count or 0,
+            "weight_covered": weight_total or 0.0,
+            "latest_grade_date": latest_grade_date,
+        }
+        for (enrollment_id, student_id, average, grade_count, weight_total, latest_grade_date), letter
+        in zip(rows, letters)
+    ]
@@ -0,0 +1,351 @@
+from fastapi import HTTPException, UploadFile, status
+from sqlmodel import Session, select
+from sqlalchemy import func, insert, or_
+from sqlalchemy.engine import Engine
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+import csv
+import time
+import uuid
+
+from openpyxl import load_workbook
+
+from ..config import settings
+from ..database.session import engine
+from ..models.user import User, UserRole
+from ..models.teacher import Teacher
+from ..models.student import Student
+from ..models.course import Course
+from ..models.enrollment import Enrollment, EnrollmentStatus
+from ..models.grade import Grade
+from ..models.grade_import import GradeImportJob, GradeImportJobBase, GradeImportStatus
+from .grade_service import scores_out_of_range
+from .grade_summary import GradeSummaryChanges
+from ..utils.logger import app_logger
+
+# Uploaded gradebooks and their error reports
+IMPORTS_DIR = Path(__file__).parent.parent.parent / "imports"
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+# Accepted spellings of the gradebook columns
+COLUMN_ALIASES = {
+    "email": "student_email",
+    "student_email": "student_email",
+    "student_id": "student_id",
+    "course_code": "course_code",
+    "course": "course_code",
+    "score": "score",
+    "comments": "comments",
+    "comment": "comments",
+}
+
+ERROR_REPORT_COLUMNS = ["row", "student_email", "student_id", "course_code", "score", "error"]
+
+GradebookRow = Tuple[int, Dict[str, Any]]
+
+
+def _imports_dir() -> Path:
+    """IMPORTS_DIR, created on first use rather than on import."""
+    IMPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    return IMPORTS_DIR
+
+
+def store_upload(upload: UploadFile) -> Path:
+    """Copy an uploaded gradebook to disk in fixed-size blocks, enforcing the size limit."""
+    extension = Path(upload.filename or "").suffix.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file type. Upload one of: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+
+    path = _imports_dir() / f"{uuid.uuid4()}{extension}"
+    limit = settings.GRADE_IMPORT_MAX_UPLOAD_MB * 1024 * 1024
+    written = 0
+    with open(path, "wb") as target:
+        while True:
+            block = upload.file.read(1024 * 1024)
+            if not block:
+                break
+            written += len(block)
+            if written > limit:
+                target.close()
+                path.unlink(missing_ok=True)
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File is larger than {settings.GRADE_IMPORT_MAX_UPLOAD_MB} MB"
+                )
+            target.write(block)
+    return path
+
+
+def _normalize_header(header: List[Any]) -> List[Optional[str]]:
+    columns = [
+        COLUMN_ALIASES.get(str(name).strip().lower().replace(" ", "_")) if name is not None else None
+        for name in header
+    ]
+    if "score" not in columns:
+        raise ValueError("Missing required column: score")
+    if "student_email" not in columns and "student_id" not in columns:
+        raise ValueError("Missing required column: student_email or student_id")
+    return columns
+
+
+def _rows_from_values(values: Iterator[Tuple[Any, ...]]) -> Iterator[GradebookRow]:
+    header = next(values, None)
+    if header is None:
+        return
+    columns = _normalize_header(list(header))
+    # The header is spreadsheet row 1
+    for row_number, row in enumerate(values, start=2):
+        if not any(value not in (None, "") for value in row):
+            continue
+        yield row_number, {
+            column: value for column, value in zip(columns, row) if column is not None
+        }
+
+
+def iter_gradebook_rows(path: Path) -> Iterator[GradebookRow]:
+    """
+    Stream (row number, row) pairs from a CSV or XLSX gradebook without
+    loading the file into memory. XLSX files are read with openpyxl's
+    read-only mode, which parses the sheet lazily.
+    """
+    if path.suffix.lower() == ".xlsx":
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from _rows_from_values(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            yield from _rows_from_values(iter(csv.reader(source)))
+
+
+def _chunks(rows: Iterator[GradebookRow], size: int) -> Iterator[List[GradebookRow]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _score(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class _ErrorReport:
+    """CSV of rejected rows, created on the first rejection."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, row_number: int, row: Dict[str, Any], error: str) -> None:
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(ERROR_REPORT_COLUMNS)
+        self._writer.writerow([
+            row_number,
+            _text(row.get("student_email")),
+            _text(row.get("student_id")),
+            _text(row.get("course_code")),
+            _text(row.get("score")),
+            error,
+        ])
+
+    def close(self) -> Optional[Path]:
+        if self._file is None:
+            return None
+        self._file.close()
+        return self.path
+
+
+class GradebookImporter:
+    """
+    Imports a gradebook file in chunks. Each chunk resolves its students to
+    enrollments with one joined query, range-checks its scores in one
+    vectorized pass, inserts accepted grades with one multi-row INSERT and
+    commits, so memory stays bounded by the chunk size rather than the file.
+    """
+
+    def __init__(self, db: Session, job: GradeImportJob, teacher_id: Optional[str] = None):
+        self.db = db
+        self.job = job
+        # Teachers can only grade the courses they teach
+        self.teacher_id = teacher_id
+        self._seen_enrollments = set()
+
+    def _course_key(self, row: Dict[str, Any]) -> str:
+        return "" if self.job.course_id else _text(row.get("course_code"))
+
+    def _resolve_enrollments(self, chunk: List[GradebookRow]) -> Dict[Tuple[str, str], str]:
+        emails = {_text(row.get("student_email")).lower() for _, row in chunk} - {""}
+        student_ids = {_text(row.get("student_id")) for _, row in chunk} - {""}
+        email = func.lower(User.email)
+
+        query = (
+            select(Enrollment.id, Enrollment.student_id, email, Course.code)
+            .join(Student, Enrollment.student_id == Student.id)
+            .join(User, Student.user_id == User.id)
+            .join(Course, Enrollment.course_id == Course.id)
+            .where(
+                Enrollment.status == EnrollmentStatus.ACTIVE,
+                or_(Student.id.in_(student_ids), email.in_(emails))
+            )
+        )
+        if self.job.course_id:
+            query = query.where(Course.id == self.job.course_id)
+        else:
+            query = query.where(Course.code.in_({self._course_key(row) for _, row in chunk}))
+        if self.teacher_id:
+            query = query.where(Course.teacher_id == self.teacher_id)
+
+        lookup = {}
+        for enrollment_id, student_id, student_email, course_code in self.db.exec(query).all():
+            course_key = "" if self.job.course_id else course_code
+            lookup[(course_key, student_id)] = enrollment_id
+            lookup[(course_key, student_email)] = enrollment_id
+        return lookup
+
+    def import_chunk(self, chunk: List[GradebookRow], report: _ErrorReport) -> int:
+        """Import one chunk of rows and return how many grades were inserted."""
+        lookup = self._resolve_enrollments(chunk)
+        out_of_range = scores_out_of_range([_score(row.get("score")) for _, row in chunk], self.job.max_score)
+        now = datetime.utcnow()
+        grades = []
+
+        for index, (row_number, row) in enumerate(chunk):
+            course_key = self._course_key(row)
+            student_key = _text(row.get("student_email")).lower() or _text(row.get("student_id"))
+            enrollment_id = lookup.get((course_key, student_key))
+
+            if not student_key:
+                error = "Missing student_email or student_id"
+            elif not self.job.course_id and not course_key:
+                error = "Missing course_code"
+            elif enrollment_id is None:
+                error = "No active enrollment found for this student in the course"
+            elif out_of_range[index]:
+                error = f"Score must be a number between 0 and {self.job.max_score}"
+            elif enrollment_id in self._seen_enrollments:
+                error = "Duplicate row for this enrollment"
+            else:
+                error = None
+
+            if error:
+                report.write(row_number, row, error)
+                continue
+
+            self._seen_enrollments.add(enrollment_id)
+            grades.append({
+                "id": str(uuid.uuid4()),
+                "enrollment_id": enrollment_id,
+                "grade_type": self.job.grade_type,
+                "score": _score(row.get("score")),
+                "max_score": self.job.max_score,
+                "weight": self.job.weight,
+                "comments": _text(row.get("comments")) or None,
+                "grade_date": self.job.grade_date,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        if grades:
+            self.db.execute(insert(Grade), grades)
+            summary = GradeSummaryChanges()
+            for grade in grades:
+                summary.add(grade["enrollment_id"], grade["score"], grade["max_score"], grade["weight"], grade["grade_date"])
+            summary.apply(self.db)
+        return len(grades)
+
+
+def create_import_job(
+    db: Session, upload: UploadFile, job_in: GradeImportJobBase, current_user: User
+) -> GradeImportJob:
+    """Store an uploaded gradebook and queue it for import."""
+    path = store_upload(upload)
+    job = GradeImportJob(
+        **job_in.dict(),
+        requested_by=current_user.id,
+        filename=upload.filename,
+        file_path=str(path),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def run_grade_import(job_id: str, bind: Optional[Engine] = None) -> None:
+    """
+    Process a queued import job in its own session on ``bind`` (the
+    application database by default). Chunks are committed as they go, so
+    a job that fails part way keeps the grades imported so far and reports
+    how many that was.
+    """
+    with Session(bind or engine) as db:
+        job = db.get(GradeImportJob, job_id)
+        if not job or job.status != GradeImportStatus.QUEUED:
+            return
+        job.status = GradeImportStatus.PROCESSING
+        db.add(job)
+        db.commit()
+
+        requester = db.get(User, job.requested_by)
+        report = _ErrorReport(_imports_dir() / f"{job.id}_errors.csv")
+        started = time.perf_counter()
+        try:
+            teacher_id = None
+            if requester.role == UserRole.TEACHER:
+                teacher = db.exec(select(Teacher).where(Teacher.user_id == requester.id)).first()
+                if not teacher:
+                    raise ValueError("Teacher profile not found")
+                teacher_id = teacher.id
+
+            importer = GradebookImporter(db, job, teacher_id)
+            for chunk in _chunks(iter_gradebook_rows(Path(job.file_path)), settings.GRADE_IMPORT_CHUNK_SIZE):
+                imported = importer.import_chunk(chunk, report)
+                job.total_rows += len(chunk)
+                job.imported_rows += imported
+                job.rejected_rows += len(chunk) - imported
+                job.updated_at = datetime.utcnow()
+                db.add(job)
+                db.commit()
+            job.status = GradeImportStatus.COMPLETED
+        except Exception as exc:
+            db.rollback()
+            app_logger.error(f"Grade import {job.id} failed: {exc}")
+            job.status = GradeImportStatus.FAILED
+            job.detail = str(exc)[:500]
+        finally:
+            error_report = report.close()
+            Path(job.file_path).unlink(missing_ok=True)
+
+        job.duration_seconds = round(time.perf_counter() - started, 3)
+        job.rows_per_second = round(job.total_rows / job.duration_seconds, 1) if job.duration_seconds else None
+        job.error_report_path = str(error_report) if error_report else None
+        job.finished_at = datetime.utcnow()
+        job.updated_at = job.finished_at
+        db.add(job)
+        db.commit()
+        app_logger.info(
+            f"Grade import {job.id}: {job.imported_rows}/{job.total_rows} rows imported "
+            f"({job.rows_per_second} rows/s)"
+        )
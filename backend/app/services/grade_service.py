@@ -0,0 +1,238 @@
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+from sqlalchemy import insert
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import numpy as np
+import uuid
+
+from ..models.user import User, UserRole
+from ..models.grade import Grade, GradeCreate, GradeUpdate
+from ..models.enrollment import Enrollment, EnrollmentStatus
+from ..models.course import Course
+from ..schemas.grades import BulkGradeRequest
+from .access import AccessContext
+from .grade_summary import GradeSummaryChanges
+
+
+def scores_out_of_range(scores: List[float], max_score: float) -> np.ndarray:
+    """Vectorized range check: True where a score is missing, negative or above ``max_score``."""
+    values = np.asarray(scores, dtype=float)
+    return np.isnan(values) | (values < 0) | (values > max_score)
+
+
+class GradeService:
+    """
+    Grade write operations shared by the grades router and the batch endpoint.
+
+    Methods stage their changes and flush, leaving the commit to the caller.
+    """
+
+    def __init__(self, db: Session, current_user: User, access: Optional[AccessContext] = None):
+        self.db = db
+        self.current_user = current_user
+        self.access = access or AccessContext(db, current_user)
+
+    def check_course_permission(self, course: Course, action: str) -> None:
+        """Only admins and the teacher of the course can change its grades."""
+        if self.current_user.role == UserRole.TEACHER:
+            teacher = self.access.teacher
+            if not teacher or teacher.id != course.teacher_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Teachers can only {action} courses they teach"
+                )
+        elif self.current_user.role != UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+
+    def _get_grade_context(self, grade_id: str) -> Tuple[Grade, Enrollment, Course]:
+        grade = self.access.get(Grade, grade_id)
+        if not grade:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Grade with ID {grade_id} not found"
+            )
+
+        enrollment = self.access.get(Enrollment, grade.enrollment_id)
+        if not enrollment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Enrollment not found"
+            )
+
+        course = self.access.get(Course, enrollment.course_id)
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        return grade, enrollment, course
+
+    def create_grade(self, grade_in: GradeCreate) -> Grade:
+        """Validate and stage a new grade."""
+        # Check if enrollment exists and is active
+        enrollment = self.access.get(Enrollment, grade_in.enrollment_id)
+        if not enrollment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Enrollment with ID {grade_in.enrollment_id} not found"
+            )
+
+        if enrollment.status != EnrollmentStatus.ACTIVE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot add grades to inactive enrollments"
+            )
+
+        # Get the course for permission check
+        course = self.access.get(Course, enrollment.course_id)
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+
+        self.check_course_permission(course, "add grades to")
+
+        # Validate score
+        if grade_in.score < 0 or grade_in.score > grade_in.max_score:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Score must be between 0 and {grade_in.max_score}"
+            )
+
+        db_grade = Grade(**grade_in.dict())
+        self.db.add(db_grade)
+        self.db.flush()
+        self.access.remember(db_grade)
+
+        summary = GradeSummaryChanges()
+        summary.add_grade(db_grade)
+        summary.apply(self.db)
+        return db_grade
+
+    def update_grade(self, grade_id: str, grade_in: GradeUpdate) -> Grade:
+        """Validate and stage changes to an existing grade."""
+        grade, enrollment, course = self._get_grade_context(grade_id)
+
+        self.check_course_permission(course, "update grades for")
+
+        # Validate score if provided
+        grade_data = grade_in.dict(exclude_unset=True)
+        if "score" in grade_data:
+            if grade_data["score"] < 0 or grade_data["score"] > grade.max_score:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Score must be between 0 and {grade.max_score}"
+                )
+
+        summary = GradeSummaryChanges()
+        summary.remove_grade(grade)
+        for key, value in grade_data.items():
+            setattr(grade, key, value)
+
+        self.db.add(grade)
+        self.db.flush()
+        summary.add_grade(grade)
+        summary.apply(self.db)
+        return grade
+
+    def delete_grade(self, grade_id: str) -> None:
+        """Check permissions and stage the deletion of a grade."""
+        grade, enrollment, course = self._get_grade_context(grade_id)
+
+        self.check_course_permission(course, "delete grades for")
+
+        summary = GradeSummaryChanges()
+        summary.remove_grade(grade)
+        self.db.delete(grade)
+        self.db.flush()
+        self.access.forget(grade)
+        summary.apply(self.db)
+
+    def bulk_create_grades(self, bulk_in: BulkGradeRequest) -> List[Dict[str, Any]]:
+        """
+        Validate and stage grades for one assessment across a course.
+
+        Course ownership is checked once, every enrollment is validated with
+        a single query, score ranges are checked as one vectorized pass and
+        all accepted rows are inserted with one statement. Returns one result
+        per submitted row, in order.
+        """
+        course = self.access.get(Course, bulk_in.course_id)
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Course with ID {bulk_in.course_id} not found"
+            )
+
+        self.check_course_permission(course, "add grades to")
+
+        entries = bulk_in.scores
+        enrollment_ids = [entry.enrollment_id for entry in entries]
+        enrollments = {
+            enrollment.id: enrollment
+            for enrollment in self.db.exec(
+                select(Enrollment).where(Enrollment.id.in_(set(enrollment_ids)))
+            ).all()
+        }
+
+        # Vectorized score-range check for the whole assessment
+        out_of_range = scores_out_of_range([entry.score for entry in entries], bulk_in.max_score)
+
+        errors: List[Optional[str]] = []
+        seen = set()
+        for index, entry in enumerate(entries):
+            enrollment = enrollments.get(entry.enrollment_id)
+            if not enrollment or enrollment.course_id != course.id:
+                errors.append(f"Enrollment with ID {entry.enrollment_id} not found in this course")
+            elif enrollment.status != EnrollmentStatus.ACTIVE:
+                errors.append("Cannot add grades to inactive enrollments")
+            elif out_of_range[index]:
+                errors.append(f"Score must be between 0 and {bulk_in.max_score}")
+            elif entry.enrollment_id in seen:
+                errors.append("Duplicate enrollment in request")
+            else:
+                errors.append(None)
+                # Only accepted rows count, so a corrected retry of a rejected row is kept
+                seen.add(entry.enrollment_id)
+
+        rejected = any(error is not None for error in errors)
+        now = datetime.utcnow()
+        rows = []
+        results = []
+        for index, (entry, error) in enumerate(zip(entries, errors)):
+            grade_id = None
+            if error is None and not (rejected and bulk_in.all_or_nothing):
+                grade_id = str(uuid.uuid4())
+                rows.append({
+                    "id": grade_id,
+                    "enrollment_id": entry.enrollment_id,
+                    "grade_type": bulk_in.grade_type,
+                    "score": entry.score,
+                    "max_score": bulk_in.max_score,
+                    "weight": bulk_in.weight,
+                    "comments": entry.comments,
+                    "grade_date": bulk_in.grade_date,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            elif error is None:
+                error = "Not saved because other rows were rejected"
+            results.append({
+                "index": index,
+                "enrollment_id": entry.enrollment_id,
+                "grade_id": grade_id,
+                "error": error,
+            })
+
+        if rows:
+            self.db.execute(insert(Grade), rows)
+            summary = GradeSummaryChanges()
+            for row in rows:
+                summary.add(row["enrollment_id"], row["score"], row["max_score"], row["weight"], row["grade_date"])
+            summary.apply(self.db)
+        return results
@@ -0,0 +1,199 @@
+from sqlmodel import Session, select
+from sqlalchemy import func
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from ..database.session import on_real_commit
+from ..models.enrollment import Enrollment
+from ..models.grade import Grade
+from ..models.grade_summary import EnrollmentGradeSummary
+from .gpa_service import GPA_STATUSES
+
+# Session.info key collecting courses whose grades change in the transaction
+_CHANGED_COURSES_KEY = "grade_stats_changed_course_ids"
+
+PERCENTILES = (25, 75, 90)
+HISTOGRAM_BINS = 10
+
+
+def _empty_statistics() -> Dict[str, Any]:
+    return {
+        "count": 0, "mean": None, "median": None, "min": None, "max": None, "std_dev": None,
+        "percentiles": {f"p{p}": None for p in PERCENTILES},
+        "histogram": [0] * HISTOGRAM_BINS,
+    }
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), 2)
+
+
+def _vectorized_statistics(values: np.ndarray) -> Dict[str, Any]:
+    """Statistics of one group of 0-100 percentages computed with NumPy."""
+    if not len(values):
+        return _empty_statistics()
+    quantiles = np.percentile(values, (50,) + PERCENTILES)
+    histogram, _ = np.histogram(np.clip(values, 0, 100), bins=HISTOGRAM_BINS, range=(0, 100))
+    return {
+        "count": int(len(values)),
+        "mean": _rounded(values.mean()),
+        "median": _rounded(quantiles[0]),
+        "min": _rounded(values.min()),
+        "max": _rounded(values.max()),
+        "std_dev": _rounded(values.std(ddof=1)) if len(values) > 1 else None,
+        "percentiles": {f"p{p}": _rounded(q) for p, q in zip(PERCENTILES, quantiles[1:])},
+        "histogram": histogram.tolist(),
+    }
+
+
+def _percentage():
+    return Grade.score * 100.0 / Grade.max_score
+
+
+def _course_grades(course_id: str):
+    return (
+        select(Grade.grade_type, Grade.grade_date, _percentage().label("percentage"))
+        .join(Enrollment, Grade.enrollment_id == Enrollment.id)
+        .where(Enrollment.course_id == course_id, Grade.max_score > 0)
+    )
+
+
+def _course_finals(course_id: str):
+    return (
+        select(EnrollmentGradeSummary.weighted_average.label("percentage"))
+        .join(Enrollment, EnrollmentGradeSummary.enrollment_id == Enrollment.id)
+        .where(
+            Enrollment.course_id == course_id,
+            Enrollment.status.in_(GPA_STATUSES),
+            EnrollmentGradeSummary.weighted_average.isnot(None)
+        )
+    )
+
+
+def _sql_statistics(db: Session, source, group_columns: List[str]) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Statistics per group computed inside Postgres: aggregates and ordered-set
+    percentiles in one grouped query, the histogram in a second one.
+    """
+    rows = source.subquery()
+    value = rows.c.percentage
+    groups = [rows.c[column] for column in group_columns]
+
+    aggregates = db.execute(
+        select(
+            *groups,
+            func.count(value), func.avg(value), func.min(value), func.max(value), func.stddev_samp(value),
+            func.percentile_cont(0.5).within_group(value),
+            *[func.percentile_cont(p / 100).within_group(value) for p in PERCENTILES],
+        ).group_by(*groups)
+    ).all()
+
+    # Out-of-range values count in the first or last bucket, as np.clip does in the fallback
+    bucket = func.greatest(func.least(func.width_bucket(value, 0, 100, HISTOGRAM_BINS), HISTOGRAM_BINS), 1)
+    buckets = db.execute(
+        select(*groups, bucket, func.count()).group_by(*groups, bucket)
+    ).all()
+
+    results = {}
+    key_size = len(groups)
+    for row in aggregates:
+        key = tuple(row[:key_size])
+        count, mean, low, high, std_dev, median, *quantiles = row[key_size:]
+        results[key] = {
+            "count": count,
+            "mean": _rounded(mean),
+            "median": _rounded(median),
+            "min": _rounded(low),
+            "max": _rounded(high),
+            "std_dev": _rounded(std_dev),
+            "percentiles": {f"p{p}": _rounded(q) for p, q in zip(PERCENTILES, quantiles)},
+            "histogram": [0] * HISTOGRAM_BINS,
+        }
+    for row in buckets:
+        key, index, count = tuple(row[:key_size]), row[key_size], row[key_size + 1]
+        if key in results:
+            results[key]["histogram"][index - 1] += count
+    return results
+
+
+def _fallback_statistics(db: Session, source, group_columns: List[str]) -> Dict[tuple, Dict[str, Any]]:
+    """Load only the percentage column (plus group keys) and aggregate with NumPy."""
+    frame = pd.DataFrame.from_records(db.execute(source).all(), columns=group_columns + ["percentage"])
+    if not group_columns:
+        return {(): _vectorized_statistics(frame["percentage"].to_numpy(dtype=float))}
+    return {
+        key if isinstance(key, tuple) else (key,): _vectorized_statistics(group["percentage"].to_numpy(dtype=float))
+        for key, group in frame.groupby(group_columns, sort=False)
+    }
+
+
+def compute_course_statistics(db: Session, course_id: str) -> Dict[str, Any]:
+    """
+    Distribution of final grades and of every assessment in a course, on
+    the 0-100 scale. An assessment is one grade type on one date. Postgres
+    aggregates in SQL; other databases fall back to NumPy.
+    """
+    compute = _sql_statistics if db.get_bind().dialect.name == "postgresql" else _fallback_statistics
+
+    overall = compute(db, _course_finals(course_id), []).get((), _empty_statistics())
+    assessments = compute(db, _course_grades(course_id), ["grade_type", "grade_date"])
+    return {
+        "course_id": course_id,
+        "finals": overall,
+        "assessments": [
+            {"grade_type": grade_type, "grade_date": grade_date, **statistics}
+            for (grade_type, grade_date), statistics in sorted(
+                assessments.items(), key=lambda item: (item[0][1], str(item[0][0]))
+            )
+        ],
+    }
+
+
+class CourseStatisticsCache:
+    """
+    Cached statistics per course, dropped when a committed transaction
+    changed the course's grades or enrollments. ``ttl_seconds`` bounds how
+    long changes made by other processes can go unseen.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Any] = {}
+        self._generation = 0
+
+    def get(self, db: Session, course_id: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(course_id)
+            generation = self._generation
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+            return entry[1]
+
+        statistics = compute_course_statistics(db, course_id)
+        with self._lock:
+            # Skip storing if grades changed while computing
+            if generation == self._generation:
+                self._entries[course_id] = (time.monotonic(), statistics)
+        return statistics
+
+    def invalidate(self, course_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for course_id in course_ids:
+                self._entries.pop(course_id, None)
+
+
+course_statistics_cache = CourseStatisticsCache(ttl_seconds=settings.GRADE_STATS_CACHE_TTL_SECONDS)
+
+
+def note_course_grades_changed(db: Session, course_ids: Iterable[str]) -> None:
+    """Record that grade statistics of these courses change when ``db`` commits."""
+    db.info.setdefault(_CHANGED_COURSES_KEY, set()).update(course_ids)
+
+
+on_real_commit(_CHANGED_COURSES_KEY, lambda changed: course_statistics_cache.invalidate(changed))
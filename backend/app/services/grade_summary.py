@@ -0,0 +1,251 @@
+from sqlmodel import Session, select
+from sqlalchemy import and_, case, delete, func, insert
+from typing import Any, Dict, List, Optional, Set
+from datetime import date, datetime
+import math
+import uuid
+
+from ..models.enrollment import Enrollment
+from ..models.grade import Grade
+from ..models.grade_summary import EnrollmentGradeSummary
+from .gpa_service import note_gpa_changed
+from .grade_statistics import note_course_grades_changed
+from .class_rank import note_rank_changed
+from .analytics import note_final_grades_changed
+
+# Running sums stored on the summary row; all of them are additive
+SUM_FIELDS = ("grade_count", "weighted_count", "weight_total", "weighted_points", "unweighted_points")
+
+# Allowed drift between the incremental sums and a recompute
+TOLERANCE = 1e-6
+
+
+def grade_contribution(score: float, max_score: float, weight: float) -> Dict[str, float]:
+    """What one grade adds to its enrollment's running sums."""
+    if not max_score or max_score <= 0 or score is None or math.isnan(score):
+        return dict.fromkeys(SUM_FIELDS, 0)
+
+    percentage = score / max_score * 100
+    if weight and weight > 0:
+        return {"grade_count": 1, "weighted_count": 1, "weight_total": weight,
+                "weighted_points": weight * percentage, "unweighted_points": 0.0}
+    return {"grade_count": 1, "weighted_count": 0, "weight_total": 0.0,
+            "weighted_points": 0.0, "unweighted_points": percentage}
+
+
+def summary_average(sums: Dict[str, float]) -> Optional[float]:
+    """
+    Weighted average on the 0-100 scale, matching ``compute_final_grades``:
+    grades without a weight count with the average declared weight, or
+    equally when none are weighted.
+    """
+    unweighted_count = sums["grade_count"] - sums["weighted_count"]
+    average_weight = sums["weight_total"] / sums["weighted_count"] if sums["weighted_count"] else 1.0
+    total_weight = sums["weight_total"] + average_weight * unweighted_count
+    if total_weight <= 0:
+        return None
+    return (sums["weighted_points"] + average_weight * sums["unweighted_points"]) / total_weight
+
+
+def _sums(summary: EnrollmentGradeSummary) -> Dict[str, float]:
+    return {field: getattr(summary, field) for field in SUM_FIELDS}
+
+
+class GradeSummaryChanges:
+    """
+    Grade changes collected during a write and applied to the summary rows
+    in the same transaction. Call ``apply`` after the grade rows are flushed.
+    """
+
+    def __init__(self):
+        self.deltas: Dict[str, Dict[str, float]] = {}
+        self.added_dates: Dict[str, date] = {}
+        self.removed_dates: Dict[str, date] = {}
+
+    def add(self, enrollment_id: str, score: float, max_score: float, weight: float, grade_date: date) -> None:
+        """Record a grade that now exists."""
+        delta = self.deltas.setdefault(enrollment_id, dict.fromkeys(SUM_FIELDS, 0))
+        for field, value in grade_contribution(score, max_score, weight).items():
+            delta[field] += value
+        if grade_date and (enrollment_id not in self.added_dates or grade_date > self.added_dates[enrollment_id]):
+            self.added_dates[enrollment_id] = grade_date
+
+    def remove(self, enrollment_id: str, score: float, max_score: float, weight: float, grade_date: date) -> None:
+        """Record a grade that no longer exists (or its values before an update)."""
+        delta = self.deltas.setdefault(enrollment_id, dict.fromkeys(SUM_FIELDS, 0))
+        for field, value in grade_contribution(score, max_score, weight).items():
+            delta[field] -= value
+        if grade_date and (enrollment_id not in self.removed_dates or grade_date > self.removed_dates[enrollment_id]):
+            self.removed_dates[enrollment_id] = grade_date
+
+    def add_grade(self, grade: Grade) -> None:
+        self.add(grade.enrollment_id, grade.score, grade.max_score, grade.weight, grade.grade_date)
+
+    def remove_grade(self, grade: Grade) -> None:
+        self.remove(grade.enrollment_id, grade.score, grade.max_score, grade.weight, grade.grade_date)
+
+    def apply(self, db: Session) -> None:
+        """
+        Apply the collected deltas. Enrollment rows are locked in a stable
+        order first so concurrent writers to the same enrollment queue up and
+        only one of them creates a missing summary row.
+        """
+        enrollment_ids = sorted(self.deltas)
+        if not enrollment_ids:
+            return
+
+        owners = db.exec(
+            select(Enrollment.id, Enrollment.student_id, Enrollment.course_id)
+            .where(Enrollment.id.in_(enrollment_ids))
+            .order_by(Enrollment.id)
+            .with_for_update()
+        ).all()
+        student_ids = {student_id for _, student_id, _ in owners}
+        note_gpa_changed(db, student_ids)
+        note_course_grades_changed(db, {course_id for _, _, course_id in owners})
+        note_rank_changed(db, {(course_id, enrollment_id) for enrollment_id, _, course_id in owners}, student_ids)
+        summaries = {
+            summary.enrollment_id: summary
+            for summary in db.exec(
+                select(EnrollmentGradeSummary).where(EnrollmentGradeSummary.enrollment_id.in_(enrollment_ids))
+            ).all()
+        }
+
+        # A removed grade may have been the latest one; find the new latest in one query
+        stale_dates = {
+            enrollment_id for enrollment_id, removed in self.removed_dates.items()
+            if enrollment_id not in summaries
+            or summaries[enrollment_id].latest_grade_date is None
+            or removed >= summaries[enrollment_id].latest_grade_date
+        }
+        latest_dates = {}
+        if stale_dates:
+            latest_dates = dict(db.exec(
+                select(Grade.enrollment_id, func.max(Grade.grade_date))
+                .where(Grade.enrollment_id.in_(stale_dates))
+                .group_by(Grade.enrollment_id)
+            ).all())
+
+        now = datetime.utcnow()
+        final_grades = {}
+        for enrollment_id in enrollment_ids:
+            summary = summaries.get(enrollment_id)
+            if summary is None:
+                summary = EnrollmentGradeSummary(enrollment_id=enrollment_id)
+            previous_average = summary.weighted_average
+            for field, value in self.deltas[enrollment_id].items():
+                setattr(summary, field, getattr(summary, field) + value)
+            if summary.grade_count <= 0:
+                # Nothing left to average; clear accumulated float error
+                for field in SUM_FIELDS:
+                    setattr(summary, field, 0)
+
+            if enrollment_id in stale_dates:
+                summary.latest_grade_date = latest_dates.get(enrollment_id)
+            added = self.added_dates.get(enrollment_id)
+            if added and (summary.latest_grade_date is None or added > summary.latest_grade_date):
+                summary.latest_grade_date = added
+
+            summary.weighted_average = summary_average(_sums(summary))
+            summary.updated_at = now
+            db.add(summary)
+            final_grades[enrollment_id] = (previous_average, summary.weighted_average)
+
+        db.flush()
+        note_final_grades_changed(db, final_grades)
+        self.deltas.clear()
+        self.added_dates.clear()
+        self.removed_dates.clear()
+
+
+def grade_sum_columns() -> List[Any]:
+    """
+    Aggregate expressions for the ``SUM_FIELDS`` (in order) over grouped
+    grade rows, for queries that compute summaries in SQL.
+    """
+    valid = Grade.max_score > 0
+    weighted = and_(valid, Grade.weight > 0)
+    unweighted = and_(valid, Grade.weight <= 0)
+    percentage = Grade.score * 100.0 / Grade.max_score
+    return [
+        func.coalesce(func.sum(case((valid, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((weighted, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((weighted, Grade.weight), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((weighted, Grade.weight * percentage), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((unweighted, percentage), else_=0.0)), 0.0),
+    ]
+
+
+def _recompute_query():
+    """Summary sums of every enrollment with grades, recomputed from the grades table."""
+    return (
+        select(Grade.enrollment_id, *grade_sum_columns(), func.max(Grade.grade_date))
+        .group_by(Grade.enrollment_id)
+    )
+
+
+def _recomputed_summaries(db: Session) -> Dict[str, Dict[str, Any]]:
+    summaries = {}
+    for row in db.exec(_recompute_query()).all():
+        values = dict(zip(SUM_FIELDS, row[1:6]))
+        values["weighted_average"] = summary_average(values)
+        values["latest_grade_date"] = row[6]
+        summaries[row[0]] = values
+    return summaries
+
+
+def rebuild_grade_summaries(db: Session) -> int:
+    """
+    Replace every summary row with a recompute from the grades table in one
+    transaction. Used to backfill existing data and to repair drift.
+    Returns the number of summaries written.
+    """
+    summaries = _recomputed_summaries(db)
+    now = datetime.utcnow()
+    db.execute(delete(EnrollmentGradeSummary))
+    if summaries:
+        db.execute(insert(EnrollmentGradeSummary), [
+            {"id": str(uuid.uuid4()), "enrollment_id": enrollment_id,
+             "created_at": now, "updated_at": now, **values}
+            for enrollment_id, values in summaries.items()
+        ])
+    db.commit()
+    return len(summaries)
+
+
+def _differs(stored: Any, expected: Any) -> bool:
+    if stored is None or expected is None:
+        return stored != expected
+    if isinstance(expected, float) or isinstance(stored, float):
+        return not math.isclose(stored, expected, rel_tol=TOLERANCE, abs_tol=TOLERANCE)
+    return stored != expected
+
+
+def check_grade_summaries(db: Session) -> List[Dict[str, Any]]:
+    """
+    Compare every summary row against a recompute from the grades table.
+    Returns one entry per mismatching field; an empty list means consistent.
+    """
+    expected_by_id = _recomputed_summaries(db)
+    stored_by_id = {
+        summary.enrollment_id: summary
+        for summary in db.exec(select(EnrollmentGradeSummary)).all()
+    }
+    empty = dict.fromkeys(SUM_FIELDS, 0)
+    empty.update(latest_grade_date=None, weighted_average=None)
+
+    mismatches = []
+    enrollment_ids: Set[str] = set(expected_by_id) | set(stored_by_id)
+    for enrollment_id in sorted(enrollment_ids):
+        expected = expected_by_id.get(enrollment_id, empty)
+        stored = stored_by_id.get(enrollment_id)
+        for field, value in expected.items():
+            stored_value = getattr(stored, field) if stored is not None else empty[field]
+            if _differs(stored_value, value):
+                mismatches.append({
+                    "enrollment_id": enrollment_id,
+                    "field": field,
+                    "stored": stored_value,
+                    "expected": value,
+                })
+    return mismatches
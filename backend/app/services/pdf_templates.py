@@ -0,0 +1,288 @@
+from typing import Any, Callable, Dict, List, Sequence, Union, BinaryIO
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from ..config import settings
+
+MARGIN = 72
+# Room above and below the body for the header and footer drawn on every page
+TOP_MARGIN = 100
+BOTTOM_MARGIN = 72
+BODY_FONT = "Helvetica"
+BOLD_FONT = "Helvetica-Bold"
+
+_FOOTER_RULE_Y = 54
+_FOOTER_Y = 42
+
+# Write page streams as plain binary. The base85 filter is pure Python here,
+# costs about a tenth of the render time and makes files larger
+rl_config.useA85 = 0
+
+_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), BOLD_FONT),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+]
+# Tables whose last row is a total or average
+_SUMMARY_TABLE_COMMANDS = _TABLE_COMMANDS + [
+    ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
+]
+
+
+def _text(value: Any) -> str:
+    """Report data as Paragraph markup."""
+    return escape(str(value))
+
+
+def _grade(value: Any) -> str:
+    return "Not graded" if value is None else f"{value:.1f}"
+
+
+class PdfTemplate:
+    """
+    A PDF layout whose styles, table styles and static page elements are
+    built once, when the template is created, and reused by every document
+    rendered with it. Use ``get_template`` to get the instance of the
+    current process. Subclasses set ``title`` and build the body in
+    ``story``.
+    """
+
+    title = ""
+    page_size = letter
+
+    def __init__(self):
+        width, height = self.page_size
+        self.frame_width = width - 2 * MARGIN
+        self._right = width - MARGIN
+        self._header_y = height - 40
+        self._title_y = height - 62
+        self._header_rule_y = height - 74
+        sample = getSampleStyleSheet()
+        self.styles = {
+            "heading": sample["Heading2"],
+            "normal": sample["Normal"],
+        }
+        self.table_style = TableStyle(_TABLE_COMMANDS)
+        self.summary_table_style = TableStyle(_SUMMARY_TABLE_COMMANDS)
+        self.text_column_styles = {
+            columns: TableStyle([('ALIGN', (0, 1), (columns - 1, -1), 'LEFT')]) for columns in (1, 2)
+        }
+        # Load the font metrics now instead of during the first document
+        for font in (BODY_FONT, BOLD_FONT):
+            pdfmetrics.getFont(font)
+
+    def story(self, data: Dict[str, Any]) -> List[Flowable]:
+        raise NotImplementedError
+
+    def table(self, rows: Sequence[Sequence[Any]], col_widths: Sequence[float],
+              summary: bool = False, text_columns: int = 0) -> Table:
+        """
+        A table with the shared style; the header row repeats on every page.
+        The first ``text_columns`` columns are left aligned, which also
+        spares measuring every cell to centre it.
+        """
+        table = Table(
+            rows,
+            colWidths=col_widths,
+            repeatRows=1,
+            style=self.summary_table_style if summary else self.table_style,
+        )
+        if text_columns:
+            table.setStyle(self.text_column_styles[text_columns])
+        return table
+
+    def _decorate(self, canvas: Canvas, page: int, generated: str) -> None:
+        canvas.saveState()
+        canvas.setFillColor(colors.grey)
+        canvas.setFont(BODY_FONT, 9)
+        canvas.drawString(MARGIN, self._header_y, settings.APP_NAME)
+        canvas.setFillColor(colors.black)
+        canvas.setFont(BOLD_FONT, 18)
+        canvas.drawString(MARGIN, self._title_y, self.title)
+        canvas.setStrokeColor(colors.grey)
+        canvas.line(MARGIN, self._header_rule_y, self._right, self._header_rule_y)
+        canvas.line(MARGIN, _FOOTER_RULE_Y, self._right, _FOOTER_RULE_Y)
+        canvas.setFillColor(colors.grey)
+        canvas.setFont(BODY_FONT, 8)
+        canvas.drawString(MARGIN, _FOOTER_Y, generated)
+        canvas.drawRightString(self._right, _FOOTER_Y, f"Page {page}")
+        canvas.restoreState()
+
+    def render(self, data: Dict[str, Any], output: Union[str, BinaryIO]) -> int:
+        """Render one document to a path or binary file. Returns its page count."""
+        generated = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+        def decorate(canvas, doc):
+            self._decorate(canvas, doc.page, generated)
+
+        doc = SimpleDocTemplate(
+            output,
+            pagesize=self.page_size,
+            rightMargin=MARGIN,
+            leftMargin=MARGIN,
+            topMargin=TOP_MARGIN,
+            bottomMargin=BOTTOM_MARGIN,
+            title=self.title,
+        )
+        doc.build(self.story(data), onFirstPage=decorate, onLaterPages=decorate)
+        return doc.page
+
+    def render_bytes(self, data: Dict[str, Any]) -> bytes:
+        """Render one document into memory."""
+        buffer = BytesIO()
+        self.render(data, buffer)
+        return buffer.getvalue()
+
+
+class StudentTemplate(PdfTemplate):
+    """Layouts of one student's grades report."""
+
+    def student_header(self, report: Dict[str, Any]) -> List[Flowable]:
+        styles = self.styles
+        return [
+            Paragraph(f"Student: {_text(report['student_name'])}", styles["heading"]),
+            Paragraph(f"ID: {_text(report['student_id'])}", styles["normal"]),
+            Paragraph(f"Grade Level: {_text(report['grade_level'])}", styles["normal"]),
+            Paragraph(f"Enrollment Date: {_text(report['enrollment_date'])}", styles["normal"]),
+            Spacer(1, 20),
+        ]
+
+    def no_courses(self) -> Paragraph:
+        return Paragraph("No course records found for this student.", self.styles["normal"])
+
+
+class TranscriptTemplate(StudentTemplate):
+    """Every course of a student with the credit-hour weighted average."""
+
+    title = "Academic Transcript"
+    col_widths = [90, 220, 60, 90]
+
+    def story(self, report: Dict[str, Any]) -> List[Flowable]:
+        content = self.student_header(report)
+        if not report["grades"]:
+            content.append(self.no_courses())
+            return content
+
+        rows = [["Course Code", "Course Name", "Credits", "Grade"]]
+        for course in report["grades"]:
+            rows.append([course["course_code"], course["course_name"], course["credit_hours"], _grade(course["grade"])])
+
+        graded = [course for course in report["grades"] if course["grade"] is not None]
+        credits = sum(course["credit_hours"] for course in graded)
+        if credits:
+            average = sum(course["grade"] * course["credit_hours"] for course in graded) / credits
+            rows.append(["", "Weighted Average", credits, f"{average:.1f}"])
+        content.append(self.table(rows, self.col_widths, summary=bool(credits), text_columns=2))
+        return content
+
+
+class ReportCardTemplate(StudentTemplate):
+    """A student's current courses with letter grades, status and GPA."""
+
+    title = "Report Card"
+    col_widths = [75, 165, 50, 55, 50, 65]
+
+    def story(self, report: Dict[str, Any]) -> List[Flowable]:
+        content = self.student_header(report)
+        if report["grades"]:
+            rows = [["Course Code", "Course Name", "Credits", "Grade", "Letter", "Status"]]
+            for course in report["grades"]:
+                rows.append([
+                    course["course_code"], course["course_name"], course["credit_hours"],
+                    _grade(course["grade"]), course["letter_grade"] or "-", getattr(course["status"], "value", course["status"]),
+                ])
+            content.append(self.table(rows, self.col_widths, text_columns=2))
+        else:
+            content.append(self.no_courses())
+
+        gpa = report.get("gpa")
+        if gpa and gpa["cumulative_gpa"] is not None:
+            content.append(Spacer(1, 20))
+            standing = f" ({_text(gpa['standing'])})" if gpa.get("standing") else ""
+            content.append(Paragraph(
+                f"Cumulative GPA: {gpa['cumulative_gpa']:.2f} over {gpa['credit_hours']} credit hours{standing}",
+                self.styles["heading"],
+            ))
+            terms = [term for term in gpa["terms"] if term["gpa"] is not None]
+            if terms:
+                rows = [["Term", "GPA", "Credits"]]
+                rows.extend([term["term"], f"{term['gpa']:.2f}", term["credit_hours"]] for term in terms)
+                content.append(self.table(rows, [150, 80, 80], text_columns=1))
+        return content
+
+
+class RosterTemplate(PdfTemplate):
+    """
+    The students of a course with one column per assessment. Landscape and
+    in a smaller type so a term's assessments fit across the page.
+    """
+
+    title = "Class Roster"
+    page_size = landscape(letter)
+    # Student, status, final and letter columns; assessments share the rest
+    fixed_widths = (130, 55, 45, 35)
+
+    def __init__(self):
+        super().__init__()
+        self.roster_style = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), 7),
+            ('LEADING', (0, 0), (-1, -1), 8),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+
+    def story(self, roster: Dict[str, Any]) -> List[Flowable]:
+        content = [
+            Paragraph(f"{_text(roster['course_code'])} - {_text(roster['course_name'])}", self.styles["heading"]),
+            Paragraph(f"Enrolled students: {len(roster['students'])}", self.styles["normal"]),
+            Spacer(1, 20),
+        ]
+        if not roster["students"]:
+            content.append(Paragraph("No students are enrolled in this course.", self.styles["normal"]))
+            return content
+
+        assessments = roster["assessments"]
+        name_width, status_width, final_width, letter_width = self.fixed_widths
+        assessment_width = (self.frame_width - sum(self.fixed_widths)) / max(len(assessments), 1)
+        # Break "Exam 2025-02-01" after the type so narrow columns stay readable
+        rows = [["Student", "Status", *(label.replace(" ", "\n", 1) for label in assessments), "Final", "Letter"]]
+        for student in roster["students"]:
+            rows.append([
+                student["student_name"], student["status"],
+                *("-" if score is None else f"{score:.1f}" for score in student["scores"]),
+                "-" if student["final_grade"] is None else f"{student['final_grade']:.1f}",
+                student["letter_grade"] or "-",
+            ])
+        table = self.table(
+            rows,
+            [name_width, status_width, *([assessment_width] * len(assessments)), final_width, letter_width],
+            text_columns=1,
+        )
+        table.setStyle(self.roster_style)
+        content.append(table)
+        return content
+
+
+TEMPLATES: Dict[str, Callable[[], PdfTemplate]] = {
+    "transcript": TranscriptTemplate,
+    "report_card": ReportCardTemplate,
+    "roster": RosterTemplate,
+}
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> PdfTemplate:
+    """The template of a layout, built on first use in each process."""
+    return TEMPLATES[name]()
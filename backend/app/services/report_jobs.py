@@ -0,0 +1,193 @@
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+from sqlalchemy import func, update
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from datetime import datetime, timedelta
+import multiprocessing
+import threading
+import time
+
+from ..config import settings
+from ..database.locks import background_leader
+from ..database.session import engine
+from ..models.user import User
+from ..models.report_job import ReportJob, ReportJobCreate, ReportJobStatus, ReportType
+from .report_service import ReportService
+from .transcript_batch import build_transcript_archive
+from ..utils.logger import app_logger
+
+PDF_MEDIA_TYPE = "application/pdf"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MEDIA_TYPE = "application/zip"
+
+PENDING_STATUSES = (ReportJobStatus.QUEUED, ReportJobStatus.PROCESSING)
+
+
+def submit_report_job(db: Session, job_in: ReportJobCreate, current_user: User) -> ReportJob:
+    """Persist a report job and hand it to the render pool."""
+    pending = db.exec(
+        select(func.count(ReportJob.id)).where(ReportJob.status.in_(PENDING_STATUSES))
+    ).one()
+    if pending >= settings.REPORT_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Report queue is full, try again later"
+        )
+
+    job = ReportJob(**job_in.dict(), requested_by=current_user.id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    report_job_runner.submit(job.id)
+    return job
+
+
+def _claim_job(db: Session, job_id: str) -> bool:
+    """Move a queued job to processing; False if another worker already took it."""
+    result = db.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id, ReportJob.status == ReportJobStatus.QUEUED)
+        .values(status=ReportJobStatus.PROCESSING, started_at=datetime.utcnow(), updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _record_progress(db: Session, job_id: str, processed: int, total: int, rate: float) -> None:
+    db.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id)
+        .values(processed_items=processed, total_items=total, items_per_second=round(rate, 2),
+                updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _render(db: Session, job: ReportJob) -> tuple:
+    if job.report_type == ReportType.TRANSCRIPT:
+        path = ReportService(db).generate_student_transcript_pdf(job.student_id)
+        if not path:
+            raise ValueError("Student not found")
+        return path, PDF_MEDIA_TYPE
+    if job.report_type == ReportType.BATCH_TRANSCRIPTS:
+        job_id = job.id
+        path, _ = build_transcript_archive(
+            db, job.grade_level,
+            on_progress=lambda processed, total, rate: _record_progress(db, job_id, processed, total, rate)
+        )
+        return path, ZIP_MEDIA_TYPE
+    return ReportService(db).export_all_students_to_excel(), XLSX_MEDIA_TYPE
+
+
+def render_report_job(job_id: str) -> None:
+    """
+    Render one report job. Runs inside a render pool process with its own
+    database connections; the outcome is written back to the job row.
+    """
+    with Session(engine) as db:
+        if not _claim_job(db, job_id):
+            return
+        job = db.get(ReportJob, job_id)
+        started = time.perf_counter()
+        try:
+            file_path, media_type = _render(db, job)
+            outcome = {"status": ReportJobStatus.COMPLETED, "file_path": file_path, "media_type": media_type}
+            # Keeps the report store entries and ends the read transaction
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            app_logger.error(f"Report job {job_id} failed: {exc}")
+            outcome = {"status": ReportJobStatus.FAILED, "detail": str(exc)[:500]}
+
+        now = datetime.utcnow()
+        db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id)
+            .values(finished_at=now, updated_at=now,
+                    duration_seconds=round(time.perf_counter() - started, 3), **outcome)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def _init_render_process() -> None:
+    # Connections inherited from the parent must not be shared with it
+    engine.dispose()
+
+
+def _log_render_error(job_id: str, future) -> None:
+    # Errors writing the job row itself are only visible through the future
+    if not future.cancelled() and future.exception() is not None:
+        app_logger.error(f"Report job {job_id} crashed: {future.exception()}")
+
+
+def requeue_stale_jobs(db: Session, older_than: timedelta) -> int:
+    """Put back jobs left in processing by a render process that died."""
+    result = db.execute(
+        update(ReportJob)
+        .where(
+            ReportJob.status == ReportJobStatus.PROCESSING,
+            ReportJob.updated_at < datetime.utcnow() - older_than
+        )
+        .values(status=ReportJobStatus.QUEUED)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+class ReportJobRunner:
+    """
+    Bounded pool of render processes, kept apart from the API workers so
+    slow PDF and spreadsheet builds cannot starve request handling. The
+    pool is created on first use.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_render_process,
+                )
+            return self._executor
+
+    def submit(self, job_id: str) -> None:
+        future = self._pool().submit(render_report_job, job_id)
+        future.add_done_callback(lambda done: _log_render_error(job_id, done))
+
+    def start(self) -> None:
+        """
+        Requeue abandoned jobs and resubmit everything still queued. Only
+        the background leader does this, so each job is resubmitted once
+        rather than by every API worker.
+        """
+        if not background_leader.acquire():
+            return
+        with Session(engine) as db:
+            requeued = requeue_stale_jobs(db, timedelta(seconds=settings.REPORT_JOB_STALE_SECONDS))
+            queued = db.exec(
+                select(ReportJob.id).where(ReportJob.status == ReportJobStatus.QUEUED).order_by(ReportJob.created_at)
+            ).all()
+        if requeued:
+            app_logger.warning(f"Requeued {requeued} stale report jobs")
+        for job_id in queued:
+            self.submit(job_id)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+report_job_runner = ReportJobRunner(workers=settings.REPORT_WORKERS)
@@ -1,78 +1,224 @@
 from sqlmodel import Session, select
-from typing import List, Dict, Any, Optional
+from sqlalchemy import func
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union, BinaryIO
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from pathlib import Path
+from contextlib import contextmanager
+from io import BytesIO
 import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from openpyxl import Workbook
 
+from ..config import ReportBackend, settings
 from ..models.student import Student
 from ..models.user import User
 from ..models.enrollment import Enrollment
 from ..models.course import Course
 from ..models.grade import Grade
+from .grade_engine import GRADE_COLUMNS, compute_final_grades, letter_grades
+from .grade_summary import SUM_FIELDS, grade_sum_columns, summary_average
+from .gpa_service import get_student_gpas
+from .pdf_templates import get_template
+from .report_snapshot import ReportSnapshot, report_snapshot
+from .report_store import REPORTS_DIR, lookup_report_file, register_report_file
+from .transcript_cache import store_transcript, transcript_cache_key, transcript_path
+from ..models.report_job import ReportType
 from ..utils.logger import app_logger
 
-# Create reports directory
-REPORTS_DIR = Path(__file__).parent.parent.parent / "reports"
-REPORTS_DIR.mkdir(exist_ok=True)
+STUDENT_EXPORT_COLUMNS = [
+    "student_id", "user_id", "first_name", "last_name", "email",
+    "grade_level", "enrollment_date", "parent_name", "parent_email",
+]
+
+# Columns of the joined course roster query
+ROSTER_QUERY_COLUMNS = [
+    "enrollment_id", "status", "enrollment_date", "student_id", "grade_level",
+    "first_name", "last_name", "email", "grade_type", "grade_date", "score", "max_score", "weight",
+]
+
+# Bump whenever render_transcript_pdf output changes so cached transcripts are re-rendered
+TRANSCRIPT_TEMPLATE_VERSION = "2"
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _pivot_assessments(grades: pd.DataFrame) -> pd.DataFrame:
+    """
+    Percentages of the grades as a table with one row per enrollment and
+    one column per assessment, labelled "<Type> <date>" and ordered by date.
+    A second grade of the same type and date in one enrollment gets its
+    own "#2" column.
+    """
+    label = grades["grade_type"].map(_enum_value).str.title() + " " + grades["grade_date"].astype(str)
+    occurrence = grades.groupby([grades["enrollment_id"], label]).cumcount()
+    label = label.where(occurrence == 0, label + " #" + (occurrence + 1).astype(str))
+
+    score = grades["score"].to_numpy(dtype=float)
+    max_score = grades["max_score"].to_numpy(dtype=float)
+    percentage = np.divide(score, max_score, out=np.full_like(score, np.nan), where=max_score > 0) * 100
+
+    cells = pd.DataFrame({
+        "enrollment_id": grades["enrollment_id"].to_numpy(),
+        "assessment": label.to_numpy(),
+        "grade_date": grades["grade_date"].to_numpy(),
+        "occurrence": occurrence.to_numpy(),
+        "percentage": np.round(percentage, 2),
+    })
+    order = cells.drop_duplicates("assessment").sort_values(["grade_date", "occurrence", "assessment"])["assessment"]
+    return cells.pivot(index="enrollment_id", columns="assessment", values="percentage").reindex(columns=order)
+
+
+def course_roster_table(roster: Dict[str, Any]) -> Tuple[List[str], List[list]]:
+    """Header and rows of a course roster for tabular exports."""
+    columns = [
+        "student_id", "student_name", "email", "grade_level", "status", "enrollment_date",
+        *roster["assessments"], "final_grade", "letter_grade",
+    ]
+    rows = [
+        [
+            student["student_id"], student["student_name"], student["email"], student["grade_level"],
+            student["status"], student["enrollment_date"], *student["scores"],
+            student["final_grade"], student["letter_grade"],
+        ]
+        for student in roster["students"]
+    ]
+    return columns, rows
+
+
+def render_transcript_pdf(student_data: Dict[str, Any], output: Union[str, BinaryIO]) -> int:
+    """
+    Render a transcript PDF from a grades report to a path or binary file.
+    Takes only plain report data so it can run in a worker process.
+    Returns the page count.
+    """
+    return get_template("transcript").render(student_data, output)
+
 
 class ReportService:
-    """Service for generating various reports related to students and courses."""
+    """
+    Service for generating various reports related to students and courses.
+    Reports about one student always read the primary database; set-based
+    reports (a grade level's grades, course rosters, the students export)
+    read from ``backend``, which defaults to ``REPORT_BACKEND``.
+    """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, backend: Optional[ReportBackend] = None,
+                 snapshot: Optional[ReportSnapshot] = None):
         self.db = db
+        self.backend = ReportBackend(backend or settings.REPORT_BACKEND)
+        self.snapshot = snapshot or report_snapshot
+    
+    @contextmanager
+    def _reader(self) -> Iterator[Session]:
+        """
+        The session set-based reports read: the snapshot with the snapshot
+        backend, the primary until the snapshot has been refreshed once.
+        """
+        if self.backend == ReportBackend.SNAPSHOT:
+            if self.snapshot.refreshed_at() is not None:
+                with self.snapshot.session() as session:
+                    yield session
+                return
+            app_logger.warning("Report snapshot has not been refreshed yet; reading the primary database")
+        yield self.db
     
-    def get_student_grades(self, student_id: int) -> Dict[str, Any]:
-        """Get all grades for a specific student with course information."""
-        # Get student
-        student = self.db.get(Student, student_id)
-        if not student:
+    def get_student_grades(self, student_id: str) -> Dict[str, Any]:
+        """
+        Get a student's courses with their weighted grade aggregates. Grades
+        are aggregated in the database by one grouped query, so the result
+        has one row per enrollment however many grades each course has.
+        """
+        reports = self._students_grades(self.db, [student_id], None)
+        if student_id not in reports:
             app_logger.warning(f"Student with ID {student_id} not found")
             return {"error": "Student not found"}
         
-        # Get student user info
-        user = self.db.get(User, student.user_id)
+        app_logger.info(f"Generated grades report for student {student_id}")
+        return reports[student_id]
+    
+    def get_students_grades(self, student_ids: Optional[List[str]] = None,
+                            grade_level: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Grades reports of many students keyed by student id, built from one
+        grouped query however many students are requested. Filter by ids,
+        by grade level or both.
+        """
+        with self._reader() as db:
+            return self._students_grades(db, student_ids, grade_level)
+    
+    def _students_grades(self, db: Session, student_ids: Optional[List[str]],
+                         grade_level: Optional[int]) -> Dict[str, Dict[str, Any]]:
+        def scoped(query):
+            if student_ids is not None:
+                query = query.where(Student.id.in_(student_ids))
+            if grade_level is not None:
+                query = query.where(Student.grade_level == grade_level)
+            return query
         
-        # Get enrollments for student
+        # One row per enrollment with its grade sums, or one row for a student without enrollments
         query = (
-            select(Enrollment, Course, Grade)
-            .join(Course, Enrollment.course_id == Course.id)
-            .outerjoin(Grade, (Grade.enrollment_id == Enrollment.id))
-            .where(Enrollment.student_id == student_id)
+            select(
+                Student.id, User.first_name, User.last_name, Student.grade_level, Student.enrollment_date,
+                Enrollment.id, Enrollment.enrollment_date, Enrollment.status,
+                Course.id, Course.name, Course.code, Course.credit_hours,
+                *grade_sum_columns(),
+                func.max(Grade.grade_date),
+            )
+            .join(User, Student.user_id == User.id)
+            .outerjoin(Enrollment, Enrollment.student_id == Student.id)
+            .outerjoin(Course, Enrollment.course_id == Course.id)
+            .outerjoin(Grade, Grade.enrollment_id == Enrollment.id)
+            .group_by(
+                Student.id, User.first_name, User.last_name, Student.grade_level, Student.enrollment_date,
+                Enrollment.id, Enrollment.enrollment_date, Enrollment.status,
+                Course.id, Course.name, Course.code, Course.credit_hours,
+            )
+            .order_by(User.last_name, User.first_name, Student.id, Course.code)
         )
-        results = self.db.exec(query).all()
+        results = db.exec(scoped(query)).all()
         
-        grades_data = []
-        for enrollment, course, grade in results:
-            grade_value = grade.grade_value if grade else None
-            
-            grades_data.append({
-                "course_id": course.id,
-                "course_name": course.name,
-                "course_code": course.code,
-                "enrollment_date": enrollment.enrollment_date,
-                "grade": grade_value,
-                "grade_date": grade.grade_date if grade else None,
+        generated_at = datetime.now().isoformat()
+        reports = {}
+        averages = [summary_average(dict(zip(SUM_FIELDS, row[12:17]))) for row in results]
+        letters = letter_grades([np.nan if average is None else average for average in averages])
+        for row, average, letter in zip(results, averages, letters):
+            (student_id, first_name, last_name, student_grade_level, student_enrollment_date,
+             enrollment_id, enrollment_date, enrollment_status,
+             course_id, course_name, course_code, credit_hours) = row[:12]
+            report = reports.get(student_id)
+            if report is None:
+                report = reports[student_id] = {
+                    "student_id": student_id,
+                    "student_name": f"{first_name} {last_name}",
+                    "grade_level": student_grade_level,
+                    "enrollment_date": student_enrollment_date,
+                    "grades": [],
+                    "generated_at": generated_at,
+                }
+            if enrollment_id is None:
+                continue
+            report["grades"].append({
+                "enrollment_id": enrollment_id,
+                "course_id": course_id,
+                "course_name": course_name,
+                "course_code": course_code,
+                "credit_hours": credit_hours,
+                "enrollment_date": enrollment_date,
+                "status": enrollment_status,
+                "grade": round(average, 2) if average is not None else None,
+                "letter_grade": letter,
+                "grade_count": row[12],
+                "grade_date": row[17],
             })
-        
-        report_data = {
-            "student_id": student_id,
-            "student_name": f"{user.first_name} {user.last_name}",
-            "grade_level": student.grade_level,
-            "enrollment_date": student.enrollment_date,
-            "grades": grades_data,
-            "generated_at": datetime.now().isoformat(),
-        }
-        
-        app_logger.info(f"Generated grades report for student {student_id}")
-        return report_data
+        return reports
     
-    def generate_student_transcript_pdf(self, student_id: int) -> str:
-        """Generate a PDF transcript for a student."""
+    def generate_student_transcript_pdf(self, student_id: str) -> str:
+        """
+        Generate a PDF transcript for a student. The file is registered in
+        the report store; the caller commits.
+        """
         # Get student data
         student_data = self.get_student_grades(student_id)
         
@@ -80,119 +226,138 @@ class ReportService:
             app_logger.error(f"Failed to generate transcript for student {student_id}: {student_data['error']}")
             return None
         
-        # Create PDF file
-        filename = f"student_{student_id}_transcript_{datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
-        pdf_path = REPORTS_DIR / filename
+        # Identical data and template give the same file; reuse it if rendered before
+        key = transcript_cache_key(student_data, TRANSCRIPT_TEMPLATE_VERSION)
+        cached = lookup_report_file(self.db, transcript_path(key))
+        if cached:
+            app_logger.info(f"Reused cached PDF transcript for student {student_id} at {cached}")
+            return str(cached)
         
-        # Create the PDF
-        doc = SimpleDocTemplate(
-            str(pdf_path),
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
+        buffer = BytesIO()
+        render_transcript_pdf(student_data, buffer)
+        pdf_path = store_transcript(key, buffer.getvalue())
+        register_report_file(self.db, pdf_path, ReportType.TRANSCRIPT)
         
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = styles["Heading1"]
-        subtitle_style = styles["Heading2"]
-        normal_style = styles["Normal"]
+        app_logger.info(f"Generated PDF transcript for student {student_id} at {pdf_path}")
+        return str(pdf_path)
+    
+    def generate_report_card_pdf(self, student_id: str) -> Optional[bytes]:
+        """
+        Render a student's report card, with grades, letters and GPA, in
+        memory. Returns None if the student does not exist.
+        """
+        student_data = self.get_student_grades(student_id)
         
-        # Build the PDF content
-        content = []
+        if "error" in student_data:
+            app_logger.error(f"Failed to generate report card for student {student_id}: {student_data['error']}")
+            return None
         
-        # Title
-        content.append(Paragraph(f"Academic Transcript", title_style))
-        content.append(Spacer(1, 20))
+        student_data["gpa"] = get_student_gpas(self.db, [student_id])[student_id]
+        content = get_template("report_card").render_bytes(student_data)
         
-        # Student Info
-        content.append(Paragraph(f"Student: {student_data['student_name']}", subtitle_style))
-        content.append(Paragraph(f"ID: {student_data['student_id']}", normal_style))
-        content.append(Paragraph(f"Grade Level: {student_data['grade_level']}", normal_style))
-        content.append(Paragraph(f"Enrollment Date: {student_data['enrollment_date']}", normal_style))
-        content.append(Spacer(1, 20))
+        app_logger.info(f"Generated PDF report card for student {student_id}")
+        return content
+    
+    def get_course_roster(self, course: Course) -> Dict[str, Any]:
+        """
+        Every student enrolled in a course with their status, one percentage
+        per assessment and the final grade. Students, users, enrollments and
+        grades come from one joined query; assessments are pivoted into
+        columns and final grades computed in vectorized steps.
+        """
+        with self._reader() as db:
+            records = db.exec(
+                select(
+                    Enrollment.id, Enrollment.status, Enrollment.enrollment_date,
+                    Student.id, Student.grade_level, User.first_name, User.last_name, User.email,
+                    Grade.grade_type, Grade.grade_date, Grade.score, Grade.max_score, Grade.weight,
+                )
+                .join(Student, Enrollment.student_id == Student.id)
+                .join(User, Student.user_id == User.id)
+                .outerjoin(Grade, Grade.enrollment_id == Enrollment.id)
+                .where(Enrollment.course_id == course.id)
+                .order_by(User.last_name, User.first_name, Enrollment.id)
+            ).all()
+        frame = pd.DataFrame.from_records(records, columns=ROSTER_QUERY_COLUMNS)
         
-        # Grades Table
-        if student_data['grades']:
-            # Table header
-            table_data = [["Course Code", "Course Name", "Grade"]]
-            
-            # Table data
-            for course in student_data['grades']:
-                grade = course['grade'] if course['grade'] else "Not graded"
-                table_data.append([
-                    course['course_code'],
-                    course['course_name'],
-                    grade
-                ])
-            
-            # Calculate GPA if grades are available
-            graded_courses = [c for c in student_data['grades'] if c['grade'] is not None]
-            if graded_courses:
-                avg_grade = sum(c['grade'] for c in graded_courses) / len(graded_courses)
-                table_data.append(["", "Average Grade", f"{avg_grade:.1f}"])
-            
-            # Create table
-            table = Table(table_data, colWidths=[100, 250, 100])
-            
-            # Style the table
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            
-            content.append(table)
+        # One row per enrollment, in name order; grades are the rows with a score
+        enrollments = frame.drop_duplicates("enrollment_id")
+        grades = frame[frame["score"].notna()]
+        enrollment_ids = enrollments["enrollment_id"].to_numpy()
+        if grades.empty:
+            scores = pd.DataFrame(index=enrollment_ids)
         else:
-            content.append(Paragraph("No course records found for this student.", normal_style))
+            scores = _pivot_assessments(grades).reindex(index=enrollment_ids)
+        finals = compute_final_grades(grades[GRADE_COLUMNS]).reindex(enrollment_ids)
         
-        # Footer
-        content.append(Spacer(1, 30))
-        content.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
-        
-        # Build and save the PDF
-        doc.build(content)
+        students = []
+        for row, score_row, final, letter in zip(
+            enrollments.itertuples(index=False),
+            scores.to_numpy(dtype=float),
+            finals["final_percentage"].to_numpy(dtype=float),
+            finals["letter_grade"],
+        ):
+            students.append({
+                "enrollment_id": row.enrollment_id,
+                "student_id": row.student_id,
+                "student_name": f"{row.first_name} {row.last_name}",
+                "email": row.email,
+                "grade_level": row.grade_level,
+                "status": _enum_value(row.status),
+                "enrollment_date": row.enrollment_date,
+                "scores": [None if np.isnan(score) else float(score) for score in score_row],
+                "final_grade": None if np.isnan(final) else float(final),
+                "letter_grade": letter if isinstance(letter, str) else None,
+            })
         
-        app_logger.info(f"Generated PDF transcript for student {student_id} at {pdf_path}")
-        return str(pdf_path)
+        app_logger.info(f"Generated roster for course {course.id} with {len(students)} students")
+        return {
+            "course_id": course.id,
+            "course_code": course.code,
+            "course_name": course.name,
+            "assessments": [str(label) for label in scores.columns],
+            "students": students,
+            "generated_at": datetime.now(),
+        }
     
-    def export_all_students_to_excel(self) -> str:
-        """Export all students' information to an Excel file."""
-        # Query student data with users
+    def iter_students_export(self) -> Iterator[List[tuple]]:
+        """
+        Rows of the all-students export in ``STUDENT_EXPORT_COLUMNS`` order,
+        in batches of ``REPORT_EXPORT_BATCH_SIZE``. Plain column tuples are
+        streamed from a server-side cursor, so memory stays flat however
+        many students there are.
+        """
         query = (
-            select(Student, User)
+            select(
+                Student.id, User.id, User.first_name, User.last_name, User.email,
+                Student.grade_level, Student.enrollment_date, Student.parent_name, Student.parent_email,
+            )
             .join(User, Student.user_id == User.id)
+            .execution_options(stream_results=True, yield_per=settings.REPORT_EXPORT_BATCH_SIZE)
         )
-        results = self.db.exec(query).all()
-        
-        # Convert to DataFrame
-        students_data = []
-        for student, user in results:
-            students_data.append({
-                "student_id": student.id,
-                "user_id": user.id,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "email": user.email,
-                "grade_level": student.grade_level,
-                "enrollment_date": student.enrollment_date,
-                "parent_name": student.parent_name,
-                "parent_email": student.parent_email,
-            })
-        
-        df = pd.DataFrame(students_data)
-        
-        # Save to Excel
+        with self._reader() as db:
+            for batch in db.execute(query).partitions():
+                yield [tuple(row) for row in batch]
+    
+    def export_all_students_to_excel(self) -> str:
+        """
+        Export all students' information to an Excel file. Rows are streamed
+        from the database into a write-only workbook batch by batch. The file
+        is registered in the report store; the caller commits.
+        """
         filename = f"all_students_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
         excel_path = REPORTS_DIR / filename
         
-        df.to_excel(str(excel_path), index=False, sheet_name="Students")
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Students")
+        sheet.append(STUDENT_EXPORT_COLUMNS)
+        rows = 0
+        for batch in self.iter_students_export():
+            for row in batch:
+                sheet.append(row)
+            rows += len(batch)
+        workbook.save(str(excel_path))
+        register_report_file(self.db, excel_path, ReportType.STUDENTS_EXPORT)
         
-        app_logger.info(f"Exported all students data to Excel: {excel_path}")
+        app_logger.info(f"Exported {rows} students to Excel: {excel_path}")
         return str(excel_path)
@@ -0,0 +1,278 @@
+from sqlmodel import Session
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, create_engine, delete, event, func, inspect, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection, Engine
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import threading
+import time
+
+from ..config import settings
+from ..database.locks import LeaderLock
+from ..database.session import engine
+from ..models.user import User
+from ..models.student import Student
+from ..models.course import Course
+from ..models.enrollment import Enrollment
+from ..models.grade import Grade
+from ..utils.logger import app_logger
+
+SNAPSHOT_PATH = Path(settings.REPORT_SNAPSHOT_PATH or Path(__file__).parent.parent.parent / "snapshots" / "reporting.db")
+
+# Rows updated up to this long before the previous refresh's newest row are
+# read again, so a transaction that was still open during that refresh is
+# picked up by the next one
+WATERMARK_OVERLAP = timedelta(minutes=5)
+DELETE_BATCH_SIZE = 500
+
+
+_metadata = MetaData()
+
+
+# The columns set-based reports read from each table, parents before
+# children. Every copy also keeps ``id`` and ``updated_at``; everything else,
+# such as password hashes, stays on the primary.
+SNAPSHOT_COLUMNS: Dict[Any, Tuple[str, ...]] = {
+    User: ("first_name", "last_name", "email"),
+    Student: ("user_id", "grade_level", "enrollment_date", "parent_name", "parent_email"),
+    Course: ("name", "code", "credit_hours"),
+    Enrollment: ("student_id", "course_id", "enrollment_date", "status"),
+    Grade: ("enrollment_id", "grade_type", "grade_date", "score", "max_score", "weight"),
+}
+
+
+def _copy_table(table: Table, names: Tuple[str, ...]) -> Table:
+    """
+    The snapshot version of a table: the named columns and the primary key,
+    with plain indexes on the columns reports filter and join on. Unique
+    and foreign key constraints are left out; the primary enforces them and
+    rows arrive here in batches, not in the order they were written.
+    """
+    columns = [table.c[name] for name in ("id", *names, "updated_at")]
+    copy = Table(table.name, _metadata, *(
+        Column(column.name, column.type.copy(), primary_key=column.primary_key)
+        for column in columns
+    ))
+    for column in columns:
+        if column.index or column.unique or column.foreign_keys:
+            Index(f"ix_{table.name}_{column.name}", copy.c[column.name])
+    return copy
+
+
+SOURCE_TABLES: List[Table] = [model.__table__ for model in SNAPSHOT_COLUMNS]
+SNAPSHOT_TABLES: Dict[str, Table] = {
+    model.__tablename__: _copy_table(model.__table__, names) for model, names in SNAPSHOT_COLUMNS.items()
+}
+
+snapshot_state = Table(
+    "snapshot_state", _metadata,
+    Column("table_name", String, primary_key=True),
+    # Newest updated_at copied so far
+    Column("watermark", DateTime),
+    Column("refreshed_at", DateTime, nullable=False),
+    Column("row_count", Integer, nullable=False),
+)
+
+
+def _configure_connection(dbapi_connection, connection_record):
+    # Reports keep reading the previous refresh while the next one is written
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+
+class ReportSnapshot:
+    """
+    A read-only copy of the columns set-based reports read from users,
+    students, courses, enrollments and grades in a local SQLite file, so
+    term-end reporting does not compete with live traffic on the primary.
+
+    ``refresh`` copies the rows whose ``updated_at`` moved since the
+    previous refresh and drops the rows deleted from the primary, all in
+    one transaction, so readers see either the previous refresh or the
+    next one. The tables keep their names and column names, so report
+    queries that select those columns from the models run unchanged in a
+    ``session``.
+    """
+
+    def __init__(self, path: Path, source: Engine = engine):
+        self.path = Path(path)
+        self.source = source
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        with self._lock:
+            if self._engine is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._engine = create_engine(
+                    f"sqlite:///{self.path}",
+                    connect_args={"check_same_thread": False, "timeout": 30},
+                )
+                event.listen(self._engine, "connect", _configure_connection)
+            return self._engine
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """A session reading the snapshot."""
+        with Session(self.engine) as session:
+            yield session
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Watermark, refresh time and row count of each copied table."""
+        if not self.path.exists():
+            return []
+        with self.engine.connect() as connection:
+            if not inspect(connection).has_table(snapshot_state.name):
+                return []
+            return [dict(row._mapping) for row in connection.execute(select(snapshot_state))]
+
+    def refreshed_at(self) -> Optional[datetime]:
+        """When the stalest table was last refreshed; None until every table has been copied."""
+        refreshed = {row["table_name"]: row["refreshed_at"] for row in self.status()}
+        if refreshed.keys() != SNAPSHOT_TABLES.keys():
+            return None
+        return min(refreshed.values())
+
+    @contextmanager
+    def _read_source(self) -> Iterator[Connection]:
+        with self.source.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                # Read every table at the same point in time
+                connection = connection.execution_options(isolation_level="REPEATABLE READ")
+            with connection.begin():
+                yield connection
+
+    def _prepare(self, target: Connection, full: bool) -> None:
+        """Create missing tables; rebuild those whose columns no longer match the models."""
+        existing = inspect(target)
+        for name, table in SNAPSHOT_TABLES.items():
+            if not existing.has_table(name):
+                continue
+            columns = {column["name"] for column in existing.get_columns(name)}
+            if full or columns != set(table.columns.keys()):
+                table.drop(target)
+                if existing.has_table(snapshot_state.name):
+                    target.execute(delete(snapshot_state).where(snapshot_state.c.table_name == name))
+        _metadata.create_all(target)
+
+    def _copy_changed(self, source: Connection, target: Connection, table: Table,
+                      watermark: Optional[datetime]) -> tuple:
+        """Upsert the rows updated since ``watermark``. Returns the count and the new watermark."""
+        copy = SNAPSHOT_TABLES[table.name]
+        query = select(*(table.c[name] for name in copy.columns.keys()))
+        if watermark is not None:
+            query = query.where(table.c.updated_at > watermark - WATERMARK_OVERLAP)
+        statement = sqlite.insert(copy)
+        upsert = statement.on_conflict_do_update(
+            index_elements=[copy.c.id],
+            set_={name: statement.excluded[name] for name in copy.columns.keys() if name != "id"},
+        )
+        copied = 0
+        result = source.execute(
+            query.execution_options(stream_results=True, yield_per=settings.REPORT_EXPORT_BATCH_SIZE)
+        )
+        for batch in result.partitions():
+            rows = [dict(row._mapping) for row in batch]
+            target.execute(upsert, rows)
+            copied += len(rows)
+            newest = max(row["updated_at"] for row in rows)
+            if watermark is None or newest > watermark:
+                watermark = newest
+        return copied, watermark
+
+    def _delete_missing(self, source: Connection, target: Connection, table: Table) -> int:
+        """
+        Drop the rows deleted from the primary. Every live row has been
+        copied, so the ids are only compared when the snapshot has more rows.
+        """
+        copy = SNAPSHOT_TABLES[table.name]
+        live = source.execute(select(func.count()).select_from(table)).scalar_one()
+        copied = target.execute(select(func.count()).select_from(copy)).scalar_one()
+        if copied <= live:
+            return 0
+        stale = list(
+            set(target.execute(select(copy.c.id)).scalars())
+            - set(source.execute(select(table.c.id)).scalars())
+        )
+        for start in range(0, len(stale), DELETE_BATCH_SIZE):
+            target.execute(delete(copy).where(copy.c.id.in_(stale[start:start + DELETE_BATCH_SIZE])))
+        return len(stale)
+
+    def refresh(self, full: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Bring the snapshot up to date with the primary; ``full`` copies every
+        row again. Returns the rows copied and deleted per table.
+        """
+        started = time.perf_counter()
+        counts = {}
+        with self._read_source() as source, self.engine.begin() as target:
+            self._prepare(target, full)
+            watermarks = dict(target.execute(select(snapshot_state.c.table_name, snapshot_state.c.watermark)).all())
+            refreshed_at = datetime.utcnow()
+            for table in SOURCE_TABLES:
+                copied, watermark = self._copy_changed(source, target, table, watermarks.get(table.name))
+                deleted = self._delete_missing(source, target, table)
+                row_count = target.execute(
+                    select(func.count()).select_from(SNAPSHOT_TABLES[table.name])
+                ).scalar_one()
+                statement = sqlite.insert(snapshot_state).values(
+                    table_name=table.name, watermark=watermark, refreshed_at=refreshed_at, row_count=row_count,
+                )
+                target.execute(statement.on_conflict_do_update(
+                    index_elements=[snapshot_state.c.table_name],
+                    set_={"watermark": watermark, "refreshed_at": refreshed_at, "row_count": row_count},
+                ))
+                counts[table.name] = {"copied": copied, "deleted": deleted}
+
+        elapsed = time.perf_counter() - started
+        changed = sum(count["copied"] + count["deleted"] for count in counts.values())
+        app_logger.info(f"Refreshed report snapshot {self.path} in {elapsed:.2f}s ({changed} rows changed)")
+        return counts
+
+
+report_snapshot = ReportSnapshot(SNAPSHOT_PATH)
+
+
+class ReportSnapshotRefresher:
+    """
+    Background thread refreshing the report snapshot at startup and on an
+    interval. The snapshot is a file on this host, so the API workers
+    share it through a lock file next to it: only the worker holding the
+    lock refreshes, and another takes over when it exits.
+    """
+
+    def __init__(self, snapshot: ReportSnapshot, interval: float):
+        self.snapshot = snapshot
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._leader: Optional[LeaderLock] = None
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                if self._leader.acquire():
+                    self.snapshot.refresh()
+            except Exception as exc:
+                app_logger.error(f"Report snapshot refresh failed: {exc}")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._leader = LeaderLock("report-snapshot", self.snapshot.engine, self.snapshot.path.with_suffix(".lock"))
+        self._thread = threading.Thread(target=self._loop, name="report-snapshot-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._leader is not None:
+            self._leader.release()
+
+
+report_snapshot_refresher = ReportSnapshotRefresher(report_snapshot, interval=settings.REPORT_SNAPSHOT_SECONDS)
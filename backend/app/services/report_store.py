@@ -0,0 +1,271 @@
+from sqlmodel import Session, select
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from pathlib import Path
+import os
+import threading
+import uuid
+
+from ..config import settings
+from ..database.locks import background_leader
+from ..database.session import engine
+from ..models.report_file import ReportFile
+from ..models.report_job import ReportType
+from ..utils.logger import app_logger
+
+# Create reports directory
+REPORTS_DIR = Path(__file__).parent.parent.parent / "reports"
+REPORTS_DIR.mkdir(exist_ok=True)
+
+# Evict down to this share of the budget so a full store is not swept on every write
+LOW_WATERMARK = 0.9
+SWEEP_BATCH_SIZE = 500
+
+PathLike = Union[str, Path]
+
+
+class ReportStoreMetrics:
+    """Hit, miss and eviction counters of the current process."""
+
+    COUNTERS = ("hits", "misses", "evictions", "expirations", "evicted_bytes")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.COUNTERS, 0)
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[counter] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+report_store_metrics = ReportStoreMetrics()
+
+
+def relative_report_path(path: PathLike) -> str:
+    """Index key of a file: its path inside the reports directory."""
+    return Path(path).relative_to(REPORTS_DIR).as_posix()
+
+
+def _upsert(db: Session):
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    return dialect_insert(ReportFile)
+
+
+def register_report_files(db: Session, files: Iterable[Tuple[PathLike, ReportType]]) -> None:
+    """
+    Add files written to the reports directory to the index, or refresh the
+    size and access time of ones already indexed. Flushes; the caller commits.
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for path, report_type in files:
+        rows[relative_report_path(path)] = {
+            "id": str(uuid.uuid4()),
+            "path": relative_report_path(path),
+            "report_type": report_type,
+            "size_bytes": os.path.getsize(path),
+            "last_accessed_at": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+    if not rows:
+        return
+
+    statement = _upsert(db).values(list(rows.values()))
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[ReportFile.path],
+        set_={
+            "size_bytes": statement.excluded.size_bytes,
+            "last_accessed_at": statement.excluded.last_accessed_at,
+            "updated_at": statement.excluded.updated_at,
+        }
+    ))
+
+
+def register_report_file(db: Session, path: PathLike, report_type: ReportType) -> None:
+    register_report_files(db, [(path, report_type)])
+
+
+def touch_report_files(db: Session, paths: Iterable[PathLike]) -> None:
+    """Mark files as just used so LRU eviction keeps them longest."""
+    keys = [relative_report_path(path) for path in paths]
+    if keys:
+        db.execute(
+            update(ReportFile)
+            .where(ReportFile.path.in_(keys))
+            .values(last_accessed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+
+def lookup_report_file(db: Session, path: PathLike) -> Optional[Path]:
+    """
+    A stored file if it still exists, recorded as a hit and touched; a miss
+    otherwise, dropping any index entry left behind. The caller commits.
+    """
+    path = Path(path)
+    if path.exists():
+        report_store_metrics.incr("hits")
+        touch_report_files(db, [path])
+        return path
+
+    report_store_metrics.incr("misses")
+    db.execute(delete(ReportFile).where(ReportFile.path == relative_report_path(path)))
+    return None
+
+
+def _remove(db: Session, files: List[ReportFile]) -> int:
+    """Delete files and their index entries. Returns the bytes freed."""
+    for report_file in files:
+        try:
+            (REPORTS_DIR / report_file.path).unlink()
+        except FileNotFoundError:
+            pass
+    db.execute(delete(ReportFile).where(ReportFile.id.in_([report_file.id for report_file in files])))
+    db.commit()
+    return sum(report_file.size_bytes for report_file in files)
+
+
+def _expire(db: Session, report_type: str, max_age: timedelta) -> int:
+    expired = 0
+    cutoff = datetime.utcnow() - max_age
+    while True:
+        batch = db.exec(
+            select(ReportFile)
+            .where(ReportFile.report_type == report_type, ReportFile.created_at < cutoff)
+            .limit(SWEEP_BATCH_SIZE)
+        ).all()
+        if not batch:
+            return expired
+        _remove(db, batch)
+        expired += len(batch)
+
+
+def _evict(db: Session, max_bytes: int) -> Tuple[int, int]:
+    """Evict least recently used files until the store is under its low watermark."""
+    total = db.exec(select(func.coalesce(func.sum(ReportFile.size_bytes), 0))).one()
+    if total <= max_bytes:
+        return 0, 0
+
+    to_free = total - int(max_bytes * LOW_WATERMARK)
+    evicted = freed = 0
+    while freed < to_free:
+        batch = db.exec(
+            select(ReportFile).order_by(ReportFile.last_accessed_at, ReportFile.id).limit(SWEEP_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        victims = []
+        for report_file in batch:
+            victims.append(report_file)
+            freed += report_file.size_bytes
+            if freed >= to_free:
+                break
+        _remove(db, victims)
+        evicted += len(victims)
+    return evicted, freed
+
+
+def sweep_report_store(db: Session) -> Dict[str, int]:
+    """
+    Apply the per-type retention limits, then evict least recently used
+    files while the store is over its byte budget. Works from the index
+    only, so its cost does not depend on the size of the directory.
+    """
+    expired = sum(
+        _expire(db, report_type, timedelta(hours=hours))
+        for report_type, hours in settings.REPORT_RETENTION_HOURS.items()
+        if hours > 0
+    )
+    evicted, freed = _evict(db, settings.REPORT_STORE_MAX_MB * 1024 * 1024)
+
+    report_store_metrics.incr("expirations", expired)
+    report_store_metrics.incr("evictions", evicted)
+    report_store_metrics.incr("evicted_bytes", freed)
+    if expired or evicted:
+        app_logger.info(f"Report store sweep expired {expired} and evicted {evicted} files ({freed} bytes)")
+    return {"expired": expired, "evicted": evicted, "evicted_bytes": freed}
+
+
+def report_store_stats(db: Session) -> Dict[str, Any]:
+    """Indexed usage per report type with this process's counters."""
+    usage = db.exec(
+        select(ReportFile.report_type, func.count(ReportFile.id), func.coalesce(func.sum(ReportFile.size_bytes), 0))
+        .group_by(ReportFile.report_type)
+    ).all()
+    return {
+        "max_bytes": settings.REPORT_STORE_MAX_MB * 1024 * 1024,
+        "total_files": sum(files for _, files, _ in usage),
+        "total_bytes": sum(size for _, _, size in usage),
+        "by_type": [
+            {"report_type": report_type, "files": files, "bytes": size}
+            for report_type, files, size in sorted(usage, key=lambda row: str(row[0]))
+        ],
+        **report_store_metrics.snapshot(),
+    }
+
+
+def reindex_report_store(db: Session) -> int:
+    """
+    Index files already in the reports directory, e.g. ones written before
+    the index existed. Walks the directory once. Returns the files indexed.
+    """
+    files = []
+    for path in REPORTS_DIR.rglob("*"):
+        if not path.is_file() or path.suffix == ".tmp":
+            continue
+        if path.parent.name == "transcripts":
+            files.append((path, ReportType.TRANSCRIPT))
+        elif path.suffix == ".zip":
+            files.append((path, ReportType.BATCH_TRANSCRIPTS))
+        elif path.suffix == ".xlsx":
+            files.append((path, ReportType.STUDENTS_EXPORT))
+        elif path.suffix == ".pdf":
+            files.append((path, ReportType.TRANSCRIPT))
+    for start in range(0, len(files), SWEEP_BATCH_SIZE):
+        register_report_files(db, files[start:start + SWEEP_BATCH_SIZE])
+    db.commit()
+    return len(files)
+
+
+class ReportStoreSweeper:
+    """
+    Background thread sweeping the report store on an interval. It runs in
+    every API worker but only sweeps while its process holds the background
+    leader lock, so the workers do not evict and rescan the same directory
+    concurrently.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                if background_leader.acquire():
+                    with Session(engine) as db:
+                        sweep_report_store(db)
+            except Exception as exc:
+                app_logger.error(f"Report store sweep failed: {exc}")
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="report-store-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+report_store_sweeper = ReportStoreSweeper(interval=settings.REPORT_STORE_SWEEP_SECONDS)
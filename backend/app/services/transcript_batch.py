@@ -0,0 +1,119 @@
+from sqlmodel import Session
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from io import BytesIO
+import multiprocessing
+import os
+import time
+import zipfile
+
+from ..config import settings
+from ..models.report_job import ReportType
+from .report_service import TRANSCRIPT_TEMPLATE_VERSION, ReportService, render_transcript_pdf
+from .report_store import REPORTS_DIR, register_report_file, register_report_files, report_store_metrics, touch_report_files
+from .transcript_cache import read_cached_transcript, store_transcript, transcript_cache_key, transcript_path
+from ..utils.logger import app_logger
+
+# Called with (rendered, total, transcripts_per_second)
+ProgressCallback = Callable[[int, int, float], None]
+
+
+def _transcript_filename(report: Dict[str, Any]) -> str:
+    name = "".join(c if c.isalnum() else "_" for c in report["student_name"]).strip("_")
+    return f"{name}_{report['student_id']}.pdf"
+
+
+def render_transcript_chunk(reports: List[Dict[str, Any]]) -> List[Tuple[str, bytes, str, bool]]:
+    """
+    Transcripts of a chunk of students as (filename, PDF bytes, cache key,
+    whether it was cached), taken from the transcript cache or rendered and
+    cached. Runs in a worker process, so the report store index is left to
+    the caller.
+    """
+    rendered = []
+    for report in reports:
+        key = transcript_cache_key(report, TRANSCRIPT_TEMPLATE_VERSION)
+        content = read_cached_transcript(key)
+        cached = content is not None
+        if not cached:
+            buffer = BytesIO()
+            render_transcript_pdf(report, buffer)
+            content = buffer.getvalue()
+            store_transcript(key, content)
+        rendered.append((_transcript_filename(report), content, key, cached))
+    return rendered
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _render_workers() -> int:
+    """
+    Render processes per archive. Archives are built inside the
+    REPORT_WORKERS job processes, so unless REPORT_BATCH_WORKERS is set
+    they split the cores between them instead of each taking all of them.
+    """
+    if settings.REPORT_BATCH_WORKERS:
+        return settings.REPORT_BATCH_WORKERS
+    return max(1, (os.cpu_count() or 1) // max(settings.REPORT_WORKERS, 1))
+
+
+def _rendered_chunks(chunks: List[List[Dict[str, Any]]],
+                     workers: int) -> Iterator[List[Tuple[str, bytes, str, bool]]]:
+    """Rendered chunks as they complete; in this process when one worker would do."""
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield render_transcript_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(render_transcript_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def build_transcript_archive(db: Session, grade_level: int,
+                             on_progress: Optional[ProgressCallback] = None) -> Tuple[str, int]:
+    """
+    Render the transcript of every student in a grade level into one ZIP.
+    Report data for the whole class comes from one grouped query;
+    rendering is spread over ``_render_workers()`` processes and each
+    chunk is written into the archive as soon as it is done, so only the
+    chunks in flight are held in memory. The archive and transcripts are
+    registered in the report store; the caller commits. Returns the path
+    and the count.
+    """
+    reports = list(ReportService(db).get_students_grades(grade_level=grade_level).values())
+    # The data is loaded; do not hold the read transaction while rendering
+    db.rollback()
+
+    total = len(reports)
+    path = REPORTS_DIR / f"transcripts_grade_{grade_level}_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip"
+    started = time.perf_counter()
+    rendered = 0
+    reused_keys, new_keys = [], []
+
+    # PDFs are already compressed; storing them avoids deflating twice
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for chunk in _rendered_chunks(_chunks(reports, settings.REPORT_BATCH_CHUNK_SIZE), _render_workers()):
+            for filename, content, key, cached in chunk:
+                archive.writestr(filename, content)
+                (reused_keys if cached else new_keys).append(key)
+            rendered += len(chunk)
+            if on_progress:
+                on_progress(rendered, total, rendered / max(time.perf_counter() - started, 1e-9))
+
+    report_store_metrics.incr("hits", len(reused_keys))
+    report_store_metrics.incr("misses", len(new_keys))
+    touch_report_files(db, [transcript_path(key) for key in reused_keys])
+    register_report_files(db, [(transcript_path(key), ReportType.TRANSCRIPT) for key in new_keys])
+    register_report_file(db, path, ReportType.BATCH_TRANSCRIPTS)
+
+    elapsed = time.perf_counter() - started
+    app_logger.info(
+        f"Rendered {total} transcripts for grade level {grade_level} in {elapsed:.2f}s "
+        f"({total / max(elapsed, 1e-9):.1f} transcripts/s)"
+    )
+    return str(path), total
@@ -0,0 +1,58 @@
+from typing import Any, Dict, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import tempfile
+
+from .report_store import REPORTS_DIR
+
+# One file per distinct transcript
+TRANSCRIPTS_DIR = REPORTS_DIR / "transcripts"
+
+# Report fields that change on every call without changing the document
+_VOLATILE_FIELDS = ("generated_at",)
+
+
+def transcript_cache_key(report: Dict[str, Any], template_version: str) -> str:
+    """
+    Content address of a transcript: a hash of the report data it is
+    rendered from and of the template version. Any grade, enrollment or
+    student change alters the data and therefore the key, so stale files
+    are never looked up again.
+    """
+    data = {field: value for field, value in report.items() if field not in _VOLATILE_FIELDS}
+    payload = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{template_version}:{payload}".encode()).hexdigest()
+
+
+def transcript_path(key: str) -> Path:
+    return TRANSCRIPTS_DIR / f"{key}.pdf"
+
+
+def read_cached_transcript(key: str) -> Optional[bytes]:
+    """Stored PDF of a key, or None if it was never rendered or has been evicted."""
+    try:
+        return transcript_path(key).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def store_transcript(key: str, content: bytes) -> Path:
+    """
+    Write a rendered transcript under its key. The file is written to a
+    temporary name and renamed, so concurrent readers never see a partial
+    PDF and concurrent writers of the same key simply replace each other.
+    """
+    TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = transcript_path(key)
+    handle, temp_path = tempfile.mkstemp(dir=TRANSCRIPTS_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
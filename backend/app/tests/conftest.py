@@ -1,15 +1,23 @@
 import asyncio
 import os
 import pytest
-from sqlmodel import SQLModel, Session
+from datetime import date
+from typing import List, Optional
+from sqlmodel import SQLModel, Session, create_engine
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from app.config import settings
 from app.main import app
-from app.database.session import get_session
+from app.database.session import get_db, enable_sqlite_transactions
 from app.models.user import User, UserRole
-from app.auth.token import get_password_hash
+from app.models.teacher import Teacher
+from app.models.student import Student
+from app.models.course import Course, CourseStatus
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.auth.token import create_access_token, get_password_hash
 
 # Use an in-memory SQLite database for testing
 TEST_DATABASE_URL = "sqlite:///./test.db"
@@ -37,7 +45,7 @@ def test_db():
         with Session(engine) as session:
             yield session
     
-    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_db] = override_get_session
     
     yield engine
     
@@ -101,4 +109,128 @@ async def student_user(test_db):
         await session.commit()
         await session.refresh(student)
         
-        yield student
\ No newline at end of file
+        yield student
+
+@pytest.fixture(scope="function")
+def engine(tmp_path):
+    """
+    A SQLite file database with every table, shared by threads and by the
+    sessions of one test. Savepoints roll back as they do on Postgres.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    enable_sqlite_transactions(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def postgres_engine():
+    """The configured Postgres test database with every table; skips the test when it is unreachable."""
+    if not settings.TEST_DATABASE_URL:
+        pytest.skip("No Postgres test database configured")
+    engine = create_engine(settings.TEST_DATABASE_URL, connect_args={"connect_timeout": 3})
+    try:
+        SQLModel.metadata.create_all(engine)
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("Postgres test database is not available")
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture(scope="function")
+def admin():
+    """An administrator to pass to services as the acting user; not stored."""
+    return User(email="admin@test.com", first_name="A", last_name="A", role=UserRole.ADMIN, hashed_password="x")
+
+class School:
+    """Stores teachers, courses, students and enrollments; every call commits."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._users = 0
+
+    def _user(self, role: UserRole, last_name: str) -> User:
+        self._users += 1
+        return User(email=f"{role.value}{self._users}@test.com", first_name=role.value.title(),
+                    last_name=last_name, role=role, hashed_password="x")
+
+    def teacher(self, department: Optional[str] = None) -> Teacher:
+        user = self._user(UserRole.TEACHER, "Teacher")
+        teacher = Teacher(user_id=user.id, hire_date=date(2020, 1, 1), qualification="MSc", department=department)
+        self.session.add_all([user, teacher])
+        self.session.commit()
+        return teacher
+
+    def course(self, teacher: Optional[Teacher] = None, code: str = "ALG101", max_students: int = 30,
+               credit_hours: int = 3, status: CourseStatus = CourseStatus.ACTIVE) -> Course:
+        teacher = teacher or self.teacher()
+        course = Course(name=f"Course {code}", code=code, credit_hours=credit_hours, teacher_id=teacher.id,
+                        max_students=max_students, start_date=date(2025, 1, 1), end_date=date(2025, 6, 1),
+                        status=status)
+        self.session.add(course)
+        self.session.commit()
+        return course
+
+    def students(self, count: int, grade_level: int = 9) -> List[Student]:
+        students = []
+        for i in range(count):
+            user = self._user(UserRole.STUDENT, str(i))
+            student = Student(user_id=user.id, enrollment_date=date(2024, 9, 1), grade_level=grade_level)
+            self.session.add_all([user, student])
+            students.append(student)
+        self.session.commit()
+        return students
+
+    def enroll(self, student: Student, course: Course,
+               status: EnrollmentStatus = EnrollmentStatus.ACTIVE) -> Enrollment:
+        """Store an enrollment directly, without taking a seat."""
+        enrollment = Enrollment(student_id=student.id, course_id=course.id, status=status)
+        self.session.add(enrollment)
+        self.session.commit()
+        return enrollment
+
+@pytest.fixture(scope="function")
+def school(session):
+    return School(session)
+
+@pytest.fixture(scope="function")
+def postgres_school(postgres_engine):
+    with Session(postgres_engine) as session:
+        yield School(session)
+
+@pytest.fixture(scope="function")
+def client(engine):
+    """A client whose requests use the test database. Startup tasks do not run."""
+    def override_get_db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+@pytest.fixture(scope="function")
+def login(session):
+    """
+    Auth headers for a stored user, or for a new user of a role. Returns
+    the user and the headers.
+    """
+    def login(user_or_role, email: Optional[str] = None):
+        user = user_or_role
+        if not isinstance(user, User):
+            user = User(email=email or f"{user_or_role.value}-login@test.com", first_name=user_or_role.value.title(),
+                        last_name="Login", role=user_or_role, hashed_password="x")
+            session.add(user)
+            session.commit()
+        token = create_access_token({"sub": user.email, "user_id": user.id})
+        return user, {"Authorization": f"Bearer {token}"}
+    return login
@@ -0,0 +1,44 @@
+import pytest
+from sqlmodel import select
+
+from app.models.course import Course
+from app.models.user import UserRole
+from app.services.analytics import reconcile_analytics
+
+def _grade(enrollment_id, score):
+    return {"resource": "grades", "method": "create", "data": {
+        "enrollment_id": enrollment_id, "grade_type": "exam", "score": score, "max_score": 100, "weight": 1,
+    }}
+
+def _batch(client, headers, operations, atomic=True):
+    response = client.post("/batch/", headers=headers, json={"operations": operations, "atomic": atomic})
+    assert response.status_code == 200
+    return response.json()
+
+@pytest.mark.parametrize("atomic", [True, False])
+def test_failed_operation_leaves_no_side_effects(client, school, login, atomic):
+    """A rolled back operation's noted seat and rollup changes are not applied with the rest of the batch"""
+    course = school.course(max_students=5)
+    student_ids, course_id = [student.id for student in school.students(2)], course.id
+    _, headers = login(UserRole.ADMIN)
+    school.session.rollback()
+
+    created = _batch(client, headers, [
+        {"resource": "enrollments", "method": "create",
+         "data": {"student_id": student_id, "course_id": course_id, "status": "active"}}
+        for student_id in student_ids
+    ])
+    enrollment_ids = [result["data"]["id"] for result in created["results"]]
+    _batch(client, headers, [_grade(enrollment_id, 80) for enrollment_id in enrollment_ids])
+
+    # Deleting a graded enrollment fails on the grades' foreign key after its changes were noted
+    batch = _batch(client, headers, [
+        _grade(enrollment_ids[0], 90),
+        {"resource": "enrollments", "method": "delete", "id": enrollment_ids[1]},
+    ], atomic=atomic)
+
+    assert batch["committed"] is not atomic
+    assert [result["status_code"] for result in batch["results"]] == [424 if atomic else 201, 409]
+    session = school.session
+    assert session.exec(select(Course.enrolled_count).where(Course.id == course_id)).one() == 2
+    assert not any(reconcile_analytics(session).values())
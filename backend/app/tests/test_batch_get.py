@@ -0,0 +1,44 @@
+from datetime import date
+
+from app.models.grade import Grade, GradeType
+from app.models.user import UserRole
+from app.schemas.batch import MAX_BATCH_IDS
+
+def test_students_see_only_their_own_rows(client, school, login):
+    """Results follow the requested order; other students' rows are forbidden, unknown ids not found"""
+    course = school.course()
+    own, other = school.students(2)
+    own_enrollment, other_enrollment = school.enroll(own, course), school.enroll(other, course)
+    grades = [Grade(enrollment_id=enrollment.id, grade_type=GradeType.QUIZ, score=9, max_score=10, weight=1,
+                    grade_date=date(2025, 2, 1)) for enrollment in (own_enrollment, other_enrollment)]
+    school.session.add_all(grades)
+    school.session.commit()
+    enrollment_ids, grade_ids = [own_enrollment.id, other_enrollment.id], [grade.id for grade in grades]
+    course_id = course.id
+    _, headers = login(own.user)
+    school.session.rollback()
+
+    response = client.post("/enrollments/batch-get", headers=headers, params={"include": "course"},
+                           json={"ids": [enrollment_ids[1], "missing", enrollment_ids[0]]})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [(item["id"], item["status"]) for item in items] == \
+        [(enrollment_ids[1], "forbidden"), ("missing", "not_found"), (enrollment_ids[0], "found")]
+    assert items[0]["data"] is None and items[2]["data"]["course"]["id"] == course_id
+
+    items = client.post("/grades/batch-get", headers=headers, json={"ids": grade_ids}).json()["items"]
+    assert [item["status"] for item in items] == ["found", "forbidden"]
+
+    _, admin_headers = login(UserRole.ADMIN)
+    items = client.post("/grades/batch-get", headers=admin_headers, json={"ids": grade_ids}).json()["items"]
+    assert [item["status"] for item in items] == ["found", "found"]
+
+def test_id_count_is_bounded(client, login):
+    _, headers = login(UserRole.ADMIN)
+    ids = [f"id-{i}" for i in range(MAX_BATCH_IDS + 1)]
+    assert client.post("/students/batch-get", headers=headers, json={"ids": ids}).status_code == 422
+    assert client.post("/students/batch-get", headers=headers, json={"ids": []}).status_code == 422
+
+    response = client.post("/students/batch-get", headers=headers, json={"ids": ids[:MAX_BATCH_IDS]})
+    assert response.status_code == 200
+    assert {item["status"] for item in response.json()["items"]} == {"not_found"}
@@ -0,0 +1,73 @@
+import pytest
+from sqlmodel import func, select
+
+from app.models.enrollment import EnrollmentStatus
+from app.models.grade import Grade
+from app.models.grade_summary import EnrollmentGradeSummary
+from app.models.user import UserRole
+from app.services.grade_summary import check_grade_summaries
+
+@pytest.fixture(scope="function")
+def gradebook(school, login):
+    """A course with two active enrollments, a dropped one and an enrollment in another course"""
+    course, other = school.course(code="BIO1"), school.course(code="CHEM1")
+    students = school.students(3)
+    enrollments = [school.enroll(students[0], course), school.enroll(students[1], course),
+                   school.enroll(students[2], course, status=EnrollmentStatus.DROPPED),
+                   school.enroll(students[0], other)]
+    _, headers = login(UserRole.ADMIN)
+    ids = course.id, [enrollment.id for enrollment in enrollments]
+    school.session.rollback()
+    return ids, headers
+
+def _post(client, headers, course_id, scores, all_or_nothing):
+    response = client.post("/grades/bulk", headers=headers, json={
+        "course_id": course_id, "grade_type": "exam", "max_score": 50, "weight": 1,
+        "grade_date": "2025-03-01", "all_or_nothing": all_or_nothing,
+        "scores": [{"enrollment_id": enrollment_id, "score": score} for enrollment_id, score in scores],
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def test_all_or_nothing_saves_nothing_when_a_row_is_rejected(client, session, gradebook):
+    (course_id, (first, second, _, _)), headers = gradebook
+    body = _post(client, headers, course_id, [(first, 40), (second, 60), (first, 30)], all_or_nothing=True)
+
+    assert (body["created"], body["rejected"]) == (0, 3)
+    assert [result["error"] for result in body["results"]] == [
+        "Not saved because other rows were rejected",
+        "Score must be between 0 and 50.0",
+        "Duplicate enrollment in request",
+    ]
+    assert session.exec(select(func.count(Grade.id))).one() == 0
+    assert session.exec(select(func.count(EnrollmentGradeSummary.enrollment_id))).one() == 0
+
+def test_valid_rows_are_inserted_and_summarised(client, session, gradebook):
+    """Rejected rows are reported by index; the multi-row insert updates each enrollment's summary"""
+    (course_id, (first, second, dropped, elsewhere)), headers = gradebook
+    body = _post(client, headers, course_id,
+                 [(first, 40), (dropped, 30), (elsewhere, 20), (second, 25), (second, 10)], all_or_nothing=False)
+
+    assert (body["created"], body["rejected"]) == (2, 3)
+    assert [result["index"] for result in body["results"] if result["grade_id"]] == [0, 3]
+    assert [result["error"] for result in body["results"]][1:3] == [
+        "Cannot add grades to inactive enrollments",
+        f"Enrollment with ID {elsewhere} not found in this course",
+    ]
+    assert body["results"][4]["error"] == "Duplicate enrollment in request"
+
+    averages = dict(session.exec(
+        select(EnrollmentGradeSummary.enrollment_id, EnrollmentGradeSummary.weighted_average)
+    ).all())
+    assert averages == {first: pytest.approx(80.0), second: pytest.approx(50.0)}
+    assert check_grade_summaries(session) == []
+
+def test_row_after_a_rejected_row_for_the_same_enrollment_is_not_a_duplicate(client, session, gradebook):
+    (course_id, (first, _, _, _)), headers = gradebook
+    body = _post(client, headers, course_id, [(first, 60), (first, 45), (first, 40)], all_or_nothing=False)
+
+    assert [result["error"] for result in body["results"]] == [
+        "Score must be between 0 and 50.0", None, "Duplicate enrollment in request",
+    ]
+    assert body["results"][1]["grade_id"]
+    assert session.exec(select(Grade.score)).all() == [45]
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import update
+
+from app.models.course import Course
+from app.models.enrollment import EnrollmentCreate, EnrollmentStatus
+from app.services.catalog_cache import course_catalog_cache
+from app.services.enrollment_service import EnrollmentService
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(course_catalog_cache, "ttl_seconds", 3600)
+    course_catalog_cache.invalidate()
+    yield
+    course_catalog_cache.invalidate()
+
+def _enrolled(session, course):
+    entry, = [entry for entry in course_catalog_cache.get(session) if entry["id"] == course.id]
+    return entry["enrolled_count"], entry["available_seats"]
+
+def _set_count_behind_the_cache(session, course, count):
+    """Change the seat counter without recording it, as another process would."""
+    session.execute(update(Course).where(Course.id == course.id).values(enrolled_count=count))
+    session.commit()
+
+def test_entries_are_cached_until_a_commit_marks_them_stale(session, school, admin):
+    """Reads hit the cache; an enrollment's commit makes the next read re-read its course"""
+    course = school.course(max_students=5)
+    student, = school.students(1)
+    assert _enrolled(session, course) == (0, 5)
+
+    _set_count_behind_the_cache(session, course, 2)
+    assert _enrolled(session, course) == (0, 5)
+
+    EnrollmentService(session, admin).create_enrollment(
+        EnrollmentCreate(student_id=student.id, course_id=course.id, status=EnrollmentStatus.ACTIVE)
+    )
+    session.commit()
+    assert _enrolled(session, course) == (3, 2)
+
+def test_rollback_discards_seat_changes_even_after_a_savepoint(session, school, admin):
+    course = school.course(max_students=5)
+    student, = school.students(1)
+    assert _enrolled(session, course) == (0, 5)
+
+    with session.begin_nested():
+        EnrollmentService(session, admin).create_enrollment(
+            EnrollmentCreate(student_id=student.id, course_id=course.id, status=EnrollmentStatus.ACTIVE)
+        )
+    session.rollback()
+
+    # Nothing was marked stale, so a change behind the cache stays unseen until it expires
+    _set_count_behind_the_cache(session, course, 4)
+    assert _enrolled(session, course) == (0, 5)
+    course_catalog_cache.invalidate()
+    assert _enrolled(session, course) == (4, 1)
@@ -0,0 +1,140 @@
+import random
+import threading
+
+import pytest
+from sqlmodel import Session
+
+from app.models.grade import GradeCreate
+from app.services import class_rank
+from app.services.class_rank import ClassRankings, RankIndex, course_ranking, student_ranks
+from app.services.grade_service import GradeService
+
+def _naive_rank(scores, key):
+    higher = sum(1 for value in scores.values() if value > scores[key])
+    return higher + 1
+
+def test_incremental_updates_match_full_sort():
+    """Moving, adding and removing entries keeps ranks equal to a re-sort"""
+    rng = random.Random(7)
+    scores = {f"s{i}": float(rng.randint(50, 100)) for i in range(200)}
+    index = RankIndex(scores.items())
+
+    for _ in range(500):
+        key = f"s{rng.randint(0, 249)}"
+        if rng.random() < 0.1:
+            scores.pop(key, None)
+            index.set(key, None)
+        else:
+            scores[key] = float(rng.randint(50, 100))
+            index.set(key, scores[key])
+
+    assert len(index) == len(scores)
+    for key in scores:
+        assert index.rank(key)["rank"] == _naive_rank(scores, key)
+
+def test_ties_share_rank_and_percentile():
+    index = RankIndex([("a", 90.0), ("b", 80.0), ("c", 80.0), ("d", 70.0)])
+    assert [entry["rank"] for _, entry in index.ranking()] == [1, 2, 2, 4]
+    assert index.rank("b") == index.rank("c") == {"score": 80.0, "rank": 2, "percentile": 50.0, "class_size": 4}
+    assert index.rank("missing") is None
+
+@pytest.fixture
+def rankings(monkeypatch):
+    """Fresh rank indexes that count the window-function loads"""
+    rankings = ClassRankings(ttl_seconds=3600)
+    monkeypatch.setattr(class_rank, "class_rankings", rankings)
+    loads = []
+    window = class_rank._ranked_with_window
+    monkeypatch.setattr(class_rank, "_ranked_with_window", lambda db, scores: loads.append(scores) or window(db, scores))
+    return loads
+
+def _grade(session, admin, enrollment_id, score):
+    GradeService(session, admin).create_grade(GradeCreate(
+        enrollment_id=enrollment_id, grade_type="exam", score=score, max_score=100, weight=1
+    ))
+
+def _graded(session, school, admin, scores, code="ALG101", grade_level=9):
+    """A course with one student per score; returns its id and the enrollment ids and students in order"""
+    course = school.course(code=code)
+    students = school.students(len(scores), grade_level)
+    enrollments = [school.enroll(student, course) for student in students]
+    for enrollment, score in zip(enrollments, scores):
+        _grade(session, admin, enrollment.id, score)
+    session.commit()
+    return course.id, [enrollment.id for enrollment in enrollments], students
+
+def _ranks(session, course_id):
+    return {entry["enrollment_id"]: entry["rank"] for entry in course_ranking(session, course_id)}
+
+def test_committed_grade_moves_the_rank_without_a_rebuild(session, school, admin, rankings):
+    course_id, (first, second, third), _ = _graded(session, school, admin, [90, 80, 70])
+    assert _ranks(session, course_id) == {first: 1, second: 2, third: 3}
+    assert len(rankings) == 1
+
+    # (70 + 100) / 2 overtakes the second student's 80
+    _grade(session, admin, third, 100)
+    session.commit()
+    assert _ranks(session, course_id) == {first: 1, third: 2, second: 3}
+    assert len(rankings) == 1
+
+def test_rolled_back_grade_leaves_the_rank_unchanged(session, school, admin, rankings):
+    course_id, (first, second), _ = _graded(session, school, admin, [90, 80])
+    assert _ranks(session, course_id) == {first: 1, second: 2}
+
+    _grade(session, admin, second, 100)
+    session.flush()
+    session.rollback()
+    # A later commit on the same session must not apply the discarded changes
+    session.commit()
+    assert _ranks(session, course_id) == {first: 1, second: 2}
+    assert class_rank.class_rankings._dirty_enrollments == {}
+    assert len(rankings) == 1
+
+def test_grade_level_ranks_share_ties(session, school, admin, rankings):
+    _, enrollment_ids, students = _graded(session, school, admin, [90, 80, 80, 70])
+    # Another grade level is ranked separately
+    _graded(session, school, admin, [100], code="BIO1", grade_level=10)
+
+    ranks = [student_ranks(session, student) for student in students]
+    assert [rank["grade_level_rank"]["rank"] for rank in ranks] == [1, 2, 2, 4]
+    assert ranks[1]["grade_level_rank"] == ranks[2]["grade_level_rank"] == \
+        {"score": 80.0, "rank": 2, "percentile": 50.0, "class_size": 4}
+    assert [rank["courses"][0]["rank"] for rank in ranks] == [1, 2, 2, 4]
+    loads = len(rankings)
+
+    _grade(session, admin, enrollment_ids[3], 100)
+    session.commit()
+    assert student_ranks(session, students[3])["grade_level_rank"]["rank"] == 2
+    assert student_ranks(session, students[0])["grade_level_rank"]["rank"] == 1
+    assert len(rankings) == loads
+
+def test_reads_do_not_wait_for_a_load_in_flight(engine, session, school, admin, rankings, monkeypatch):
+    """A slow cold load of one course runs outside the lock, so ranks of a warm course are still served"""
+    slow_id, _, _ = _graded(session, school, admin, [90], code="BIO1")
+    warm_id, (warm,), _ = _graded(session, school, admin, [80])
+    _ranks(session, warm_id)
+    session.rollback()
+
+    started, release = threading.Event(), threading.Event()
+    window = class_rank._ranked_with_window
+
+    def slow_window(db, scores):
+        started.set()
+        release.wait(5)
+        return window(db, scores)
+
+    monkeypatch.setattr(class_rank, "_ranked_with_window", slow_window)
+    with Session(engine) as other:
+        loader = threading.Thread(target=course_ranking, args=(other, slow_id))
+        loader.start()
+        assert started.wait(5)
+        served = []
+        reader = threading.Thread(target=lambda: served.append(_ranks(session, warm_id)))
+        reader.start()
+        reader.join(2)
+        served_while_loading = list(served)
+        release.set()
+        loader.join()
+        reader.join()
+    assert served_while_loading == [{warm: 1}]
+    assert slow_id in class_rank.class_rankings._courses
@@ -0,0 +1,34 @@
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+
+from app.models.grade import GradeType
+from app.services.pdf_templates import get_template
+from app.services.report_service import _pivot_assessments
+
+def _grades(rows):
+    return pd.DataFrame(rows, columns=["enrollment_id", "grade_type", "grade_date", "score", "max_score"])
+
+def test_assessments_pivot_into_dated_columns():
+    """One column per assessment in date order, holding percentages; repeats get their own column"""
+    scores = _pivot_assessments(_grades([
+        ("e1", GradeType.EXAM, date(2025, 2, 1), 40, 50),
+        ("e1", GradeType.QUIZ, date(2025, 1, 10), 9, 10),
+        ("e2", GradeType.QUIZ, date(2025, 1, 10), 5, 10),
+        ("e2", GradeType.QUIZ, date(2025, 1, 10), 7, 10),
+    ]))
+    assert list(scores.columns) == ["Quiz 2025-01-10", "Quiz 2025-01-10 #2", "Exam 2025-02-01"]
+    assert scores.loc["e1"].tolist()[::2] == [90.0, 80.0]
+    assert scores.loc["e2"].tolist()[:2] == [50.0, 70.0]
+    assert pd.isna(scores.loc["e2", "Exam 2025-02-01"])
+
+def test_roster_pdf_fits_many_assessments():
+    """Wide rosters still render on landscape pages"""
+    assessments = [f"Quiz 2025-01-{day:02d}" for day in range(1, 21)]
+    student = {
+        "student_name": "Ana Lopez", "status": "active", "scores": [75.0] * 19 + [None],
+        "final_grade": 75.0, "letter_grade": "C",
+    }
+    roster = {"course_code": "MATH1", "course_name": "Algebra", "assessments": assessments, "students": [student] * 60}
+    assert get_template("roster").render(roster, BytesIO()) >= 2
@@ -0,0 +1,124 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select, func
+
+from app.models.course import Course
+from app.models.enrollment import Enrollment, EnrollmentCreate, EnrollmentStatus, EnrollmentUpdate
+from app.models.user import UserRole
+from app.services.enrollment_service import EnrollmentService, rebuild_seat_counts
+
+SEATS = 30
+APPLICANTS = 1000
+
+@pytest.fixture(scope="function")
+def course_with_applicants(school):
+    course_id = school.course(code="POP101", max_students=SEATS).id
+    student_ids = [student.id for student in school.students(APPLICANTS)]
+    # Reading the ids began a transaction; end it so other connections can write
+    school.session.rollback()
+    return course_id, student_ids
+
+def _enroll(engine, admin, course_id, student_id):
+    """Enroll one student, retrying when SQLite reports a lock conflict."""
+    for _ in range(50):
+        with Session(engine) as session:
+            try:
+                EnrollmentService(session, admin).create_enrollment(
+                    EnrollmentCreate(student_id=student_id, course_id=course_id, status=EnrollmentStatus.ACTIVE)
+                )
+                session.commit()
+                return "enrolled"
+            except HTTPException:
+                session.rollback()
+                return "rejected"
+            except OperationalError:
+                session.rollback()
+                time.sleep(0.01)
+    return "gave_up"
+
+def test_concurrent_enrollments_never_exceed_capacity(engine, admin, course_with_applicants):
+    """1,000 simultaneous enrollments into a 30-seat course end with exactly 30"""
+    course_id, student_ids = course_with_applicants
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        outcomes = list(pool.map(lambda sid: _enroll(engine, admin, course_id, sid), student_ids))
+
+    assert outcomes.count("enrolled") == SEATS
+    assert outcomes.count("gave_up") == 0
+
+    with Session(engine) as session:
+        enrolled = session.exec(
+            select(func.count(Enrollment.id)).where(Enrollment.course_id == course_id)
+        ).one()
+        course = session.get(Course, course_id)
+        assert enrolled == SEATS
+        assert course.enrolled_count == SEATS
+
+def test_status_changes_release_and_claim_seats(engine, admin, course_with_applicants):
+    """Dropping frees a seat, reactivating takes one, and the rebuild agrees"""
+    course_id, student_ids = course_with_applicants
+
+    for student_id in student_ids[:SEATS]:
+        assert _enroll(engine, admin, course_id, student_id) == "enrolled"
+    assert _enroll(engine, admin, course_id, student_ids[SEATS]) == "rejected"
+
+    with Session(engine) as session:
+        dropped_id = session.exec(select(Enrollment.id).where(Enrollment.course_id == course_id)).first()
+        EnrollmentService(session, admin).update_enrollment(
+            dropped_id, EnrollmentUpdate(status=EnrollmentStatus.DROPPED)
+        )
+        session.commit()
+        assert session.get(Course, course_id).enrolled_count == SEATS - 1
+
+    assert _enroll(engine, admin, course_id, student_ids[SEATS]) == "enrolled"
+
+    with Session(engine) as session:
+        with pytest.raises(HTTPException):
+            EnrollmentService(session, admin).update_enrollment(
+                dropped_id, EnrollmentUpdate(status=EnrollmentStatus.ACTIVE)
+            )
+        session.rollback()
+
+        session.exec(select(Course).where(Course.id == course_id)).one().enrolled_count = 0
+        session.commit()
+        rebuild_seat_counts(session)
+        assert session.get(Course, course_id).enrolled_count == SEATS
+
+def test_bulk_enrollment_fills_remaining_seats_and_skips_duplicates(client, session, school, login):
+    """Pairs are decided in order: duplicates in the request and existing enrollments never take a seat"""
+    small, large = school.course(code="SML101", max_students=3), school.course(code="LRG101")
+    students = school.students(4)
+    school.enroll(students[0], small)
+    rebuild_seat_counts(session)
+    session.commit()
+    _, headers = login(UserRole.ADMIN)
+    student_ids = [student.id for student in students]
+    small_id, large_id = small.id, large.id
+    session.rollback()
+
+    response = client.post("/enrollments/bulk", headers=headers, json={
+        "student_ids": student_ids + student_ids[1:2] + ["missing"],
+        "course_ids": [small_id, small_id, large_id],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    outcomes = [(result["student_id"], result["course_id"], result["outcome"]) for result in body["results"]]
+    assert outcomes == [
+        (student_ids[0], small_id, "already_enrolled"),
+        (student_ids[1], small_id, "enrolled"),
+        (student_ids[2], small_id, "enrolled"),
+        (student_ids[3], small_id, "course_full"),
+        ("missing", small_id, "student_not_found"),
+        *[(student_id, large_id, "enrolled") for student_id in student_ids],
+        ("missing", large_id, "student_not_found"),
+    ]
+    assert body["total"] == 10
+    assert body["summary"] == {"enrolled": 6, "already_enrolled": 1, "course_full": 1, "student_not_found": 2}
+    assert session.get(Course, small_id).enrolled_count == 3
+    assert session.get(Course, large_id).enrolled_count == 4
+    assert session.exec(select(func.count(Enrollment.id))).one() == 7
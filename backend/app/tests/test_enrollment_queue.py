@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.database.locks import LeaderLock
+from app.models.user import UserRole
+from app.models.enrollment import Enrollment
+from app.models.enrollment_request import EnrollmentOutcome, EnrollmentRequest, EnrollmentRequestStatus
+from app.services import enrollment_queue
+from app.services.enrollment_queue import EnrollmentQueueWorkers, claim_requests, process_requests
+
+@pytest.fixture(autouse=True)
+def queue_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "ENROLLMENT_QUEUE_ENABLED", True)
+
+def _drain(engine, batch_size):
+    with Session(engine) as db:
+        requests = claim_requests(db, batch_size)
+        process_requests(db, requests)
+        return requests
+
+def test_submitted_requests_are_processed_and_polled(client, engine, school, login):
+    """Tickets start queued and end with each request's own outcome"""
+    course = school.course(max_students=2)
+    students = school.students(3)
+    _, headers = login(UserRole.ADMIN)
+    student_ids, course_id = [student.id for student in students], course.id
+    school.session.rollback()
+
+    tickets = []
+    for student_id in student_ids + student_ids[:1]:
+        response = client.post("/enrollments/requests", headers=headers,
+                               json={"student_id": student_id, "course_id": course_id})
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        tickets.append(response.json()["id"])
+
+    assert len(_drain(engine, batch_size=10)) == 4
+    assert _drain(engine, batch_size=10) == []
+
+    polled = [client.get(f"/enrollments/requests/{ticket}", headers=headers).json() for ticket in tickets]
+    assert [ticket["status"] for ticket in polled] == ["completed"] * 4
+    assert [ticket["outcome"] for ticket in polled] == ["enrolled", "enrolled", "course_full", "already_enrolled"]
+    assert polled[0]["enrollment_id"] and polled[2]["enrollment_id"] is None
+
+def test_concurrent_claimers_take_each_request_once(engine, session, school, admin):
+    """Two workers draining one queue never claim the same request, so none is applied twice"""
+    course = school.course(max_students=100)
+    students = school.students(60)
+    session.add(admin)
+    session.add_all(
+        EnrollmentRequest(student_id=student.id, course_id=course.id, requested_by=admin.id)
+        for student in students
+    )
+    session.commit()
+    session.close()
+
+    claimed = [[], []]
+    start = threading.Barrier(2)
+
+    def worker(index):
+        start.wait()
+        with Session(engine) as db:
+            while True:
+                try:
+                    requests = claim_requests(db, batch_size=7)
+                except OperationalError:
+                    # SQLite reports a lock conflict instead of waiting; retry like the worker loop
+                    db.rollback()
+                    time.sleep(0.01)
+                    continue
+                if not requests:
+                    return
+                claimed[index].extend(requests)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with Session(engine) as db:
+        process_requests(db, claimed[0] + claimed[1])
+    claimed = [{request.id for request in requests} for requests in claimed]
+    assert not set(claimed[0]) & set(claimed[1])
+    assert len(claimed[0] | claimed[1]) == 60
+    outcomes = session.exec(select(EnrollmentRequest.status, EnrollmentRequest.outcome)).all()
+    assert set(outcomes) == {(EnrollmentRequestStatus.COMPLETED, EnrollmentOutcome.ENROLLED)}
+    assert len(session.exec(select(Enrollment.id)).all()) == 60
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+def test_running_workers_requeue_stale_requests_in_the_leader_only(engine, session, school, admin, tmp_path,
+                                                                  monkeypatch):
+    """A request abandoned mid-batch is picked up again while the workers run, once this process leads"""
+    course = school.course(max_students=10)
+    student, = school.students(1)
+    session.add(admin)
+    request = EnrollmentRequest(student_id=student.id, course_id=course.id, requested_by=admin.id,
+                                status=EnrollmentRequestStatus.PROCESSING)
+    session.add(request)
+    session.commit()
+    request_id = request.id
+    session.close()
+
+    monkeypatch.setattr(enrollment_queue, "engine", engine)
+    leader = LeaderLock("queue", engine, tmp_path / "leader.lock")
+    assert leader.acquire()
+    follower = LeaderLock("queue", engine, tmp_path / "leader.lock")
+    monkeypatch.setattr(enrollment_queue, "background_leader", follower)
+
+    def status():
+        with Session(engine) as db:
+            return db.get(EnrollmentRequest, request_id).status
+
+    workers = EnrollmentQueueWorkers(workers=1, poll_interval=0.01, stale_seconds=0.05)
+    workers.start()
+    try:
+        # Becomes stale while the workers run; another process leads, so it stays put
+        time.sleep(0.2)
+        assert status() == EnrollmentRequestStatus.PROCESSING
+
+        leader.release()
+        assert _wait_for(lambda: status() == EnrollmentRequestStatus.COMPLETED)
+    finally:
+        workers.stop()
+        follower.release()
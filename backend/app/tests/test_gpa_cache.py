@@ -0,0 +1,50 @@
+import pytest
+
+from app.models.grade import GradeCreate
+from app.services.gpa_service import get_student_gpas, student_gpa_cache
+from app.services.grade_service import GradeService
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(student_gpa_cache, "ttl_seconds", 3600)
+    student_gpa_cache.clear()
+    yield
+    student_gpa_cache.clear()
+
+def _grade(session, admin, enrollment_id, score):
+    GradeService(session, admin).create_grade(GradeCreate(
+        enrollment_id=enrollment_id, grade_type="exam", score=score, max_score=100, weight=1
+    ))
+
+def _gpa(session, student_id):
+    return get_student_gpas(session, [student_id])[student_id]["cumulative_gpa"]
+
+def test_committed_grade_invalidates_the_cached_gpa(session, school, admin):
+    course = school.course()
+    student, = school.students(1)
+    enrollment_id, student_id = school.enroll(student, course).id, student.id
+    _grade(session, admin, enrollment_id, 95)
+    session.commit()
+    assert _gpa(session, student_id) == 4.0
+    assert student_id in student_gpa_cache.lookup([student_id])
+
+    _grade(session, admin, enrollment_id, 45)
+    session.commit()
+    assert student_gpa_cache.lookup([student_id]) == {}
+    assert _gpa(session, student_id) == 2.0
+
+def test_rolled_back_grade_keeps_the_cached_gpa(session, school, admin):
+    course = school.course()
+    student, = school.students(1)
+    enrollment_id, student_id = school.enroll(student, course).id, student.id
+    _grade(session, admin, enrollment_id, 95)
+    session.commit()
+    cached = get_student_gpas(session, [student_id])
+
+    _grade(session, admin, enrollment_id, 10)
+    session.flush()
+    session.rollback()
+    # A later commit on the same session must not apply the discarded invalidation
+    session.commit()
+    assert student_gpa_cache.lookup([student_id]) == cached
+    assert _gpa(session, student_id) == 4.0
@@ -0,0 +1,38 @@
+import math
+
+import pandas as pd
+
+from app.services.grade_engine import compute_final_grades, final_grade_rows
+
+def _grades(rows):
+    return pd.DataFrame(rows, columns=["enrollment_id", "score", "max_score", "weight"])
+
+def test_weighted_final_normalizes_scores():
+    """Scores are normalized to percentages and weighted by their weight"""
+    finals = compute_final_grades(_grades([
+        ("e1", 45, 50, 60),   # 90%
+        ("e1", 14, 20, 40),   # 70%
+    ]))
+    assert finals.loc["e1", "final_percentage"] == 82.0
+    assert finals.loc["e1", "letter_grade"] == "B"
+    assert finals.loc["e1", "weight_covered"] == 100
+
+def test_missing_weights_and_partial_sets():
+    """Unweighted grades take the average weight; partial sets use what exists"""
+    finals = compute_final_grades(_grades([
+        ("e1", 10, 10, 30),   # 100%
+        ("e1", 5, 10, 0),     # 50%, counts with weight 30
+        ("e2", 8, 10, 0),     # no declared weights: equal weighting
+        ("e2", 6, 10, 0),
+        ("e3", 5, 0, 20),     # unusable max_score is ignored
+    ]))
+    assert finals.loc["e1", "final_percentage"] == 75.0
+    assert finals.loc["e1", "weight_covered"] == 30
+    assert finals.loc["e2", "final_percentage"] == 70.0
+    assert math.isnan(finals.loc["e3", "final_percentage"])
+    assert finals.loc["e3", "assessments"] == 0
+
+def test_rows_include_ungraded_enrollments():
+    rows = final_grade_rows(compute_final_grades(_grades([])), ["e1"])
+    assert rows == [{"enrollment_id": "e1", "final_percentage": None, "letter_grade": None,
+                     "assessments": 0, "weight_covered": 0.0}]
@@ -0,0 +1,94 @@
+import csv
+from datetime import date
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+from sqlmodel import Session, select
+
+from app.models.grade import GradeType
+from app.models.grade_import import GradeImportJob, GradeImportStatus
+from app.models.grade_summary import EnrollmentGradeSummary
+from app.models.user import UserRole
+from app.services import grade_import
+from app.services.grade_import import iter_gradebook_rows, run_grade_import
+
+ROWS = [
+    ["Email", "Course", "Score", "Comment"],
+    ["student2@test.com", "ALG101", "45", "Good"],
+    ["", "", "", ""],
+    ["STUDENT3@test.com", "ALG101", "75", ""],
+    ["nobody@test.com", "ALG101", "30", ""],
+    ["student2@test.com", "ALG101", "40", ""],
+    ["student3@test.com", "", "20", ""],
+]
+
+@pytest.fixture(autouse=True)
+def imports_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(grade_import, "IMPORTS_DIR", tmp_path / "imports")
+
+def _write_csv(path, rows):
+    # Spreadsheet exports often start with a byte order mark
+    with open(path, "w", newline="", encoding="utf-8-sig") as target:
+        csv.writer(target).writerows(rows)
+    return path
+
+def _write_xlsx(path, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in rows:
+        sheet.append([float(value) if value.isdigit() else value or None for value in row])
+    workbook.save(path)
+    return path
+
+@pytest.mark.parametrize("write", [_write_csv, _write_xlsx])
+def test_rows_are_streamed_with_normalized_columns(tmp_path, write):
+    """Header aliases map to canonical columns; blank rows are skipped but keep their row numbers"""
+    path = write(tmp_path / f"gradebook{'.csv' if write is _write_csv else '.xlsx'}", ROWS)
+    rows = list(iter_gradebook_rows(path))
+    assert [row_number for row_number, _ in rows] == [2, 4, 5, 6, 7]
+    first = rows[0][1]
+    assert set(first) == {"student_email", "course_code", "score", "comments"}
+    assert (first["student_email"], first["course_code"], float(first["score"])) == ("student2@test.com", "ALG101", 45)
+
+def test_missing_required_column_is_reported(tmp_path):
+    path = _write_csv(tmp_path / "gradebook.csv", [["course", "score"], ["ALG101", "10"]])
+    with pytest.raises(ValueError, match="student_email or student_id"):
+        list(iter_gradebook_rows(path))
+
+def test_import_inserts_valid_rows_and_reports_the_rest(client, engine, session, school, login):
+    # The course's teacher is user 1, so the students are student2 and student3
+    course = school.course()
+    for student in school.students(2):
+        school.enroll(student, course)
+    user, headers = login(UserRole.ADMIN)
+    job = GradeImportJob(requested_by=user.id, filename="term.csv", grade_type=GradeType.EXAM, max_score=50,
+                         weight=1, grade_date=date(2025, 3, 1),
+                         file_path=str(_write_csv(grade_import._imports_dir() / "upload.csv", ROWS)))
+    session.add(job)
+    job_id = job.id
+    session.commit()
+
+    run_grade_import(job_id, bind=engine)
+
+    with Session(engine) as db:
+        job = db.get(GradeImportJob, job_id)
+        assert job.status == GradeImportStatus.COMPLETED
+        assert (job.total_rows, job.imported_rows, job.rejected_rows) == (5, 1, 4)
+        assert job.rows_per_second is not None
+        averages = db.exec(select(EnrollmentGradeSummary.weighted_average)).all()
+        file_path = job.file_path
+    assert averages == [pytest.approx(90.0)]
+    # The upload is removed once imported
+    assert not Path(file_path).exists()
+
+    response = client.get(f"/grades/import/{job_id}/errors", headers=headers)
+    assert response.status_code == 200
+    report = list(csv.reader(response.text.splitlines()))
+    assert report == [
+        ["row", "student_email", "student_id", "course_code", "score", "error"],
+        ["4", "STUDENT3@test.com", "", "ALG101", "75", "Score must be a number between 0 and 50.0"],
+        ["5", "nobody@test.com", "", "ALG101", "30", "No active enrollment found for this student in the course"],
+        ["6", "student2@test.com", "", "ALG101", "40", "Duplicate row for this enrollment"],
+        ["7", "student3@test.com", "", "", "20", "Missing course_code"],
+    ]
@@ -0,0 +1,83 @@
+from datetime import date
+
+import numpy as np
+
+from app.models.grade import Grade, GradeCreate, GradeType
+from app.services.grade_service import GradeService
+from app.services.grade_statistics import (
+    HISTOGRAM_BINS, _course_finals, _course_grades, _fallback_statistics, _sql_statistics, _vectorized_statistics,
+    compute_course_statistics,
+)
+
+def test_quartiles_and_buckets_match_hand_computed_values():
+    statistics = _vectorized_statistics(np.array([100.0, 0.0, 40.0, 20.0, 55.0, 30.0]))
+
+    assert statistics["count"] == 6
+    assert statistics["mean"] == 40.83
+    assert statistics["min"] == 0.0
+    assert statistics["max"] == 100.0
+    assert statistics["std_dev"] == 34.41
+    # Linear interpolation between the sorted values 0, 20, 30, 40, 55, 100 at position p * (n - 1)
+    assert statistics["median"] == 35.0
+    assert statistics["percentiles"] == {"p25": 22.5, "p75": 51.25, "p90": 77.5}
+    # Ten buckets of ten points; 100 falls in the last one
+    assert statistics["histogram"] == [1, 0, 1, 1, 1, 1, 0, 0, 0, 1]
+
+def test_scores_above_the_range_count_in_the_last_bucket():
+    assert _vectorized_statistics(np.array([105.0, 95.0]))["histogram"] == [0] * (HISTOGRAM_BINS - 1) + [2]
+
+def test_empty_course_has_empty_statistics(session, school):
+    course = school.course()
+
+    statistics = compute_course_statistics(session, course.id)
+    assert statistics["assessments"] == []
+    assert statistics["finals"] == {
+        "count": 0, "mean": None, "median": None, "min": None, "max": None, "std_dev": None,
+        "percentiles": {"p25": None, "p75": None, "p90": None},
+        "histogram": [0] * HISTOGRAM_BINS,
+    }
+
+def test_single_grade_is_every_quantile(session, school, admin):
+    course = school.course()
+    student, = school.students(1)
+    enrollment = school.enroll(student, course)
+    GradeService(session, admin).create_grade(GradeCreate(
+        enrollment_id=enrollment.id, grade_type="exam", score=36, max_score=40, weight=1,
+        grade_date=date(2025, 3, 1)
+    ))
+    session.commit()
+
+    expected = {
+        "count": 1, "mean": 90.0, "median": 90.0, "min": 90.0, "max": 90.0, "std_dev": None,
+        "percentiles": {"p25": 90.0, "p75": 90.0, "p90": 90.0},
+        "histogram": [0] * (HISTOGRAM_BINS - 1) + [1],
+    }
+    statistics = compute_course_statistics(session, course.id)
+    assert statistics["finals"] == expected
+    assessment, = statistics["assessments"]
+    assert assessment.pop("grade_date") == date(2025, 3, 1)
+    assert assessment.pop("grade_type") == "exam"
+    assert assessment == expected
+
+def test_sql_and_fallback_statistics_agree(postgres_school, admin):
+    """Postgres aggregates and the NumPy fallback give the same results, out-of-range scores included"""
+    school, session = postgres_school, postgres_school.session
+    course = school.course()
+    enrollments = [school.enroll(student, course) for student in school.students(6)]
+    for enrollment, score in zip(enrollments, (40, 0, 16, 8, 22, 31)):
+        GradeService(session, admin).create_grade(GradeCreate(
+            enrollment_id=enrollment.id, grade_type="exam", score=score, max_score=40, weight=1,
+            grade_date=date(2025, 3, 1)
+        ))
+    # Stored directly, bypassing validation, so both bucketing edges are exercised
+    session.add_all(
+        Grade(enrollment_id=enrollment.id, grade_type=GradeType.QUIZ, score=score, max_score=10, weight=1,
+              grade_date=date(2025, 4, 1))
+        for enrollment, score in zip(enrollments, (-1, 0, 5, 10, 11, 7.5))
+    )
+    session.commit()
+
+    for source, groups in ((_course_finals(course.id), []), (_course_grades(course.id), ["grade_type", "grade_date"])):
+        assert _sql_statistics(session, source, groups) == _fallback_statistics(session, source, groups)
+    assert _sql_statistics(session, _course_grades(course.id), ["grade_type", "grade_date"])[
+        (GradeType.QUIZ, date(2025, 4, 1))]["histogram"] == [2, 0, 0, 0, 0, 1, 0, 1, 0, 2]
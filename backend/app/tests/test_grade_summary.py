@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+from sqlmodel import select
+
+from app.models.grade import GradeCreate, GradeType, GradeUpdate
+from app.models.grade_summary import EnrollmentGradeSummary
+from app.services.grade_engine import compute_final_grades, load_grades
+from app.services.grade_service import GradeService
+from app.services.grade_summary import check_grade_summaries, rebuild_grade_summaries
+
+@pytest.fixture(scope="function")
+def enrollment_id(school):
+    student, = school.students(1)
+    return school.enroll(student, school.course()).id
+
+def _summary(session, enrollment_id):
+    return session.exec(
+        select(EnrollmentGradeSummary).where(EnrollmentGradeSummary.enrollment_id == enrollment_id)
+    ).one()
+
+def test_grade_writes_keep_summary_in_step(session, admin, enrollment_id):
+    """Create, update and delete adjust the summary to match a full recompute"""
+    service = GradeService(session, admin)
+    grades = [
+        service.create_grade(GradeCreate(enrollment_id=enrollment_id, grade_type=GradeType.EXAM, score=45,
+                                         max_score=50, weight=60, grade_date=date(2025, 3, 1))),
+        service.create_grade(GradeCreate(enrollment_id=enrollment_id, grade_type=GradeType.QUIZ, score=7,
+                                         max_score=10, weight=0, grade_date=date(2025, 3, 5))),
+        service.create_grade(GradeCreate(enrollment_id=enrollment_id, grade_type=GradeType.PROJECT, score=12,
+                                         max_score=20, weight=40, grade_date=date(2025, 4, 1))),
+    ]
+    session.commit()
+    service.update_grade(grades[0].id, GradeUpdate(score=40))
+    service.delete_grade(grades[2].id)
+    session.commit()
+
+    summary = _summary(session, enrollment_id)
+    expected = compute_final_grades(load_grades(session, [enrollment_id])).loc[enrollment_id]
+    assert summary.grade_count == 2
+    assert summary.latest_grade_date == date(2025, 3, 5)
+    assert summary.weighted_average == pytest.approx(expected["final_percentage"])
+    assert check_grade_summaries(session) == []
+
+def test_checker_finds_drift_and_rebuild_repairs_it(session, admin, enrollment_id):
+    GradeService(session, admin).create_grade(
+        GradeCreate(enrollment_id=enrollment_id, grade_type=GradeType.EXAM, score=8, max_score=10, weight=50)
+    )
+    session.commit()
+
+    summary = _summary(session, enrollment_id)
+    summary.weighted_points += 100
+    summary.weighted_average = 99.0
+    session.commit()
+    assert {mismatch["field"] for mismatch in check_grade_summaries(session)} == {"weighted_points", "weighted_average"}
+
+    assert rebuild_grade_summaries(session) == 1
+    assert check_grade_summaries(session) == []
+    assert _summary(session, enrollment_id).weighted_average == pytest.approx(80.0)
@@ -0,0 +1,48 @@
+from app.models.user import UserRole
+
+def test_nested_include_expands_its_parent(client, school, login):
+    course = school.course(teacher=school.teacher(department="Math"))
+    student, = school.students(1)
+    school.enroll(student, course)
+    student_user_id, teacher_user_id = student.user_id, course.teacher.user_id
+    _, headers = login(UserRole.ADMIN)
+    school.session.rollback()
+
+    course_row, = client.get("/courses/", headers=headers, params={"include": "teacher.user"}).json()
+    assert course_row["teacher"]["department"] == "Math"
+    assert course_row["teacher"]["user"]["id"] == teacher_user_id
+
+    enrollment, = client.get("/enrollments/", headers=headers, params={"include": "student.user, course"}).json()
+    assert enrollment["student"]["user"]["id"] == student_user_id
+    assert enrollment["course"]["code"] == "ALG101"
+
+    enrollment, = client.get("/enrollments/", headers=headers).json()
+    assert enrollment["student"] is None and enrollment["course"] is None
+
+def test_unknown_include_is_rejected(client, login):
+    _, headers = login(UserRole.ADMIN)
+    response = client.get("/enrollments/", headers=headers, params={"include": "course,grades,teacher"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == \
+        "Unknown include(s): grades, teacher. Allowed values: course, student, student.user"
+    assert client.get("/courses/", headers=headers, params={"include": "user"}).status_code == 400
+
+def test_non_admins_get_only_public_fields_of_other_users(client, school, login):
+    course = school.course(teacher=school.teacher(department="Math"))
+    student, = school.students(1)
+    school.enroll(student, course)
+    teacher_user = course.teacher.user
+    teacher_name, student_email = teacher_user.first_name, student.user.email
+    _, headers = login(student.user)
+    _, admin_headers = login(UserRole.ADMIN)
+    school.session.rollback()
+
+    course_row, = client.get("/courses/", headers=headers, params={"include": "teacher.user"}).json()
+    assert course_row["teacher"]["user"]["first_name"] == teacher_name
+    assert "email" not in course_row["teacher"]["user"]
+    course_row, = client.get("/courses/", headers=admin_headers, params={"include": "teacher.user"}).json()
+    assert "email" in course_row["teacher"]["user"]
+
+    # Their own account is shown in full, as /users/{id} would
+    enrollment, = client.get("/enrollments/", headers=headers, params={"include": "student.user"}).json()
+    assert enrollment["student"]["user"]["email"] == student_email
@@ -0,0 +1,32 @@
+from datetime import date
+from io import BytesIO
+
+from app.services.pdf_templates import get_template
+
+def _report(courses):
+    return {
+        "student_id": "s1",
+        "student_name": "Ana & Lopez",
+        "grade_level": 9,
+        "enrollment_date": date(2024, 9, 1),
+        "grades": [
+            {"course_code": f"C{i}", "course_name": "Algebra", "credit_hours": 3, "grade": 0.0 if i == 0 else 80.0 + i % 10,
+             "letter_grade": "B", "status": "active"}
+            for i in range(courses)
+        ],
+        "gpa": {"cumulative_gpa": 3.1, "credit_hours": 6, "standing": "Good Standing",
+                "terms": [{"term": "Fall 2024", "gpa": 3.1, "credit_hours": 6}]},
+    }
+
+def test_templates_are_built_once_per_process():
+    """Every document of a layout reuses the same styles"""
+    assert get_template("transcript") is get_template("transcript")
+    assert get_template("transcript") is not get_template("report_card")
+
+def test_render_into_memory_across_pages():
+    """Long course lists flow onto further pages; short ones fit on one"""
+    template = get_template("transcript")
+    assert template.render_bytes(_report(2)).startswith(b"%PDF")
+    assert template.render(_report(2), BytesIO()) == 1
+    assert template.render(_report(80), BytesIO()) > 1
+    assert get_template("report_card").render_bytes(_report(3)).startswith(b"%PDF")
@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.config import settings
+from app.database.locks import LeaderLock
+from app.models.grade import Grade, GradeType
+from app.models.report_job import ReportJob, ReportJobStatus, ReportType
+from app.services import report_jobs, report_store, transcript_batch, transcript_cache
+from app.services.report_jobs import ReportJobRunner, _claim_job, render_report_job
+
+@pytest.fixture(autouse=True)
+def job_environment(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_jobs, "engine", engine)
+    monkeypatch.setattr(report_store, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(transcript_batch, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(transcript_cache, "TRANSCRIPTS_DIR", tmp_path / "transcripts")
+    monkeypatch.setattr(report_jobs, "background_leader", LeaderLock("jobs", engine, tmp_path / "leader.lock"))
+
+def _job(session, admin, **fields):
+    session.add(admin)
+    job = ReportJob(requested_by=admin.id, **fields)
+    session.add(job)
+    # Read before committing, so the fixture session holds no read transaction
+    job_id = job.id
+    session.commit()
+    return job_id
+
+def _reload(engine, job_id):
+    with Session(engine) as db:
+        return db.get(ReportJob, job_id)
+
+def test_a_queued_job_is_claimed_once(engine, session, admin):
+    job_id = _job(session, admin, report_type=ReportType.STUDENTS_EXPORT)
+    with Session(engine) as db:
+        assert _claim_job(db, job_id)
+        assert not _claim_job(db, job_id)
+    assert _reload(engine, job_id).status == ReportJobStatus.PROCESSING
+
+def test_batch_job_records_progress_and_file(engine, session, school, admin, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_BATCH_WORKERS", 1)
+    monkeypatch.setattr(settings, "REPORT_BATCH_CHUNK_SIZE", 1)
+    course = school.course()
+    for student in school.students(2):
+        enrollment = school.enroll(student, course)
+        session.add(Grade(enrollment_id=enrollment.id, grade_type=GradeType.EXAM, score=90, max_score=100,
+                          weight=1, grade_date=date(2025, 2, 1)))
+    job_id = _job(session, admin, report_type=ReportType.BATCH_TRANSCRIPTS, grade_level=9)
+
+    render_report_job(job_id)
+
+    job = _reload(engine, job_id)
+    assert job.status == ReportJobStatus.COMPLETED
+    assert (job.processed_items, job.total_items) == (2, 2)
+    assert job.file_path.endswith(".zip") and job.media_type == report_jobs.ZIP_MEDIA_TYPE
+    assert job.finished_at and job.duration_seconds is not None
+
+def test_failed_job_records_the_error(engine, session, admin):
+    job_id = _job(session, admin, report_type=ReportType.TRANSCRIPT)
+    render_report_job(job_id)
+    job = _reload(engine, job_id)
+    assert (job.status, job.detail, job.file_path) == (ReportJobStatus.FAILED, "Student not found", None)
+
+def test_startup_requeues_and_resubmits_from_one_process(engine, session, admin, tmp_path, monkeypatch):
+    """Stale and queued jobs are resubmitted once, by the worker that holds the leader lock"""
+    stale = _job(session, admin, report_type=ReportType.STUDENTS_EXPORT, status=ReportJobStatus.PROCESSING)
+    queued = _job(session, admin, report_type=ReportType.STUDENTS_EXPORT)
+    _job(session, admin, report_type=ReportType.STUDENTS_EXPORT, status=ReportJobStatus.COMPLETED)
+    session.execute(update(ReportJob).where(ReportJob.id == stale)
+                    .values(updated_at=datetime.utcnow() - timedelta(hours=1)))
+    session.commit()
+
+    submitted = []
+    monkeypatch.setattr(ReportJobRunner, "submit", lambda runner, job_id: submitted.append(job_id))
+    ReportJobRunner(workers=1).start()
+    # A second API worker process contends for the same lock
+    monkeypatch.setattr(report_jobs, "background_leader", LeaderLock("jobs", engine, tmp_path / "leader.lock"))
+    ReportJobRunner(workers=1).start()
+
+    assert sorted(submitted) == sorted([stale, queued])
+    assert _reload(engine, stale).status == ReportJobStatus.QUEUED
@@ -0,0 +1,83 @@
+import threading
+from datetime import date
+
+from sqlalchemy import inspect
+
+from app.config import ReportBackend
+from app.database.locks import LeaderLock
+from app.models.grade import Grade, GradeType
+from app.services.report_service import ReportService
+from app.services.report_snapshot import ReportSnapshot, ReportSnapshotRefresher
+
+def _seed(school):
+    course = school.course(code="MATH1")
+    grades = []
+    for i, student in enumerate(school.students(3)):
+        enrollment = school.enroll(student, course)
+        grade = Grade(enrollment_id=enrollment.id, grade_type=GradeType.EXAM, score=70 + i, max_score=100,
+                      weight=1, grade_date=date(2025, 2, 1))
+        school.session.add(grade)
+        grades.append(grade)
+    school.session.commit()
+    return grades
+
+def _grades_by_student(service):
+    return {
+        student_id: [(course["course_code"], course["grade"]) for course in report["grades"]]
+        for student_id, report in service.get_students_grades(grade_level=9).items()
+    }
+
+def test_refresh_copies_only_changes_and_reports_match(engine, session, school, tmp_path):
+    """Edits and deletes reach the snapshot incrementally; set-based reports read the same data from it"""
+    snapshot = ReportSnapshot(tmp_path / "snapshot.db", source=engine)
+    grades = _seed(school)
+    first = snapshot.refresh()
+    assert first["grades"]["copied"] == 3 and first["students"]["copied"] == 3
+    users = {column["name"] for column in inspect(snapshot.engine).get_columns("users")}
+    assert users == {"id", "first_name", "last_name", "email", "updated_at"}
+
+    grades[0].score = 95
+    session.delete(grades[1])
+    session.commit()
+    counts = snapshot.refresh()
+    assert counts["grades"]["deleted"] == 1
+    assert {row["table_name"]: row["row_count"] for row in snapshot.status()}["grades"] == 2
+
+    primary = ReportService(session, ReportBackend.PRIMARY)
+    copied = ReportService(session, ReportBackend.SNAPSHOT, snapshot)
+    assert _grades_by_student(copied) == _grades_by_student(primary)
+    assert 95 in [grade for rows in _grades_by_student(copied).values() for _, grade in rows]
+    snapshot.engine.dispose()
+
+def test_snapshot_backend_reads_primary_until_first_refresh(engine, session, school, tmp_path):
+    snapshot = ReportSnapshot(tmp_path / "snapshot.db", source=engine)
+    _seed(school)
+    service = ReportService(session, ReportBackend.SNAPSHOT, snapshot)
+    assert snapshot.refreshed_at() is None
+    assert len(service.get_students_grades(grade_level=9)) == 3
+
+def test_one_refresher_per_snapshot_file(engine, tmp_path, monkeypatch):
+    """API workers sharing a snapshot file leave refreshing to the one holding its lock"""
+    refreshes, attempts = [], threading.Semaphore(0)
+    monkeypatch.setattr(ReportSnapshot, "refresh", lambda snapshot: refreshes.append(snapshot))
+    acquire = LeaderLock.acquire
+
+    def counted_acquire(lock):
+        held = acquire(lock)
+        attempts.release()
+        return held
+
+    monkeypatch.setattr(LeaderLock, "acquire", counted_acquire)
+    refreshers = [
+        ReportSnapshotRefresher(ReportSnapshot(tmp_path / "snapshot.db", source=engine), interval=60)
+        for _ in range(2)
+    ]
+    for refresher in refreshers:
+        refresher.start()
+    for _ in refreshers:
+        assert attempts.acquire(timeout=10)
+    for refresher in refreshers:
+        refresher.stop()
+    assert len(refreshes) == 1
+    for refresher in refreshers:
+        refresher.snapshot.engine.dispose()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.config import settings
+from app.database.locks import LeaderLock
+from app.models.report_file import ReportFile
+from app.models.report_job import ReportType
+from app.services import report_store
+from app.services.report_store import ReportStoreSweeper, lookup_report_file, register_report_file, sweep_report_store
+
+@pytest.fixture(autouse=True)
+def reports_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORTS_DIR", tmp_path / "reports")
+    (tmp_path / "reports").mkdir()
+
+def _write(name, size, report_type, accessed_minutes_ago, session):
+    path = report_store.REPORTS_DIR / name
+    path.write_bytes(b"x" * size)
+    register_report_file(session, path, report_type)
+    session.execute(
+        update(ReportFile)
+        .where(ReportFile.path == name)
+        .values(last_accessed_at=datetime.utcnow() - timedelta(minutes=accessed_minutes_ago))
+    )
+    session.commit()
+    return path
+
+def test_eviction_removes_least_recently_used_first(session, monkeypatch):
+    """Over budget, files are evicted by last access until under the low watermark"""
+    monkeypatch.setattr(settings, "REPORT_STORE_MAX_MB", 1)
+    megabyte = 1024 * 1024
+    oldest = _write("a.pdf", megabyte // 2, ReportType.TRANSCRIPT, 30, session)
+    recent = _write("b.pdf", megabyte // 2, ReportType.TRANSCRIPT, 20, session)
+    newest = _write("c.pdf", megabyte // 2, ReportType.TRANSCRIPT, 10, session)
+
+    # Reading the oldest file makes it the most recently used
+    assert lookup_report_file(session, oldest) == oldest
+    session.commit()
+
+    result = sweep_report_store(session)
+    assert result["evicted"] == 2
+    assert oldest.exists() and not recent.exists() and not newest.exists()
+    assert session.exec(select(ReportFile.path)).all() == ["a.pdf"]
+
+def test_retention_is_applied_per_report_type(session, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_RETENTION_HOURS", {"students_export": 24, "transcript": 0})
+    export = _write("export.xlsx", 10, ReportType.STUDENTS_EXPORT, 0, session)
+    transcript = _write("t.pdf", 10, ReportType.TRANSCRIPT, 0, session)
+    session.execute(update(ReportFile).values(created_at=datetime.utcnow() - timedelta(days=3)))
+    session.commit()
+
+    assert sweep_report_store(session)["expired"] == 1
+    assert not export.exists() and transcript.exists()
+    assert lookup_report_file(session, export) is None
+
+def test_sweeper_runs_in_the_leader_process_only(engine, tmp_path, monkeypatch):
+    sweeps = []
+    monkeypatch.setattr(report_store, "engine", engine)
+    monkeypatch.setattr(report_store, "sweep_report_store", lambda db: sweeps.append(db))
+    leader = LeaderLock("sweeper", engine, tmp_path / "leader.lock")
+    assert leader.acquire()
+    # Another worker process holds the lock, so this one only waits
+    follower = LeaderLock("sweeper", engine, tmp_path / "leader.lock")
+    monkeypatch.setattr(report_store, "background_leader", follower)
+
+    sweeper = ReportStoreSweeper(interval=0.01)
+    sweeper.start()
+    sweeper._stop.wait(0.1)
+    assert sweeps == []
+
+    leader.release()
+    sweeper._stop.wait(0.1)
+    sweeper.stop()
+    follower.release()
+    assert sweeps
@@ -0,0 +1,37 @@
+import io
+from datetime import date
+
+import openpyxl
+import pytest
+
+from app.utils.streaming import iter_csv, iter_xlsx, parse_range
+
+COLUMNS = ["id", "name", "level", "since"]
+BATCHES = [
+    [("1", "Ana <A&B>", 9, date(2024, 9, 1)), ("2", None, 10, date(2023, 9, 1))],
+    [("3", "Luis", 11, None)],
+]
+
+def test_streamed_xlsx_reads_back():
+    """The streamed workbook opens in openpyxl with every batch, type and escape intact"""
+    content = b"".join(iter_xlsx(COLUMNS, iter(BATCHES), sheet_name="Students"))
+    sheet = openpyxl.load_workbook(io.BytesIO(content))["Students"]
+    rows = list(sheet.values)
+    assert rows[0] == tuple(COLUMNS)
+    assert rows[1][:3] == ("1", "Ana <A&B>", 9) and rows[1][3].date() == date(2024, 9, 1)
+    assert rows[2][1] is None
+    assert rows[3] == ("3", "Luis", 11, None)
+
+def test_streamed_csv_has_one_chunk_per_batch():
+    chunks = list(iter_csv(COLUMNS, iter(BATCHES)))
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode().splitlines()[0] == "id,name,level,since"
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=10-19", 100) == (10, 19)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=0-5,10-15", 100) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
@@ -0,0 +1,30 @@
+from datetime import date
+
+from app.models.grade import Grade, GradeType
+from app.services.report_service import ReportService
+
+def _grade(enrollment, score, weight, day):
+    return Grade(enrollment_id=enrollment.id, grade_type=GradeType.EXAM, score=score, max_score=100,
+                 weight=weight, grade_date=date(2025, 2, day))
+
+def test_one_row_per_enrollment_with_weighted_aggregates(session, school):
+    """Grades are summed per enrollment; students without enrollments still get a report"""
+    algebra, history = school.course(code="ALG1"), school.course(code="HIS1")
+    student, unenrolled = school.students(2)
+    graded = school.enroll(student, algebra)
+    school.enroll(student, history)
+    session.add_all([_grade(graded, 80, 2, 1), _grade(graded, 50, 1, 9)])
+    session.commit()
+
+    reports = ReportService(session).get_students_grades(student_ids=[student.id, unenrolled.id])
+
+    assert list(reports) == [student.id, unenrolled.id]
+    assert reports[unenrolled.id]["grades"] == []
+    algebra_row, history_row = reports[student.id]["grades"]
+    assert (algebra_row["course_code"], algebra_row["grade"], algebra_row["grade_count"]) == ("ALG1", 70.0, 2)
+    assert algebra_row["grade_date"] == date(2025, 2, 9) and algebra_row["letter_grade"] == "C"
+    assert (history_row["course_code"], history_row["grade"], history_row["grade_count"]) == ("HIS1", None, 0)
+    assert history_row["letter_grade"] is None
+    assert all(isinstance(row[field], str) for row in (algebra_row, history_row)
+               for field in ("enrollment_id", "course_id"))
+    assert ReportService(session).get_student_grades(student.id)["grades"] == reports[student.id]["grades"]
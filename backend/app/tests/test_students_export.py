@@ -0,0 +1,23 @@
+import openpyxl
+
+from app.config import settings
+from app.services import report_service, report_store
+from app.services.report_service import STUDENT_EXPORT_COLUMNS, ReportService
+
+def test_streamed_workbook_has_the_header_and_every_student(session, school, tmp_path, monkeypatch):
+    """Batches from the server-side cursor all land in the write-only workbook, after one header row"""
+    monkeypatch.setattr(report_store, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(report_service, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(settings, "REPORT_EXPORT_BATCH_SIZE", 2)
+    students = school.students(5)
+    expected = sorted(student.id for student in students)
+
+    service = ReportService(session)
+    assert [len(batch) for batch in service.iter_students_export()] == [2, 2, 1]
+    path = service.export_all_students_to_excel()
+    session.commit()
+
+    rows = list(openpyxl.load_workbook(path, read_only=True)["Students"].values)
+    assert rows[0] == tuple(STUDENT_EXPORT_COLUMNS)
+    assert len(rows) == 1 + len(expected)
+    assert sorted(row[0] for row in rows[1:]) == expected
@@ -0,0 +1,39 @@
+import zipfile
+from datetime import date
+
+import pytest
+
+from app.config import settings
+from app.models.grade import Grade, GradeType
+from app.services import report_store, transcript_batch, transcript_cache
+from app.services.transcript_batch import build_transcript_archive
+
+@pytest.fixture(autouse=True)
+def reports_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(transcript_batch, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(transcript_cache, "TRANSCRIPTS_DIR", tmp_path / "transcripts")
+
+def test_archive_holds_one_transcript_per_student(session, school, monkeypatch):
+    """Chunks rendered in the job process are written to the ZIP with progress after each"""
+    monkeypatch.setattr(settings, "REPORT_BATCH_WORKERS", 1)
+    monkeypatch.setattr(settings, "REPORT_BATCH_CHUNK_SIZE", 2)
+    course = school.course()
+    students = school.students(3)
+    school.students(1, grade_level=10)
+    for student in students:
+        enrollment = school.enroll(student, course)
+        session.add(Grade(enrollment_id=enrollment.id, grade_type=GradeType.EXAM, score=80, max_score=100,
+                          weight=1, grade_date=date(2025, 2, 1)))
+    session.commit()
+    expected = sorted(f"{student.user.first_name}_{student.user.last_name}_{student.id}.pdf" for student in students)
+
+    progress = []
+    path, count = build_transcript_archive(session, 9, lambda done, total, rate: progress.append((done, total)))
+    session.commit()
+
+    assert count == 3
+    assert progress == [(2, 3), (3, 3)]
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == expected
+        assert all(archive.read(name).startswith(b"%PDF") for name in expected)
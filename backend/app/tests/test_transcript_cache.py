@@ -0,0 +1,24 @@
+from datetime import date
+
+from app.services.transcript_cache import transcript_cache_key
+
+def _report(grade, generated_at="2025-01-01T10:00:00"):
+    return {
+        "student_id": "s1",
+        "student_name": "Ana Lopez",
+        "grade_level": 9,
+        "enrollment_date": date(2024, 9, 1),
+        "grades": [{"course_code": "MATH1", "course_name": "Algebra", "grade": grade}],
+        "generated_at": generated_at,
+    }
+
+def test_key_ignores_generation_time():
+    """The same data rendered at different times maps to one cached file"""
+    assert transcript_cache_key(_report(82.0), "1") == \
+        transcript_cache_key(_report(82.0, "2025-06-01T08:30:00"), "1")
+
+def test_key_changes_with_data_and_template():
+    """New grades or a new template version never hit an old entry"""
+    key = transcript_cache_key(_report(82.0), "1")
+    assert transcript_cache_key(_report(85.0), "1") != key
+    assert transcript_cache_key(_report(82.0), "2") != key
@@ -0,0 +1,32 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from ..schemas.batch import BatchItemStatus
+
+
+def batch_get_response(
+    ids: Sequence[str],
+    rows_by_id: Mapping[str, Any],
+    is_allowed: Optional[Callable[[Any], bool]] = None,
+    expand: Optional[Callable[[List[Any]], List[Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a batch lookup response that preserves the order of ``ids``.
+
+    ``rows_by_id`` holds every row found by the IN query. Rows rejected by
+    ``is_allowed`` are reported as forbidden, the rest are passed through
+    ``expand`` once as a group and embedded in the response.
+    """
+    allowed = [row for row in rows_by_id.values() if is_allowed is None or is_allowed(row)]
+    data = expand(allowed) if expand else allowed
+    data_by_id = {item.id: item for item in data}
+
+    items = []
+    for id_ in ids:
+        if id_ in data_by_id:
+            items.append({"id": id_, "status": BatchItemStatus.FOUND, "data": data_by_id[id_]})
+        elif id_ in rows_by_id:
+            items.append({"id": id_, "status": BatchItemStatus.FORBIDDEN, "data": None})
+        else:
+            items.append({"id": id_, "status": BatchItemStatus.NOT_FOUND, "data": None})
+
+    return {"items": items}
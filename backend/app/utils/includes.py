@@ -0,0 +1,125 @@
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Type, Union
+
+from ..models.user import User, UserPublic, UserRead, UserRole
+from ..models.student import Student, StudentReadWithUser
+from ..models.teacher import Teacher, TeacherReadWithUser
+from ..models.course import Course, CourseReadWithTeacher
+from ..models.enrollment import Enrollment, EnrollmentReadWithDetails
+
+# Relations each resource can expand through ``?include=``
+STUDENT_INCLUDES = {"user"}
+TEACHER_INCLUDES = {"user"}
+COURSE_INCLUDES = {"teacher", "teacher.user"}
+ENROLLMENT_INCLUDES = {"student", "student.user", "course"}
+
+
+def parse_includes(include: Optional[str], allowed: Iterable[str]) -> Set[str]:
+    """
+    Parse a comma separated ``include`` query parameter and validate it
+    against the relations a router knows how to expand.
+
+    Nested relations use dotted paths (``student.user``) and imply their
+    parent, so ``student.user`` also expands ``student``.
+    """
+    if not include:
+        return set()
+
+    allowed = set(allowed)
+    requested = {item.strip() for item in include.split(",") if item.strip()}
+
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include(s): {', '.join(sorted(unknown))}. "
+                   f"Allowed values: {', '.join(sorted(allowed))}"
+        )
+
+    # Expanding a nested relation requires its parent to be loaded too
+    for item in list(requested):
+        parts = item.split(".")
+        for i in range(1, len(parts)):
+            requested.add(".".join(parts[:i]))
+
+    return requested
+
+
+def fetch_by_ids(db: Session, model: Type[Any], ids: Iterable[Optional[str]]) -> Dict[str, Any]:
+    """
+    Load every row of ``model`` whose primary key is in ``ids`` with a single
+    IN query and return them keyed by id.
+    """
+    unique_ids = {id_ for id_ in ids if id_}
+    if not unique_ids:
+        return {}
+
+    rows = db.exec(select(model).where(model.id.in_(unique_ids))).all()
+    return {row.id: row for row in rows}
+
+
+def _nested(includes: Set[str], prefix: str) -> Set[str]:
+    """Strip ``prefix.`` from the includes that live below ``prefix``."""
+    return {item[len(prefix) + 1:] for item in includes if item.startswith(f"{prefix}.")}
+
+
+def fetch_users(db: Session, ids: Iterable[Optional[str]], current_user: User) -> Dict[str, Union[UserRead, UserPublic]]:
+    """
+    Users keyed by id, as the ``/users`` routes would show them: the full
+    record to admins and to its owner, only the public fields to anyone else.
+    """
+    users = fetch_by_ids(db, User, ids)
+    return {
+        id_: UserRead.from_orm(user)
+        if current_user.role == UserRole.ADMIN or id_ == current_user.id else UserPublic.from_orm(user)
+        for id_, user in users.items()
+    }
+
+
+def expand_students(
+    db: Session, students: Sequence[Student], includes: Set[str], current_user: User
+) -> List[StudentReadWithUser]:
+    """Attach the requested relations to a page of students."""
+    users = fetch_users(db, (s.user_id for s in students), current_user) if "user" in includes else {}
+    return [StudentReadWithUser(**s.dict(), user=users.get(s.user_id)) for s in students]
+
+
+def expand_teachers(
+    db: Session, teachers: Sequence[Teacher], includes: Set[str], current_user: User
+) -> List[TeacherReadWithUser]:
+    """Attach the requested relations to a page of teachers."""
+    users = fetch_users(db, (t.user_id for t in teachers), current_user) if "user" in includes else {}
+    return [TeacherReadWithUser(**t.dict(), user=users.get(t.user_id)) for t in teachers]
+
+
+def expand_courses(
+    db: Session, courses: Sequence[Course], includes: Set[str], current_user: User
+) -> List[CourseReadWithTeacher]:
+    """Attach the requested relations to a page of courses."""
+    teachers = {}
+    if "teacher" in includes:
+        rows = fetch_by_ids(db, Teacher, (c.teacher_id for c in courses)).values()
+        teachers = {t.id: t for t in expand_teachers(db, list(rows), _nested(includes, "teacher"), current_user)}
+    return [CourseReadWithTeacher(**c.dict(), teacher=teachers.get(c.teacher_id)) for c in courses]
+
+
+def expand_enrollments(
+    db: Session, enrollments: Sequence[Enrollment], includes: Set[str], current_user: User
+) -> List[EnrollmentReadWithDetails]:
+    """Attach the requested relations to a page of enrollments."""
+    students = {}
+    if "student" in includes:
+        rows = fetch_by_ids(db, Student, (e.student_id for e in enrollments)).values()
+        students = {s.id: s for s in expand_students(db, list(rows), _nested(includes, "student"), current_user)}
+
+    courses = fetch_by_ids(db, Course, (e.course_id for e in enrollments)) if "course" in includes else {}
+
+    return [
+        EnrollmentReadWithDetails(
+            **e.dict(),
+            student=students.get(e.student_id),
+            course=courses.get(e.course_id),
+        )
+        for e in enrollments
+    ]
@@ -28,12 +28,12 @@ export interface CourseCreate {
 
 const courseService = {
   getAll: async (): Promise<Course[]> => {
-    const response = await api.get<Course[]>('/courses/');
+    const response = await api.get<Course[]>('/courses/', { params: { include: 'teacher.user' } });
     return response.data;
   },
   
   getById: async (id: number): Promise<Course> => {
-    const response = await api.get<Course>(`/courses/${id}`);
+    const response = await api.get<Course>(`/courses/${id}`, { params: { include: 'teacher.user' } });
     return response.data;
   },
   
@@ -31,12 +31,12 @@ export interface StudentCreate {
 
 const studentService = {
   getAll: async (): Promise<Student[]> => {
-    const response = await api.get<Student[]>('/students/');
+    const response = await api.get<Student[]>('/students/', { params: { include: 'user' } });
     return response.data;
   },
   
   getById: async (id: number): Promise<Student> => {
-    const response = await api.get<Student>(`/students/${id}`);
+    const response = await api.get<Student>(`/students/${id}`, { params: { include: 'user' } });
     return response.data;
   },
   